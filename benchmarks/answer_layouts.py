@@ -0,0 +1,316 @@
+"""Submission answers stored inline on `submission` against one row each.
+
+Loads `--submissions` synthetic submissions with their answers inline, the way
+the repository stores them, and copies them into the row per answer layout it
+used before, `rows_submission` and `rows_answer`, in the same schema. Then, for
+each layout:
+
+- reads `--reads` random submissions with their answers, with the statements
+  the repository sends: the submission row inline, the submission and then its
+  answers in rows;
+- changes one answer of `--writes` random submissions, with the statements the
+  repository sends: the versioned upsert of the submission row inline, that
+  upsert plus a delete of dropped answers and an upsert of the changed ones in
+  rows;
+- measures the size of its tables, indexes and TOAST included, after loading
+  and VACUUM, after the writes and after another VACUUM, and the dead and
+  HOT-updated tuples the writes left. Autovacuum is off for these tables.
+
+`rows_submission` leaves out the foreign keys to `quiz` and `author`, which
+updates don't check.
+
+    python -m benchmarks.answer_layouts --submissions 100000 --reads 2000 --writes 20000
+"""
+
+import argparse
+import random
+import statistics
+import time
+from typing import Any, Callable
+
+from sqlalchemy import (
+    Column,
+    Connection,
+    Engine,
+    Float,
+    ForeignKey,
+    Index,
+    Integer,
+    MetaData,
+    SmallInteger,
+    String,
+    Table,
+    UniqueConstraint,
+    delete,
+    select,
+    text,
+)
+from sqlalchemy.dialects.postgresql import ENUM, insert
+
+from quizzing.quiz.infrastructure.repository.sqlalchemy.models import submission_table
+from quizzing.quiz.infrastructure.repository.sqlalchemy.repository import (
+    _upsert_changed,
+    _upsert_versioned,
+)
+
+from .database import StatementCounter, scratch_engine
+from .dataset import DatasetSpec, load_dataset
+
+rows_metadata = MetaData()
+rows_submission = Table(
+    "rows_submission",
+    rows_metadata,
+    Column("id", String, primary_key=True),
+    Column("quiz_id", String, nullable=False),
+    Column("author_id", String, nullable=False),
+    Column(
+        "status",
+        ENUM("in_progress", "completed", name="submission_status", create_type=False),
+    ),
+    Column("score", Float, nullable=True),
+    Column("version", Integer, nullable=False, server_default="1"),
+    UniqueConstraint("quiz_id", "author_id"),
+    Index("ix_rows_submission_author_id", "author_id"),
+    Index("ix_rows_submission_quiz_id_id", "quiz_id", "id"),
+)
+rows_answer = Table(
+    "rows_answer",
+    rows_metadata,
+    Column("id", Integer, primary_key=True, autoincrement=True),
+    Column("submission_id", String, ForeignKey("rows_submission.id"), nullable=False),
+    Column("index", Integer, nullable=False),
+    Column("mask", SmallInteger, nullable=False),
+    Column("score", Float, nullable=True),
+    UniqueConstraint("submission_id", "index"),
+)
+
+LAYOUTS = {
+    "inline": [submission_table.name],
+    "rows": [rows_submission.name, rows_answer.name],
+}
+
+
+def copy_to_rows(engine: Engine) -> None:
+    rows_metadata.create_all(engine)
+    with engine.begin() as connection:
+        connection.execute(
+            text(
+                "INSERT INTO rows_submission "
+                "SELECT id, quiz_id, author_id, status, score, version FROM submission"
+            )
+        )
+        connection.execute(
+            text(
+                """
+                INSERT INTO rows_answer (submission_id, index, mask, score)
+                SELECT submission.id, answers.index - 1, answers.mask, answers.score
+                FROM submission, unnest(submission.answer_masks, submission.answer_scores)
+                    WITH ORDINALITY AS answers (mask, score, index)
+                """
+            )
+        )
+        for tables in LAYOUTS.values():
+            for table in tables:
+                connection.execute(
+                    text(f"ALTER TABLE {table} SET (autovacuum_enabled = false)")
+                )
+
+
+def vacuum(engine: Engine) -> None:
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+        for tables in LAYOUTS.values():
+            for table in tables:
+                connection.execute(text(f"VACUUM ANALYZE {table}"))
+
+
+def size_mb(connection: Connection, layout: str) -> float:
+    return (
+        sum(
+            connection.execute(
+                text("SELECT pg_total_relation_size(:table)"), {"table": table}
+            ).scalar_one()
+            for table in LAYOUTS[layout]
+        )
+        / 2**20
+    )
+
+
+def tuple_stats(engine: Engine, layout: str) -> tuple[int, int, int]:
+    """Dead, updated and HOT-updated tuples of the layout's tables."""
+    # Backends report their statistics when they exit.
+    engine.dispose()
+    time.sleep(1)
+    with engine.connect() as connection:
+        dead, updated, hot = 0, 0, 0
+        for table in LAYOUTS[layout]:
+            row = connection.execute(
+                text(
+                    "SELECT n_dead_tup, n_tup_upd, n_tup_hot_upd "
+                    "FROM pg_stat_user_tables "
+                    "WHERE relid = to_regclass(:table)"
+                ),
+                {"table": table},
+            ).one()
+            dead, updated, hot = dead + row[0], updated + row[1], hot + row[2]
+        return dead, updated, hot
+
+
+def read_inline(connection: Connection, submission_id: str) -> Any:
+    return connection.execute(
+        select(submission_table).where(submission_table.c.id == submission_id)
+    ).one()
+
+
+def read_rows(connection: Connection, submission_id: str) -> Any:
+    submission = connection.execute(
+        select(rows_submission).where(rows_submission.c.id == submission_id)
+    ).one()
+    answers = connection.execute(
+        select(rows_answer)
+        .where(rows_answer.c.submission_id == submission_id)
+        .order_by(rows_answer.c.index)
+    ).all()
+    return submission, answers
+
+
+def write_inline(connection: Connection, submission: dict) -> int:
+    stmt = insert(submission_table).values(
+        {
+            **{k: submission[k] for k in ("id", "quiz_id", "author_id", "status")},
+            "score": submission["score"],
+            "version": submission["version"] + 1,
+            "answer_masks": submission["masks"],
+            "answer_scores": submission["scores"],
+        }
+    )
+    stmt = _upsert_versioned(stmt, ["status", "score", "answer_masks", "answer_scores"])
+    return connection.execute(stmt).one().version
+
+
+def write_rows(connection: Connection, submission: dict) -> int:
+    stmt = insert(rows_submission).values(
+        {
+            **{k: submission[k] for k in ("id", "quiz_id", "author_id", "status")},
+            "score": submission["score"],
+            "version": submission["version"] + 1,
+        }
+    )
+    version = (
+        connection.execute(_upsert_versioned(stmt, ["status", "score"])).one().version
+    )
+    connection.execute(
+        delete(rows_answer).where(
+            rows_answer.c.submission_id == submission["id"],
+            rows_answer.c.index >= len(submission["masks"]),
+        )
+    )
+    stmt = insert(rows_answer).values(
+        [
+            {
+                "submission_id": submission["id"],
+                "index": index,
+                "mask": mask,
+                "score": score,
+            }
+            for index, (mask, score) in enumerate(
+                zip(submission["masks"], submission["scores"])
+            )
+        ]
+    )
+    connection.execute(
+        _upsert_changed(stmt, ["submission_id", "index"], ["mask", "score"])
+    )
+    return version
+
+
+def timed_ms(engine: Engine, fn: Callable[[Connection], Any], n: int) -> list[float]:
+    latencies = []
+    for _ in range(n):
+        start = time.perf_counter()
+        with engine.begin() as connection:
+            fn(connection)
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--submissions", type=int, default=100_000)
+    parser.add_argument("--reads", type=int, default=2_000)
+    parser.add_argument("--writes", type=int, default=20_000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    rng = random.Random(args.seed)
+
+    with scratch_engine() as engine:
+        start = time.perf_counter()
+        load_dataset(engine, DatasetSpec.scaled(args.submissions))
+        copy_to_rows(engine)
+        vacuum(engine)
+        print(f"loaded in {time.perf_counter() - start:.1f} s")
+        with engine.connect() as connection:
+            submissions = [
+                dict(row._mapping)
+                for row in connection.execute(select(submission_table))
+            ]
+        counter = StatementCounter(engine)
+        reads = [rng.choice(submissions)["id"] for _ in range(args.reads)]
+        writes = [rng.randrange(len(submissions)) for _ in range(args.writes)]
+        # Neither layout gets to read from a warmer cache than the other.
+        with engine.connect() as connection:
+            for submission_id in reads:
+                read_inline(connection, submission_id)
+                read_rows(connection, submission_id)
+
+        print(
+            f"{'layout':<7} {'read p50':>9} {'p99 ms':>7} {'write p50':>10} "
+            f"{'p99 ms':>7} {'stmts':>6} {'MB':>7} {'written':>8} {'vacuumed':>9} "
+            f"{'dead':>7} {'HOT %':>6}"
+        )
+        for layout, read, write in (
+            ("inline", read_inline, write_inline),
+            ("rows", read_rows, write_rows),
+        ):
+            with engine.connect() as connection:
+                loaded = size_mb(connection, layout)
+            ids = iter(reads)
+            read_ms = timed_ms(engine, lambda c: read(c, next(ids)), len(reads))
+
+            # Both layouts start from the same answers and make the same edits.
+            state = [
+                {**s, "masks": list(s["answer_masks"]), "scores": s["answer_scores"]}
+                for s in submissions
+            ]
+            _, updated_before, hot_before = tuple_stats(engine, layout)
+            counter.reset()
+            edits = iter(writes)
+
+            def edit(connection: Connection) -> None:
+                submission = state[next(edits)]
+                masks = submission["masks"]
+                index = rng.randrange(len(masks))
+                masks[index] ^= 1
+                submission["version"] = write(connection, submission)
+
+            write_ms = timed_ms(engine, edit, len(writes))
+            statements = counter.reset() / len(writes)
+            dead, updated, hot = tuple_stats(engine, layout)
+            with engine.connect() as connection:
+                written = size_mb(connection, layout)
+            vacuum(engine)
+            with engine.connect() as connection:
+                vacuumed = size_mb(connection, layout)
+            updated -= updated_before
+            hot -= hot_before
+            print(
+                f"{layout:<7} {statistics.median(read_ms):>9.3f} "
+                f"{statistics.quantiles(read_ms, n=100)[98]:>7.3f} "
+                f"{statistics.median(write_ms):>10.3f} "
+                f"{statistics.quantiles(write_ms, n=100)[98]:>7.3f} "
+                f"{statements:>6.1f} {loaded:>7.1f} {written:>8.1f} {vacuumed:>9.1f} "
+                f"{dead:>7} {100 * hot / max(updated, 1):>6.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
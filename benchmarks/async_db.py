@@ -0,0 +1,100 @@
+"""Request latency and throughput of the sync and async database stacks.
+
+Runs the same concurrent load, `--concurrency` clients calling `GET /quizzes` and
+`GET /submissions`, against the API wired to psycopg2 (services called on the
+request thread pool) and then to asyncpg (services awaited on the event loop),
+both with a connection pool of `--pool-size`.
+
+    python -m benchmarks.async_db --concurrency 64 --requests 2000
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from datetime import timedelta
+
+import httpx
+
+from quizzing.quiz.domain.entities.author import hash_password
+from quizzing.quiz.infrastructure.rest.api import app
+from quizzing.quiz.infrastructure.rest.auth import create_access_token
+from quizzing.quiz.infrastructure.rest.registry import RestRegistry
+
+from .database import scratch_async_engine, scratch_engine
+
+EMAIL = "async@example.com"
+PATHS = ["/quizzes", "/submissions"]
+
+
+async def seed(n_quizzes: int) -> None:
+    await RestRegistry.run(RestRegistry.authors.create, EMAIL, hash_password("pw"))
+    author = await RestRegistry.run(RestRegistry.authors.by_email, EMAIL)
+    for i in range(n_quizzes):
+        await RestRegistry.run(RestRegistry.quizzes.create, author, f"Quiz {i}")
+
+
+async def load(args: argparse.Namespace) -> tuple[list[float], float]:
+    headers = {
+        "Authorization": f"Bearer {create_access_token({'sub': EMAIL}, timedelta(hours=1))}"
+    }
+    latencies: list[float] = []
+    remaining = iter(range(args.requests))
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://app") as client:
+
+        async def worker() -> None:
+            for i in remaining:
+                start = time.perf_counter()
+                response = await client.get(PATHS[i % len(PATHS)], headers=headers)
+                response.raise_for_status()
+                latencies.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+        elapsed = time.perf_counter() - start
+    return sorted(latencies), elapsed
+
+
+async def run_async(args: argparse.Namespace) -> tuple[list[float], float]:
+    async with scratch_async_engine(pool_size=args.pool_size) as engine:
+        RestRegistry.initialize(engine)
+        await seed(args.quizzes)
+        return await load(args)
+
+
+def run_sync(args: argparse.Namespace) -> tuple[list[float], float]:
+    with scratch_engine(pool_size=args.pool_size) as engine:
+        RestRegistry.initialize(engine)
+
+        async def run() -> tuple[list[float], float]:
+            await seed(args.quizzes)
+            return await load(args)
+
+        return asyncio.run(run())
+
+
+def report(name: str, latencies: list[float], elapsed: float) -> None:
+    print(
+        f"{name:<6} {len(latencies) / elapsed:>10.1f} "
+        f"{statistics.mean(latencies) * 1000:>10.3f} "
+        f"{statistics.median(latencies) * 1000:>10.3f} "
+        f"{latencies[int(len(latencies) * 0.99) - 1] * 1000:>10.3f}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--pool-size", type=int, default=10)
+    parser.add_argument("--quizzes", type=int, default=10)
+    args = parser.parse_args()
+
+    print(f"{'stack':<6} {'req/s':>10} {'mean ms':>10} {'p50 ms':>10} {'p99 ms':>10}")
+    report("sync", *run_sync(args))
+    report("async", *asyncio.run(run_async(args)))
+
+
+if __name__ == "__main__":
+    main()
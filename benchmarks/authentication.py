@@ -0,0 +1,72 @@
+"""Per-request latency of `GET /quizzes` with and without the author cache.
+
+Without the cache every authenticated request resolves its author with a
+database query; with it, only the first request does.
+
+    python -m benchmarks.authentication --requests 2000
+"""
+
+import argparse
+import statistics
+import time
+from datetime import timedelta
+from typing import Callable
+
+from fastapi.testclient import TestClient
+
+from quizzing.quiz.domain.entities.author import hash_password
+from quizzing.quiz.infrastructure.rest.api import app
+from quizzing.quiz.infrastructure.rest.auth import create_access_token
+from quizzing.quiz.infrastructure.rest.registry import RestRegistry
+
+from .database import scratch_engine
+
+EMAIL = "bench@example.com"
+PASSWORD = "password"
+
+
+def measure(requests: int, request: Callable[[], None]) -> list[float]:
+    latencies = []
+    for _ in range(requests):
+        start = time.perf_counter()
+        request()
+        latencies.append(time.perf_counter() - start)
+    return sorted(latencies)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=2000)
+    args = parser.parse_args()
+
+    with scratch_engine() as engine:
+        RestRegistry.initialize(engine)
+        client = TestClient(app)
+        RestRegistry.authors.create(EMAIL, hash_password(PASSWORD))
+        token = create_access_token({"sub": EMAIL}, timedelta(hours=1))
+        headers = {"Authorization": f"Bearer {token}"}
+
+        def cached() -> None:
+            client.get("/quizzes", headers=headers).raise_for_status()
+
+        def uncached() -> None:
+            RestRegistry.authors.invalidate(EMAIL)
+            client.get("/quizzes", headers=headers).raise_for_status()
+
+        print(f"{'author cache':<14} {'mean ms':>10} {'p50 ms':>10} {'p99 ms':>10}")
+        results = {}
+        for name, request in (("disabled", uncached), ("enabled", cached)):
+            measure(args.requests // 10, request)
+            latencies = measure(args.requests, request)
+            results[name] = statistics.mean(latencies)
+            print(
+                f"{name:<14} {results[name] * 1000:>10.3f} "
+                f"{statistics.median(latencies) * 1000:>10.3f} "
+                f"{latencies[int(len(latencies) * 0.99) - 1] * 1000:>10.3f}"
+            )
+        saving = results["disabled"] - results["enabled"]
+        print(f"saving per request: {saving * 1000:.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
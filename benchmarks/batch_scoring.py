@@ -0,0 +1,113 @@
+"""Scoring submissions one by one against scoring them with `BatchScorer`.
+
+For every size in `--sizes`, random answers to a quiz of `--questions`
+questions are scored with `Quiz.score`, added up like `Submission.complete`
+does, and with `BatchScorer`, from the answers (`encode` + `score`) and from
+their masks alone (`score`). Building millions of `Answer` objects doesn't fit
+in memory, so the per-submission paths run on at most `--sample` submissions
+and are extrapolated linearly, marked with `~`. The scores of the sample are
+checked to be identical.
+
+    python -m benchmarks.batch_scoring --sizes 10000 1000000
+"""
+
+import argparse
+import random
+import time
+from typing import Callable
+
+import numpy as np
+
+from quizzing.quiz.domain.entities.author import AuthorID
+from quizzing.quiz.domain.entities.quiz import AnswerOption, Question, Quiz
+from quizzing.quiz.domain.entities.submission import Answer
+from quizzing.quiz.domain.scoring import BatchScorer
+
+
+def make_quiz(questions: int, seed: int) -> Quiz:
+    rng = random.Random(seed)
+    quiz = Quiz.new("Benchmark", AuthorID("author"))
+    built = []
+    for i in range(questions):
+        options = [AnswerOption(f"Option {j}") for j in range(rng.randint(2, 5))]
+        correct = set(rng.sample(options, rng.randint(1, len(options))))
+        built.append(Question(f"Question {i}", options, correct))
+    quiz.set_questions(built)
+    quiz.publish()
+    return quiz
+
+
+def random_masks(quiz: Quiz, size: int, seed: int) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    masks = np.zeros((size, len(quiz.questions)), dtype=np.uint8)
+    for q, question in enumerate(quiz.questions):
+        n = len(question.options)
+        if question.is_single_choice():
+            # Unanswered or a single option.
+            bit = rng.integers(-1, n, size)
+            masks[:, q] = np.where(bit < 0, 0, 1 << bit.clip(0))
+        else:
+            masks[:, q] = rng.integers(0, 1 << n, size)
+    return masks
+
+
+def to_answers(masks: np.ndarray) -> list[list[Answer]]:
+    return [[Answer(mask) for mask in row] for row in masks.tolist()]
+
+
+def score_one_by_one(quiz: Quiz, submissions: list[list[Answer]]) -> list[float]:
+    totals = []
+    for answers in submissions:
+        total = 0
+        for answer in quiz.score(answers):
+            total = total + answer.score
+        totals.append(total)
+    return totals
+
+
+def timed(fn: Callable[[], object]) -> tuple[float, object]:
+    start = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - start, result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 1_000_000])
+    parser.add_argument("--questions", type=int, default=10)
+    parser.add_argument("--sample", type=int, default=100_000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    quiz = make_quiz(args.questions, args.seed)
+    compile_seconds, scorer = timed(lambda: BatchScorer(quiz))
+    print(f"compiling the quiz: {compile_seconds * 1000:.2f} ms")
+    print(
+        f"{'submissions':>12} {'one by one s':>13} {'encode s':>10} "
+        f"{'score s':>10} {'speedup':>8} {'from masks':>11}"
+    )
+    for size in args.sizes:
+        masks = random_masks(quiz, size, args.seed)
+        sample = min(size, args.sample)
+        submissions = to_answers(masks[:sample])
+        scale = size / sample
+        mark = "~" if sample < size else " "
+
+        scalar_seconds, expected = timed(lambda: score_one_by_one(quiz, submissions))
+        encode_seconds, encoded = timed(lambda: scorer.encode(submissions))
+        score_seconds, totals = timed(lambda: scorer.totals(scorer.score(masks)))
+        assert (encoded == masks[:sample]).all()
+        assert totals[:sample].tolist() == expected, "Scores differ"
+
+        scalar_seconds *= scale
+        encode_seconds *= scale
+        print(
+            f"{size:>12} {mark}{scalar_seconds:>12.3f} {mark}{encode_seconds:>9.3f} "
+            f"{score_seconds:>10.4f} "
+            f"{scalar_seconds / (encode_seconds + score_seconds):>7.1f}x "
+            f"{scalar_seconds / score_seconds:>10.0f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""Latency and retries of concurrent autosaves to the same submission.
+
+`--threads` clients keep calling `SubmissionService.answer` on one submission,
+first with the default optimistic mode (saves that find the submission changed
+since it was read are retried, and fail with a 409 for API clients once out of
+retries) and then with pessimistic locking (the submission row is locked with
+SELECT ... FOR UPDATE).
+
+    python -m benchmarks.contention --threads 8 --calls 50
+"""
+
+import argparse
+import statistics
+import threading
+import time
+
+from quizzing.pkg.db.sqlalchemy import SQLATransactionManager
+from quizzing.pkg.transactional import LockingMode, MaxRetryError
+from quizzing.quiz.application.submission import SubmissionService
+from quizzing.quiz.domain.entities.author import Author, AuthorID
+from quizzing.quiz.domain.entities.quiz import AnswerOption, Question, Quiz, QuizStatus
+from quizzing.quiz.domain.exceptions import VersionConflict
+from quizzing.quiz.domain.registry import DomainRegistry
+from quizzing.quiz.infrastructure.repository.sqlalchemy.repository import (
+    SQLAAuthorRepository,
+    SQLAQuizRepository,
+    SQLASubmissionRepository,
+)
+
+from .database import scratch_engine
+
+OPTIONS = [AnswerOption(o) for o in "ABCDE"]
+
+
+def published_quiz(questions: int) -> Quiz:
+    quiz = Quiz.new("Quiz", AuthorID("author"))
+    quiz.set_questions(
+        [Question(f"Question {i}", OPTIONS, {OPTIONS[0]}) for i in range(questions)]
+    )
+    quiz.status = QuizStatus.PUBLISHED
+    DomainRegistry.quizzes.save(quiz)
+    return quiz
+
+
+def run(
+    mode: LockingMode,
+    manager: SQLATransactionManager,
+    author: Author,
+    args: argparse.Namespace,
+) -> None:
+    service = SubmissionService(manager, mode)
+    quiz = published_quiz(args.questions)
+    submission = service.start(author, quiz.id)
+    latencies: list[float] = []
+    conflicts = 0
+    barrier = threading.Barrier(args.threads)
+
+    def client(n: int) -> None:
+        nonlocal conflicts
+        barrier.wait()
+        for i in range(args.calls):
+            answers = [
+                {OPTIONS[(n + i + q) % len(OPTIONS)]} for q in range(args.questions)
+            ]
+            start = time.perf_counter()
+            try:
+                service.answer(author, submission.id, answers)
+            except (VersionConflict, MaxRetryError):
+                conflicts += 1
+            latencies.append(time.perf_counter() - start)
+
+    before = SubmissionService.answer.stats.snapshot()
+    threads = [threading.Thread(target=client, args=(n,)) for n in range(args.threads)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    after = SubmissionService.answer.stats.snapshot()
+
+    latencies.sort()
+    print(
+        f"{mode.name.lower():<12} {len(latencies) / elapsed:>8.1f} "
+        f"{statistics.median(latencies) * 1000:>10.3f} "
+        f"{latencies[int(len(latencies) * 0.99) - 1] * 1000:>10.3f} "
+        f"{after['retries'] - before['retries']:>8} "
+        f"{after['backoff_seconds'] - before['backoff_seconds']:>10.3f} "
+        f"{conflicts:>10}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--calls", type=int, default=50)
+    parser.add_argument("--questions", type=int, default=10)
+    args = parser.parse_args()
+
+    with scratch_engine(pool_size=args.threads) as engine:
+        manager = SQLATransactionManager(engine)
+        DomainRegistry.initialize(
+            SQLAQuizRepository(manager),
+            SQLASubmissionRepository(manager),
+            SQLAAuthorRepository(manager),
+        )
+        author = Author(AuthorID("author"), "author@example.com", "hashed")
+        DomainRegistry.authors.save(author)
+
+        print(
+            f"{'mode':<12} {'calls/s':>8} {'p50 ms':>10} {'p99 ms':>10} "
+            f"{'retries':>8} {'backoff s':>10} {'conflicts':>10}"
+        )
+        for mode in LockingMode:
+            run(mode, manager, author, args)
+
+
+if __name__ == "__main__":
+    main()
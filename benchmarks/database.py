@@ -0,0 +1,77 @@
+"""Helpers shared by the benchmarks that need a PostgreSQL database."""
+
+from contextlib import asynccontextmanager, contextmanager
+from typing import AsyncIterator, Iterator
+from uuid import uuid4
+
+from sqlalchemy import Engine, create_engine, event, text
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+
+from quizzing.quiz.infrastructure.repository.sqlalchemy import models  # noqa
+from quizzing.quiz.infrastructure.repository.sqlalchemy.config import (
+    QUIZZING_QUIZ_ASYNC_DB_URL,
+    QUIZZING_QUIZ_DB_URL,
+    get_metadata,
+)
+
+
+@contextmanager
+def scratch_schema() -> Iterator[str]:
+    """Yields the name of a throwaway schema holding the quizzing tables."""
+    schema = f"bench_{uuid4().hex}"
+    engine = create_engine(QUIZZING_QUIZ_DB_URL)
+    with engine.begin() as connection:
+        connection.execute(text(f"CREATE SCHEMA {schema}"))
+        connection.execute(text(f"SET LOCAL search_path TO {schema}"))
+        get_metadata().create_all(connection)
+    try:
+        yield schema
+    finally:
+        with engine.begin() as connection:
+            connection.execute(text(f"DROP SCHEMA {schema} CASCADE"))
+        engine.dispose()
+
+
+@contextmanager
+def scratch_engine(**engine_kwargs) -> Iterator[Engine]:
+    """Yields an engine bound to a throwaway schema holding the quizzing tables."""
+    with scratch_schema() as schema:
+        engine = create_engine(
+            QUIZZING_QUIZ_DB_URL,
+            connect_args={"options": f"-csearch_path={schema}"},
+            **engine_kwargs,
+        )
+        try:
+            yield engine
+        finally:
+            engine.dispose()
+
+
+@asynccontextmanager
+async def scratch_async_engine(**engine_kwargs) -> AsyncIterator[AsyncEngine]:
+    """Same as `scratch_engine`, for an asyncpg engine."""
+    with scratch_schema() as schema:
+        engine = create_async_engine(
+            QUIZZING_QUIZ_ASYNC_DB_URL,
+            connect_args={"server_settings": {"search_path": schema}},
+            **engine_kwargs,
+        )
+        try:
+            yield engine
+        finally:
+            await engine.dispose()
+
+
+class StatementCounter:
+    """Counts the statements an engine sends to the database."""
+
+    def __init__(self, engine: Engine) -> None:
+        self.count = 0
+        event.listen(engine, "before_cursor_execute", self._on_execute)
+
+    def _on_execute(self, *args) -> None:
+        self.count += 1
+
+    def reset(self) -> int:
+        count, self.count = self.count, 0
+        return count
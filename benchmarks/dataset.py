@@ -0,0 +1,335 @@
+"""Synthetic dataset generator and bulk loader for scale testing.
+
+Generates authors, quizzes with their questions, and submissions with their
+answers, and loads them with PostgreSQL COPY. Quiz popularity follows a Zipf
+distribution, so a few quizzes get most of the submissions, and so does the
+number of quizzes each author writes. Every author can log in with the password
+`password`.
+
+    python -m benchmarks.dataset --authors 10000 --quizzes 100000 --submissions 1000000
+
+Benchmarks use `load_dataset` directly, usually on a `scratch_engine`.
+"""
+
+import argparse
+import csv
+import io
+import random
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Iterable, Iterator
+from uuid import UUID
+
+from sqlalchemy import Engine, Table, create_engine, text
+
+from quizzing.quiz.domain.entities.author import hash_password
+from quizzing.quiz.domain.entities.quiz import AnswerOption, Question
+from quizzing.quiz.domain.entities.submission import Answer
+from quizzing.quiz.infrastructure.repository.sqlalchemy.config import (
+    QUIZZING_QUIZ_DB_URL,
+    get_metadata,
+)
+from quizzing.quiz.infrastructure.repository.sqlalchemy.models import (
+    author_table,
+    question_table,
+    quiz_table,
+    submission_table,
+)
+
+PASSWORD = "password"
+OPTIONS = [AnswerOption(o) for o in "ABCDE"]
+# Rows sent per COPY statement.
+COPY_BATCH = 50_000
+
+
+@dataclass
+class DatasetSpec:
+    authors: int = 1_000
+    quizzes: int = 10_000
+    submissions: int = 100_000
+    published_ratio: float = 0.8
+    completed_ratio: float = 0.7
+    # Zipf exponents of quiz popularity and of the quizzes written per author.
+    popularity_skew: float = 1.1
+    authorship_skew: float = 1.0
+    seed: int = 0
+
+    @classmethod
+    def scaled(cls, submissions: int) -> "DatasetSpec":
+        """The default proportions, for `submissions` submissions."""
+        return cls(
+            authors=max(100, submissions // 100),
+            quizzes=max(10, submissions // 10),
+            submissions=submissions,
+        )
+
+
+@dataclass
+class Dataset:
+    """What was loaded, for benchmarks to pick their authors and quizzes."""
+
+    author_ids: list[str]
+    # Published quizzes, most answered first.
+    popular_quiz_ids: list[str]
+    rows: dict[str, int] = field(default_factory=dict)
+
+    @staticmethod
+    def email(author_index: int) -> str:
+        return f"author{author_index}@example.com"
+
+
+def _zipf_weights(n: int, skew: float) -> list[float]:
+    return [1 / (rank**skew) for rank in range(1, n + 1)]
+
+
+def _array(values: Iterable[str]) -> str:
+    """A PostgreSQL array literal, as COPY expects it."""
+    quoted = ('"' + v.replace("\\", "\\\\").replace('"', '\\"') + '"' for v in values)
+    return "{" + ",".join(quoted) + "}"
+
+
+def _number_array(values: Iterable[float | None]) -> str:
+    return "{" + ",".join("NULL" if v is None else repr(v) for v in values) + "}"
+
+
+class _Generator:
+    def __init__(self, spec: DatasetSpec) -> None:
+        self.spec = spec
+        self.rng = random.Random(spec.seed)
+        self.author_ids = [self._uuid() for _ in range(spec.authors)]
+        self.quiz_ids = [self._uuid() for _ in range(spec.quizzes)]
+        self.published = [
+            self.rng.random() < spec.published_ratio for _ in range(spec.quizzes)
+        ]
+        self.questions: dict[int, list[Question]] = {}
+
+    def _uuid(self) -> str:
+        return str(UUID(int=self.rng.getrandbits(128), version=4))
+
+    def authors(self) -> Iterator[tuple]:
+        hashed_password = hash_password(PASSWORD)
+        for n, author_id in enumerate(self.author_ids):
+            yield author_id, Dataset.email(n), hashed_password
+
+    def quizzes(self) -> Iterator[tuple]:
+        weights = _zipf_weights(self.spec.authors, self.spec.authorship_skew)
+        owners = self.rng.choices(self.author_ids, weights, k=self.spec.quizzes)
+        for n, quiz_id in enumerate(self.quiz_ids):
+            status = "published" if self.published[n] else "draft"
+            yield quiz_id, f"Quiz {n}", owners[n], status
+
+    def _make_questions(self) -> list[Question]:
+        questions = []
+        # Quizzes have between 1 and 10 questions, most of them 5 or more.
+        for i in range(min(10, max(1, round(self.rng.gauss(7, 2))))):
+            options = OPTIONS[: self.rng.randint(2, len(OPTIONS))]
+            n_correct = 1 if self.rng.random() < 0.7 else self.rng.randint(1, 2)
+            correct = set(self.rng.sample(options, n_correct))
+            questions.append(Question(f"Question {i}", options, correct))
+        return questions
+
+    def questions_rows(self) -> Iterator[tuple]:
+        for n, quiz_id in enumerate(self.quiz_ids):
+            questions = self._make_questions()
+            if self.published[n]:
+                self.questions[n] = questions
+            for index, question in enumerate(questions):
+                yield (
+                    index,
+                    quiz_id,
+                    question.text,
+                    _array(question.options),
+                    _array(sorted(question.correct_options)),
+                )
+
+    def _submission_counts(self) -> dict[int, int]:
+        """Submissions per published quiz, most answered first."""
+        published = [n for n in range(self.spec.quizzes) if self.published[n]]
+        if not published:
+            return {}
+        self.rng.shuffle(published)
+        weights = _zipf_weights(len(published), self.spec.popularity_skew)
+        drawn = Counter(self.rng.choices(published, weights, k=self.spec.submissions))
+        # An author answers each quiz at most once, what doesn't fit in a quiz
+        # goes to the next most popular ones.
+        counts: dict[int, int] = {}
+        overflow = 0
+        for n in published:
+            wanted = drawn[n] + overflow
+            counts[n] = min(wanted, self.spec.authors)
+            overflow = wanted - counts[n]
+        return {n: k for n, k in counts.items() if k > 0}
+
+    def submissions(self) -> Iterator[tuple]:
+        counts = self._submission_counts()
+        self.popular_quiz_ids = [self.quiz_ids[n] for n in counts]
+        for n, count in counts.items():
+            questions = self.questions[n]
+            for author_id in self.rng.sample(self.author_ids, count):
+                completed = self.rng.random() < self.spec.completed_ratio
+                score = 0.0
+                answers = []
+                for question in questions:
+                    answer = Answer(question.encode(self._choose(question)))
+                    if completed:
+                        answer = question._score(answer)
+                        score += answer.score
+                    answers.append(answer)
+                yield (
+                    self._uuid(),
+                    self.quiz_ids[n],
+                    author_id,
+                    "completed" if completed else "in_progress",
+                    score if completed else None,
+                    _number_array(a.mask for a in answers),
+                    _number_array(a.score for a in answers),
+                )
+
+    def _choose(self, question: Question) -> set[AnswerOption]:
+        if self.rng.random() < 0.1:
+            return set()
+        if question.is_single_choice():
+            # Most answers to single choice questions are right.
+            if self.rng.random() < 0.6:
+                return set(question.correct_options)
+            return {self.rng.choice(question.options)}
+        k = self.rng.randint(1, len(question.options))
+        return set(self.rng.sample(question.options, k))
+
+
+def _copy(cursor: Any, table: Table, columns: list[str], rows: list[tuple]) -> None:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    # COPY's CSV format reads an unquoted empty field as NULL.
+    writer.writerows(rows)
+    buffer.seek(0)
+    cursor.copy_expert(
+        f"COPY {table.name} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)",
+        buffer,
+    )
+
+
+def _copy_all(
+    cursor: Any, table: Table, columns: list[str], rows: Iterable[tuple]
+) -> int:
+    batch: list[tuple] = []
+    total = 0
+    for row in rows:
+        batch.append(row)
+        if len(batch) == COPY_BATCH:
+            _copy(cursor, table, columns, batch)
+            total += len(batch)
+            batch.clear()
+    if batch:
+        _copy(cursor, table, columns, batch)
+        total += len(batch)
+    return total
+
+
+def load_dataset(engine: Engine, spec: DatasetSpec | None = None) -> Dataset:
+    """Generates a dataset after `spec` and loads it in a single transaction
+    into the quizzing tables `engine` sees, which must already exist."""
+    generator = _Generator(spec or DatasetSpec())
+    rows: dict[str, int] = {}
+    connection = engine.raw_connection()
+    try:
+        cursor = connection.cursor()
+        # Losing the load in a crash is fine, it can always be generated again.
+        cursor.execute("SET LOCAL synchronous_commit = off")
+        rows["author"] = _copy_all(
+            cursor,
+            author_table,
+            ["id", "email", "hashed_password"],
+            generator.authors(),
+        )
+        rows["quiz"] = _copy_all(
+            cursor,
+            quiz_table,
+            ["id", "title", "author_id", "status"],
+            generator.quizzes(),
+        )
+        rows["question"] = _copy_all(
+            cursor,
+            question_table,
+            ["index", "quiz_id", "text", "options", "correct_options"],
+            generator.questions_rows(),
+        )
+        rows["submission"] = _copy_all(
+            cursor,
+            submission_table,
+            [
+                "id",
+                "quiz_id",
+                "author_id",
+                "status",
+                "score",
+                "answer_masks",
+                "answer_scores",
+            ],
+            generator.submissions(),
+        )
+        for table in get_metadata().sorted_tables:
+            cursor.execute(f"ANALYZE {table.name}")
+        connection.commit()
+    finally:
+        connection.close()
+    return Dataset(generator.author_ids, generator.popular_quiz_ids, rows)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    defaults = DatasetSpec()
+    parser.add_argument("--authors", type=int, default=defaults.authors)
+    parser.add_argument("--quizzes", type=int, default=defaults.quizzes)
+    parser.add_argument("--submissions", type=int, default=defaults.submissions)
+    parser.add_argument(
+        "--published-ratio", type=float, default=defaults.published_ratio
+    )
+    parser.add_argument(
+        "--completed-ratio", type=float, default=defaults.completed_ratio
+    )
+    parser.add_argument(
+        "--popularity-skew", type=float, default=defaults.popularity_skew
+    )
+    parser.add_argument(
+        "--authorship-skew", type=float, default=defaults.authorship_skew
+    )
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+    parser.add_argument(
+        "--truncate",
+        action="store_true",
+        help="empty the quizzing tables before loading",
+    )
+    args = parser.parse_args()
+    spec = DatasetSpec(
+        authors=args.authors,
+        quizzes=args.quizzes,
+        submissions=args.submissions,
+        published_ratio=args.published_ratio,
+        completed_ratio=args.completed_ratio,
+        popularity_skew=args.popularity_skew,
+        authorship_skew=args.authorship_skew,
+        seed=args.seed,
+    )
+
+    engine = create_engine(QUIZZING_QUIZ_DB_URL)
+    if args.truncate:
+        tables = ", ".join(t.name for t in get_metadata().sorted_tables)
+        with engine.begin() as connection:
+            connection.execute(text(f"TRUNCATE {tables} CASCADE"))
+    start = time.perf_counter()
+    dataset = load_dataset(engine, spec)
+    elapsed = time.perf_counter() - start
+    engine.dispose()
+
+    for table, count in dataset.rows.items():
+        print(f"{table:<12} {count:>12,}")
+    total = sum(dataset.rows.values())
+    print(
+        f"{'total':<12} {total:>12,} rows in {elapsed:.1f}s, {total / elapsed:,.0f}/s"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""SQL statements sent to the database by each REST endpoint.
+
+Walks through the life of a quiz with the FastAPI test client: an author creates,
+edits and publishes a quiz, then answers and completes a submission to it. Every
+request is issued `--repeat` times against a fresh quiz and the statements it
+sends are counted; the author is authenticated up front so the author cache
+keeps its lookups out of the counts.
+
+    python -m benchmarks.endpoint_queries --repeat 3
+"""
+
+import argparse
+from datetime import timedelta
+from typing import Callable
+
+from fastapi.testclient import TestClient
+from httpx import Response
+
+from quizzing.quiz.domain.entities.author import Author, AuthorID
+from quizzing.quiz.domain.registry import DomainRegistry
+from quizzing.quiz.infrastructure.rest.api import app
+from quizzing.quiz.infrastructure.rest.auth import create_access_token
+from quizzing.quiz.infrastructure.rest.registry import RestRegistry
+
+from .database import StatementCounter, scratch_engine
+
+QUESTIONS = [
+    {"text": f"Question {i}", "options": ["A", "B", "C"], "correct_options": ["A"]}
+    for i in range(5)
+]
+
+
+Step = tuple[str, Callable[[], Response], Callable[[Response], None] | None]
+
+
+def walkthrough(client: TestClient, author: Author) -> list[Step]:
+    """The requests of one walkthrough, each sent after the previous one along
+    with a callback that runs on its response once the statements are counted."""
+    ids: dict[str, str] = {}
+
+    def created_quiz(response: Response) -> None:
+        ids["quiz"] = response.json()["id"]
+
+    def started_submission(response: Response) -> None:
+        # The endpoint only answers with the quiz id.
+        ids["submission"] = next(
+            submission.id
+            for submission in DomainRegistry.submissions.by_author(author.id)
+            if submission.quiz_id == ids["quiz"]
+        )
+
+    return [
+        (
+            "POST /quizzes",
+            lambda: client.post("/quizzes", json={"title": "Quiz"}),
+            created_quiz,
+        ),
+        (
+            "PUT /quizzes/{id}",
+            lambda: client.put(
+                f"/quizzes/{ids['quiz']}",
+                json={"title": "Edited", "questions": QUESTIONS},
+            ),
+            None,
+        ),
+        (
+            "POST /quizzes/{id}/publish",
+            lambda: client.post(f"/quizzes/{ids['quiz']}/publish"),
+            None,
+        ),
+        ("GET /quizzes/{id}", lambda: client.get(f"/quizzes/{ids['quiz']}"), None),
+        ("GET /quizzes", lambda: client.get("/quizzes?page_size=20"), None),
+        (
+            "POST /submissions",
+            lambda: client.post("/submissions", json={"quiz_id": ids["quiz"]}),
+            started_submission,
+        ),
+        (
+            "PUT /submissions/{id}/answers",
+            lambda: client.put(
+                f"/submissions/{ids['submission']}/answers",
+                json={"answers": [["A"]] * len(QUESTIONS)},
+            ),
+            None,
+        ),
+        (
+            "PUT /submissions/{id}/complete",
+            lambda: client.put(f"/submissions/{ids['submission']}/complete"),
+            None,
+        ),
+        ("GET /submissions", lambda: client.get("/submissions"), None),
+        (
+            "GET /quizzes/{id}/submissions",
+            lambda: client.get(f"/quizzes/{ids['quiz']}/submissions"),
+            None,
+        ),
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with scratch_engine() as engine:
+        RestRegistry.initialize(engine)
+        author = Author(AuthorID("author"), "author@example.com", "hashed")
+        DomainRegistry.authors.save(author)
+        token = create_access_token({"sub": author.email}, timedelta(hours=1))
+        counter = StatementCounter(engine)
+        counts: dict[str, list[int]] = {}
+        with TestClient(app, headers={"Authorization": f"Bearer {token}"}) as client:
+            RestRegistry.authors.authenticated(author.email)
+            for _ in range(args.repeat):
+                # Each walkthrough answers its own quiz, authors only get one
+                # submission per quiz.
+                for name, request, callback in walkthrough(client, author):
+                    counter.reset()
+                    response = request()
+                    assert response.is_success, (name, response.text)
+                    counts.setdefault(name, []).append(counter.reset())
+                    if callback is not None:
+                        callback(response)
+
+    print(f"{'endpoint':<32} {'statements':>10}")
+    for name, per_request in counts.items():
+        print(f"{name:<32} {max(per_request):>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""Lookup latency of the in-memory repositories at realistic data sizes.
+
+Seeds `--authors` authors owning `--quizzes` quizzes, with `--submissions`
+submissions spread over them, then times the repository calls the services
+make on every request.
+
+    python -m benchmarks.inmemory --authors 1000 --quizzes 10000 --submissions 100000
+"""
+
+import argparse
+import random
+import timeit
+from typing import Callable
+
+from quizzing.quiz.domain.dto import QuizFilter
+from quizzing.quiz.domain.entities.author import Author, AuthorID
+from quizzing.quiz.domain.entities.quiz import Quiz, QuizID, QuizStatus
+from quizzing.quiz.domain.entities.submission import Submission, SubmissionID
+from quizzing.quiz.infrastructure.repository.inmemory.repository import (
+    InMemoryAuthorRepository,
+    InMemoryQuizRepository,
+    InMemorySubmissionRepository,
+)
+
+
+def per_call_us(fn: Callable[[], object], calls: int) -> float:
+    return min(timeit.repeat(fn, number=calls, repeat=3)) / calls * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--authors", type=int, default=1_000)
+    parser.add_argument("--quizzes", type=int, default=10_000)
+    parser.add_argument("--submissions", type=int, default=100_000)
+    parser.add_argument("--calls", type=int, default=200)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    authors = InMemoryAuthorRepository()
+    quizzes = InMemoryQuizRepository()
+    submissions = InMemorySubmissionRepository()
+    author_ids = [AuthorID(f"author{n}") for n in range(args.authors)]
+    for author_id in author_ids:
+        authors.save(Author(author_id, f"{author_id}@example.com", "hashed"))
+    quiz_ids = [QuizID(f"quiz{n}") for n in range(args.quizzes)]
+    for quiz_id in quiz_ids:
+        status = rng.choice([QuizStatus.DRAFT, QuizStatus.PUBLISHED])
+        quizzes.save(Quiz(quiz_id, "Quiz", rng.choice(author_ids), status))
+    submission_ids = [SubmissionID(f"submission{n}") for n in range(args.submissions)]
+    for submission_id in submission_ids:
+        submission = Submission(
+            submission_id,
+            rng.choice(quiz_ids),
+            rng.choice(author_ids),
+            Submission.Status.IN_PROGRESS,
+            [],
+            None,
+        )
+        submissions.save(submission)
+
+    author_id = author_ids[len(author_ids) // 2]
+    cases: dict[str, Callable[[], object]] = {
+        "authors.by_email": lambda: authors.by_email(f"{author_id}@example.com"),
+        "quizzes.get": lambda: quizzes.get(quiz_ids[-1]),
+        "quizzes.list published": lambda: quizzes.list(
+            QuizFilter(status=QuizStatus.PUBLISHED, page=5)
+        ),
+        "quizzes.list by author": lambda: quizzes.list(QuizFilter(author_id=author_id)),
+        "submissions.get": lambda: submissions.get(submission_ids[-1]),
+        "submissions.by_author": lambda: submissions.by_author(author_id),
+        "submissions.by_quiz": lambda: submissions.by_quiz(quiz_ids[-1], 1, 10),
+        "submissions.save": lambda: submissions.save(
+            submissions.get(submission_ids[-1])
+        ),
+    }
+    print(f"{'call':<26} {'us':>10}")
+    for name, call in cases.items():
+        print(f"{name:<26} {per_call_us(call, args.calls):>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""Request latency impact of logging synchronously or through the queue.
+
+Runs `--threads` threads serving `--requests` simulated requests each, every
+request waiting `--wait-us` on I/O, as for the database, and making `--logs`
+log calls. Logging is either disabled, written synchronously to a rotating file
+like the old configuration did, or handed to `BoundedQueueHandler` in front of
+that same file, in plain text and in JSON. The file rotates every `--rotate-kb`
+KB.
+
+Each setup runs against the file as is and against a stalling one, which
+blocks for `--stall-ms` every `--stall-every` records the way a busy disk or a
+full stdout pipe does.
+
+    python -m benchmarks.logging_latency --threads 8 --requests 500 --logs 5
+"""
+
+import argparse
+import logging
+import statistics
+import tempfile
+import threading
+import time
+from logging.handlers import RotatingFileHandler
+from pathlib import Path
+from typing import Callable
+
+from quizzing.pkg.logging.pipeline import BoundedQueueHandler, JsonFormatter
+
+FORMAT = "%(asctime)s | %(levelname)-8s | %(name)-30s: %(message)s"
+
+
+class StallingHandler(RotatingFileHandler):
+    def __init__(self, *args, stall: float, every: int, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self._stall = stall
+        self._every = every
+        self._emitted = 0
+
+    def emit(self, record: logging.LogRecord) -> None:
+        super().emit(record)
+        self._emitted += 1
+        if self._stall and self._emitted % self._every == 0:
+            # Called with the handler lock held, like a blocking write.
+            time.sleep(self._stall)
+
+
+def run(
+    logger: logging.Logger, threads: int, requests: int, logs: int, wait: float
+) -> list[float]:
+    latencies: list[float] = []
+    lock = threading.Lock()
+
+    def serve() -> None:
+        mine = []
+        for n in range(requests):
+            start = time.perf_counter()
+            for i in range(logs):
+                time.sleep(wait / logs)
+                logger.info("request %d step %d of %s", n, i, "quiz", extra={"n": n})
+            mine.append(time.perf_counter() - start)
+        with lock:
+            latencies.extend(mine)
+
+    workers = [threading.Thread(target=serve) for _ in range(threads)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return latencies
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--logs", type=int, default=5)
+    parser.add_argument("--wait-us", type=float, default=2000)
+    parser.add_argument("--rotate-kb", type=int, default=256)
+    parser.add_argument("--stall-ms", type=float, default=20)
+    parser.add_argument("--stall-every", type=int, default=500)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+
+        def file_handler(formatter: logging.Formatter, stall: float) -> logging.Handler:
+            handler = StallingHandler(
+                Path(directory) / "quizzing.log",
+                maxBytes=args.rotate_kb * 1024,
+                backupCount=3,
+                stall=stall,
+                every=args.stall_every,
+            )
+            handler.setFormatter(formatter)
+            return handler
+
+        setups: dict[str, Callable[[float], logging.Handler | None]] = {
+            "disabled": lambda stall: None,
+            "sync": lambda stall: file_handler(logging.Formatter(FORMAT), stall),
+            "queue": lambda stall: BoundedQueueHandler(
+                [file_handler(logging.Formatter(FORMAT), stall)]
+            ),
+            "queue json": lambda stall: BoundedQueueHandler(
+                [file_handler(JsonFormatter(), stall)]
+            ),
+        }
+        print(
+            f"{'sink':<9} {'logging':<12} {'p50 ms':>8} {'p99 ms':>8} "
+            f"{'max ms':>8} {'req/s':>8} {'dropped':>8}"
+        )
+        cases = [
+            (sink, name, setup)
+            for sink in ("fast", "stalling")
+            for name, setup in setups.items()
+        ]
+        for sink, name, setup in cases:
+            stall = args.stall_ms / 1000 if sink == "stalling" else 0.0
+            logger = logging.getLogger(f"benchmarks.logging_latency.{sink}.{name}")
+            logger.propagate = False
+            logger.setLevel(logging.INFO)
+            handler = setup(stall)
+            if handler is None:
+                logger.disabled = True
+            else:
+                logger.addHandler(handler)
+            start = time.perf_counter()
+            latencies = run(
+                logger, args.threads, args.requests, args.logs, args.wait_us / 1e6
+            )
+            elapsed = time.perf_counter() - start
+            dropped = getattr(handler, "dropped", 0)
+            if handler is not None:
+                handler.close()
+            quantiles = statistics.quantiles(latencies, n=100)
+            print(
+                f"{sink:<9} {name:<12} {quantiles[49] * 1000:>8.3f} "
+                f"{quantiles[98] * 1000:>8.3f} {max(latencies) * 1000:>8.2f} "
+                f"{len(latencies) / elapsed:>8.0f} {dropped:>8}"
+            )
+
+
+if __name__ == "__main__":
+    main()
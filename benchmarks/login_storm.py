@@ -0,0 +1,122 @@
+"""Quiz read latency while the API is flooded with logins.
+
+Measures `GET /quizzes` latency with no other traffic, then again while
+`--concurrency` clients keep calling `POST /api/login`. With `--inline-hashing`
+bcrypt runs on the request thread pool, as it did before the password process
+pool existed, which shows the difference.
+
+    python -m benchmarks.login_storm --concurrency 64
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from collections import Counter
+from datetime import timedelta
+
+import email_validator
+import httpx
+from fastapi.concurrency import run_in_threadpool
+
+from quizzing.quiz.domain.entities.author import hash_password
+from quizzing.quiz.infrastructure.rest.api import app
+from quizzing.quiz.infrastructure.rest.auth import create_access_token
+from quizzing.quiz.infrastructure.rest.registry import RestRegistry
+
+from .database import scratch_engine
+
+EMAIL = "storm@example.com"
+PASSWORD = "password"
+
+
+class InlineExecutor:
+    async def run(self, fn, *args):
+        return await run_in_threadpool(fn, *args)
+
+    def shutdown(self) -> None: ...
+
+
+async def read_latencies(client: httpx.AsyncClient, token: str, n: int) -> list[float]:
+    latencies = []
+    for _ in range(n):
+        start = time.perf_counter()
+        response = await client.get(
+            "/quizzes", headers={"Authorization": f"Bearer {token}"}
+        )
+        response.raise_for_status()
+        latencies.append(time.perf_counter() - start)
+    return sorted(latencies)
+
+
+async def login_forever(client: httpx.AsyncClient, statuses: Counter) -> None:
+    while True:
+        response = await client.post(
+            "/api/login", data={"username": EMAIL, "password": PASSWORD}
+        )
+        statuses[response.status_code] += 1
+        if response.status_code == 503:
+            # Clients back off instead of hammering the rejected endpoint.
+            await asyncio.sleep(float(response.headers["Retry-After"]) / 10)
+
+
+def report(name: str, latencies: list[float]) -> None:
+    print(
+        f"{name:<10} {statistics.mean(latencies) * 1000:>10.3f} "
+        f"{statistics.median(latencies) * 1000:>10.3f} "
+        f"{latencies[int(len(latencies) * 0.99) - 1] * 1000:>10.3f}"
+    )
+
+
+async def run(args: argparse.Namespace) -> None:
+    token = create_access_token({"sub": EMAIL}, timedelta(hours=1))
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://app") as client:
+        # Start the password pool and warm up the connection pool.
+        response = await client.post(
+            "/api/login", data={"username": EMAIL, "password": PASSWORD}
+        )
+        response.raise_for_status()
+        await read_latencies(client, token, 20)
+        idle = await read_latencies(client, token, args.reads)
+
+        statuses: Counter = Counter()
+        storm = [
+            asyncio.create_task(login_forever(client, statuses))
+            for _ in range(args.concurrency)
+        ]
+        await asyncio.sleep(0.5)
+        loaded = await read_latencies(client, token, args.reads)
+        for task in storm:
+            task.cancel()
+        await asyncio.gather(*storm, return_exceptions=True)
+
+    print(f"{'reads':<10} {'mean ms':>10} {'p50 ms':>10} {'p99 ms':>10}")
+    report("idle", idle)
+    report("storm", loaded)
+    print("login responses:", dict(statuses))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--reads", type=int, default=100)
+    parser.add_argument("--inline-hashing", action="store_true")
+    args = parser.parse_args()
+
+    # The storm is about password hashing, not about DNS lookups for the email
+    # domain.
+    email_validator.CHECK_DELIVERABILITY = False
+    with scratch_engine(pool_size=20) as engine:
+        RestRegistry.initialize(engine)
+        if args.inline_hashing:
+            RestRegistry.passwords = InlineExecutor()
+        RestRegistry.authors.create(EMAIL, hash_password(PASSWORD))
+        try:
+            asyncio.run(run(args))
+        finally:
+            RestRegistry.passwords.shutdown()
+
+
+if __name__ == "__main__":
+    main()
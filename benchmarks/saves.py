@@ -0,0 +1,132 @@
+"""Round-trips and latency of SQLAQuizRepository/SQLASubmissionRepository saves.
+
+Measures a quiz edit (title and all questions rewritten) and a submission
+autosave (a single answer changes), which is what `PUT /submissions/{id}/answers`
+does on every update. A third case saves `--batch` submissions, each by a
+different author, in a single transaction.
+
+    python -m benchmarks.saves --iterations 500 --batch 10
+"""
+
+import argparse
+import statistics
+import time
+from typing import Callable
+
+from quizzing.pkg.db.sqlalchemy import SQLATransactionManager
+from quizzing.quiz.domain.entities.author import Author, AuthorID
+from quizzing.quiz.domain.entities.quiz import AnswerOption, Question, Quiz, QuizStatus
+from quizzing.quiz.domain.entities.submission import Answer, Submission, SubmissionID
+from quizzing.quiz.infrastructure.repository.sqlalchemy.repository import (
+    SQLAAuthorRepository,
+    SQLAQuizRepository,
+    SQLASubmissionRepository,
+)
+
+from .database import StatementCounter, scratch_engine
+
+OPTIONS = [AnswerOption(o) for o in "ABCDE"]
+
+
+def measure(
+    name: str,
+    iterations: int,
+    counter: StatementCounter,
+    save: Callable[[int], None],
+) -> None:
+    latencies: list[float] = []
+    round_trips: list[int] = []
+    for i in range(iterations):
+        counter.reset()
+        start = time.perf_counter()
+        save(i)
+        latencies.append(time.perf_counter() - start)
+        round_trips.append(counter.reset())
+    latencies.sort()
+    p99 = latencies[int(len(latencies) * 0.99) - 1]
+    print(
+        f"{name:<18} {statistics.mean(round_trips):>12.1f} "
+        f"{statistics.mean(latencies) * 1000:>10.3f} "
+        f"{statistics.median(latencies) * 1000:>10.3f} {p99 * 1000:>10.3f}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=500)
+    parser.add_argument("--questions", type=int, default=10)
+    parser.add_argument("--batch", type=int, default=10)
+    args = parser.parse_args()
+
+    with scratch_engine() as engine:
+        manager = SQLATransactionManager(engine)
+        quizzes = SQLAQuizRepository(manager)
+        submissions = SQLASubmissionRepository(manager)
+        author = Author(AuthorID("author"), "author@example.com", "hashed")
+        SQLAAuthorRepository(manager).save(author)
+
+        quiz = Quiz.new("Benchmark", author.id)
+        quiz.set_questions(
+            [
+                Question(f"Question {i}", OPTIONS, {OPTIONS[0]})
+                for i in range(args.questions)
+            ]
+        )
+        quiz.status = QuizStatus.PUBLISHED
+        quizzes.save(quiz)
+        submission = Submission(
+            SubmissionID("submission"),
+            quiz.id,
+            author.id,
+            Submission.Status.IN_PROGRESS,
+            [Answer.empty() for _ in range(args.questions)],
+            None,
+        )
+        submissions.save(submission)
+        batch = []
+        for n in range(args.batch):
+            batch_author = Author(
+                AuthorID(f"author{n}"), f"author{n}@example.com", "hashed"
+            )
+            SQLAAuthorRepository(manager).save(batch_author)
+            batch.append(
+                Submission(
+                    SubmissionID(f"submission{n}"),
+                    quiz.id,
+                    batch_author.id,
+                    Submission.Status.IN_PROGRESS,
+                    [Answer.empty() for _ in range(args.questions)],
+                    None,
+                )
+            )
+            submissions.save(batch[-1])
+
+        def save_quiz(i: int) -> None:
+            quiz.title = f"Benchmark {i}"
+            quizzes.save(quiz)
+
+        def save_submission(i: int) -> None:
+            submission.answers = list(submission.answers)
+            submission.answers[i % args.questions] = Answer(1 << i % len(OPTIONS))
+            submissions.save(submission)
+
+        def save_batch(i: int) -> None:
+            with manager.transaction():
+                for batch_submission in batch:
+                    batch_submission.answers = list(batch_submission.answers)
+                    batch_submission.answers[i % args.questions] = Answer(
+                        1 << i % len(OPTIONS)
+                    )
+                    submissions.save(batch_submission)
+
+        counter = StatementCounter(engine)
+        print(
+            f"{'save':<18} {'round-trips':>12} {'mean ms':>10} {'p50 ms':>10} {'p99 ms':>10}"
+        )
+        measure("quiz", args.iterations, counter, save_quiz)
+        measure("submission", args.iterations, counter, save_submission)
+        measure(f"{args.batch} submissions", args.iterations, counter, save_batch)
+
+
+if __name__ == "__main__":
+    main()
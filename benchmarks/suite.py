@@ -0,0 +1,219 @@
+"""Benchmark suite of the domain, repository and HTTP layers.
+
+`run` times every benchmark of the selected layers and writes the results as
+JSON; a benchmark that raises is recorded with its error. `compare` reads two
+result files and flags the benchmarks that got slower than the threshold allows
+or that now fail, exiting with status 1 when there is any. Benchmarks failing in
+both runs are reported as still failing, which doesn't fail the comparison.
+
+    python -m benchmarks.suite run --output after.json
+    python -m benchmarks.suite run --layer domain --samples 50 --output after.json
+    python -m benchmarks.suite run --layer repository --dataset 100000
+    python -m benchmarks.suite compare before.json after.json --threshold 0.1
+
+The repository and HTTP layers need the PostgreSQL database configured through
+the DB_* variables; they run in a throwaway schema which `--dataset` fills with
+that many synthetic submissions, see `benchmarks.dataset`, so that they are
+timed against tables of a realistic size.
+"""
+
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Callable, ContextManager
+
+LAYERS = ["domain", "repository", "http"]
+
+
+@dataclass
+class Case:
+    """One benchmark: `fn` is timed `number` calls at a time, once per sample."""
+
+    name: str
+    fn: Callable[[], object]
+    number: int = 1
+
+
+def layer_cases(
+    layer: str, samples: int, dataset: int = 0
+) -> ContextManager[list[Case]]:
+    """The cases of `layer`, set up for `samples` samples plus a warmup one, on
+    top of `dataset` synthetic submissions."""
+    # Imported lazily, so running the domain layer doesn't need a database.
+    if layer == "domain":
+        from .suite_domain import cases
+    elif layer == "repository":
+        from .suite_repository import cases
+    else:
+        from .suite_http import cases
+    return cases(samples + 1, dataset)
+
+
+def measure(case: Case, samples: int) -> dict[str, Any]:
+    """Times `case`, returning per-call statistics in microseconds. The first
+    sample warms up caches and connections and is left out."""
+    timings: list[float] = []
+    for sample in range(samples + 1):
+        start = time.perf_counter_ns()
+        for _ in range(case.number):
+            case.fn()
+        elapsed = time.perf_counter_ns() - start
+        if sample > 0:
+            timings.append(elapsed / case.number / 1000)
+    return {
+        "number": case.number,
+        "samples_us": timings,
+        "median_us": statistics.median(timings),
+        "mean_us": statistics.mean(timings),
+        "stdev_us": statistics.stdev(timings) if len(timings) > 1 else 0.0,
+        "min_us": min(timings),
+    }
+
+
+def metadata() -> dict[str, Any]:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+    }
+
+
+def run(args: argparse.Namespace) -> int:
+    results: dict[str, dict[str, Any]] = {}
+    for layer in args.layer:
+        with layer_cases(layer, args.samples, args.dataset) as cases:
+            for case in cases:
+                name = f"{layer}.{case.name}"
+                if args.filter and args.filter not in name:
+                    continue
+                try:
+                    results[name] = {"layer": layer, **measure(case, args.samples)}
+                except Exception as ex:
+                    results[name] = {"layer": layer, "error": repr(ex)}
+                    print(f"{name:<48} failed: {ex!r}", file=sys.stderr)
+                    continue
+                print(
+                    f"{name:<48} {results[name]['median_us']:>12.2f} us",
+                    file=sys.stderr,
+                )
+    report = {
+        "metadata": {**metadata(), "dataset": args.dataset},
+        "results": results,
+    }
+    if args.output == "-":
+        json.dump(report, sys.stdout, indent=2)
+    else:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+
+def compare_results(
+    base: dict[str, dict[str, Any]],
+    new: dict[str, dict[str, Any]],
+    threshold: float,
+    statistic: str = "median",
+) -> list[tuple[str, str, float | None]]:
+    """Returns (name, status, new/base ratio of `statistic`) for every benchmark.
+
+    A benchmark regressed when its `statistic` grew by more than `threshold` and
+    by more than the two runs' standard deviations together, so that noisy
+    benchmarks need a larger change to be flagged. Improvements are judged the
+    same way.
+    """
+    rows: list[tuple[str, str, float | None]] = []
+    for name in sorted(base.keys() | new.keys()):
+        if name not in new:
+            rows.append((name, "missing", None))
+            continue
+        if name not in base:
+            rows.append((name, "new", None))
+            continue
+        if "error" in new[name]:
+            # Only newly failing benchmarks fail the comparison.
+            status = "still-failing" if "error" in base[name] else "error"
+            rows.append((name, status, None))
+            continue
+        if "error" in base[name]:
+            rows.append((name, "new", None))
+            continue
+        before, after = base[name][f"{statistic}_us"], new[name][f"{statistic}_us"]
+        noise = base[name]["stdev_us"] + new[name]["stdev_us"]
+        ratio = after / before
+        if ratio > 1 + threshold and after - before > noise:
+            status = "regression"
+        elif ratio < 1 - threshold and before - after > noise:
+            status = "improvement"
+        else:
+            status = "ok"
+        rows.append((name, status, ratio))
+    return rows
+
+
+def compare(args: argparse.Namespace) -> int:
+    with open(args.base) as f:
+        base = json.load(f)["results"]
+    with open(args.new) as f:
+        new = json.load(f)["results"]
+    rows = compare_results(base, new, args.threshold, args.statistic)
+    key = f"{args.statistic}_us"
+    print(f"{'benchmark':<48} {'base us':>12} {'new us':>12} {'ratio':>8}  status")
+    for name, status, ratio in rows:
+        before = f"{base[name][key]:.2f}" if key in base.get(name, {}) else "-"
+        after = f"{new[name][key]:.2f}" if key in new.get(name, {}) else "-"
+        shown = f"{ratio:.2f}" if ratio is not None else "-"
+        print(f"{name:<48} {before:>12} {after:>12} {shown:>8}  {status}")
+    failed = any(status in ("regression", "error") for _, status, _ in rows)
+    return 1 if failed else 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+    run_parser = commands.add_parser("run", help="run the benchmarks")
+    run_parser.add_argument("--layer", nargs="+", choices=LAYERS, default=LAYERS)
+    run_parser.add_argument("--samples", type=int, default=20)
+    run_parser.add_argument(
+        "--filter", help="only run the benchmarks whose name contains this"
+    )
+    run_parser.add_argument(
+        "--dataset",
+        type=int,
+        default=0,
+        help="synthetic submissions loaded before the database layers run",
+    )
+    run_parser.add_argument("--output", default="-", help="JSON file, - for stdout")
+    compare_parser = commands.add_parser("compare", help="compare two runs")
+    compare_parser.add_argument("base")
+    compare_parser.add_argument("new")
+    compare_parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.1,
+        help="relative slowdown flagged as a regression",
+    )
+    compare_parser.add_argument(
+        "--statistic",
+        choices=["median", "mean", "min"],
+        default="median",
+        help="min is the least sensitive to a busy machine",
+    )
+    args = parser.parse_args()
+    sys.exit(run(args) if args.command == "run" else compare(args))
+
+
+if __name__ == "__main__":
+    main()
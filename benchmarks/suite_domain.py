@@ -0,0 +1,54 @@
+"""Domain layer benchmarks of `benchmarks.suite`: scoring and validating answers."""
+
+from contextlib import contextmanager
+from typing import Iterator
+
+from quizzing.quiz.domain.entities.author import AuthorID
+from quizzing.quiz.domain.entities.quiz import (
+    AnswerOption,
+    Question,
+    Quiz,
+    QuizID,
+    QuizStatus,
+)
+from quizzing.quiz.domain.entities.submission import Answer
+
+from .suite import Case
+
+OPTIONS = [AnswerOption(o) for o in "ABCDE"]
+
+
+def published_quiz(questions: list[Question]) -> Quiz:
+    quiz = Quiz(QuizID("quiz"), "Quiz", AuthorID("author"), QuizStatus.DRAFT)
+    quiz.set_questions(questions)
+    quiz.publish()
+    return quiz
+
+
+@contextmanager
+def cases(samples: int, dataset: int = 0) -> Iterator[list[Case]]:
+    single = Question("Single", OPTIONS, {OPTIONS[0]})
+    multiple = Question("Multiple", OPTIONS, {OPTIONS[0], OPTIONS[2]})
+    # Quizzes have at most 10 questions.
+    quiz = published_quiz([single, multiple] * 5)
+    answers = [
+        Answer(single.encode({OPTIONS[0]})),
+        Answer(multiple.encode({OPTIONS[0], OPTIONS[1]})),
+    ] * 5
+    single_answer = Answer(single.encode({OPTIONS[1]}))
+    multiple_answer = Answer(multiple.encode({OPTIONS[0], OPTIONS[1], OPTIONS[2]}))
+    yield [
+        Case("quiz.score", lambda: quiz.score(answers), 1_000),
+        Case("quiz.validate_answers", lambda: quiz.validate_answers(answers), 1_000),
+        Case("question.score_single", lambda: single._score(single_answer), 10_000),
+        Case(
+            "question.score_multiple",
+            lambda: multiple._score(multiple_answer),
+            10_000,
+        ),
+        Case(
+            "question.validate_answer",
+            lambda: multiple._validate_answer(multiple_answer),
+            10_000,
+        ),
+    ]
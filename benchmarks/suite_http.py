@@ -0,0 +1,135 @@
+"""HTTP layer benchmarks of `benchmarks.suite`: the main flows of the API,
+through the FastAPI test client and the configured services."""
+
+from contextlib import contextmanager
+from datetime import timedelta
+from typing import Callable, Iterator
+
+import email_validator
+from fastapi.testclient import TestClient
+
+from quizzing.quiz.domain.entities.author import Author, AuthorID, hash_password
+from quizzing.quiz.domain.entities.quiz import (
+    AnswerOption,
+    Question,
+    Quiz,
+    QuizID,
+    QuizStatus,
+)
+from quizzing.quiz.domain.entities.submission import Submission
+from quizzing.quiz.domain.registry import DomainRegistry
+from quizzing.quiz.infrastructure.rest.api import app
+from quizzing.quiz.infrastructure.rest.auth import create_access_token
+from quizzing.quiz.infrastructure.rest.registry import RestRegistry
+
+from .database import scratch_engine
+from .dataset import DatasetSpec, load_dataset
+from .suite import Case
+
+EMAIL = "author@example.com"
+PASSWORD = "password"
+OPTIONS = [AnswerOption(o) for o in "ABCDE"]
+QUESTIONS = 10
+# Flows that use up a quiz or a submission run this many times per sample.
+NUMBER = 5
+
+
+def publish_quizzes(author_id: AuthorID, n: int, prefix: str) -> list[Quiz]:
+    quizzes = []
+    for i in range(n):
+        quiz = Quiz(QuizID(f"{prefix}{i:04}"), "Quiz", author_id, QuizStatus.PUBLISHED)
+        quiz.questions = [
+            Question(f"Question {q}", OPTIONS, {OPTIONS[0]}) for q in range(QUESTIONS)
+        ]
+        DomainRegistry.quizzes.save(quiz)
+        quizzes.append(quiz)
+    return quizzes
+
+
+def succeeds(request: Callable[[], object]) -> Callable[[], None]:
+    def call() -> None:
+        response = request()
+        response.raise_for_status()  # type: ignore[attr-defined]
+
+    return call
+
+
+@contextmanager
+def offline_email_validation() -> Iterator[None]:
+    """Skips the DNS lookup of the email's domain when logging in, which would
+    dominate the timings, and fail without network access."""
+    check_deliverability = email_validator.CHECK_DELIVERABILITY
+    email_validator.CHECK_DELIVERABILITY = False
+    try:
+        yield
+    finally:
+        email_validator.CHECK_DELIVERABILITY = check_deliverability
+
+
+@contextmanager
+def cases(samples: int, dataset: int = 0) -> Iterator[list[Case]]:
+    with scratch_engine() as engine:
+        if dataset > 0:
+            load_dataset(engine, DatasetSpec.scaled(dataset))
+        RestRegistry.initialize(engine)
+        author = Author.with_hashed_password(EMAIL, hash_password(PASSWORD))
+        DomainRegistry.authors.save(author)
+        calls = samples * NUMBER
+        to_start = iter(publish_quizzes(author.id, calls, "start"))
+        to_complete = iter(
+            [
+                RestRegistry.submissions.start(author, quiz.id)
+                for quiz in publish_quizzes(author.id, calls, "complete")
+            ]
+        )
+        answered: Submission = RestRegistry.submissions.start(
+            author, publish_quizzes(author.id, 1, "answer")[0].id
+        )
+        answers = {"answers": [["A"]] * QUESTIONS}
+
+        with TestClient(app) as client, offline_email_validation():
+            token = create_access_token({"sub": EMAIL}, timedelta(hours=1))
+            client.headers["Authorization"] = f"Bearer {token}"
+            yield [
+                Case(
+                    "login",
+                    succeeds(
+                        lambda: client.post(
+                            "/api/login",
+                            data={"username": EMAIL, "password": PASSWORD},
+                        )
+                    ),
+                ),
+                Case(
+                    "list_quizzes",
+                    succeeds(lambda: client.get("/quizzes?status=published")),
+                    NUMBER,
+                ),
+                Case(
+                    "start_submission",
+                    succeeds(
+                        lambda: client.post(
+                            "/submissions", json={"quiz_id": next(to_start).id}
+                        )
+                    ),
+                    NUMBER,
+                ),
+                Case(
+                    "answer_submission",
+                    succeeds(
+                        lambda: client.put(
+                            f"/submissions/{answered.id}/answers", json=answers
+                        )
+                    ),
+                    NUMBER,
+                ),
+                Case(
+                    "complete_submission",
+                    succeeds(
+                        lambda: client.put(
+                            f"/submissions/{next(to_complete).id}/complete"
+                        )
+                    ),
+                    NUMBER,
+                ),
+            ]
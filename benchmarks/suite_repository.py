@@ -0,0 +1,122 @@
+"""Repository layer benchmarks of `benchmarks.suite`: every method of the
+SQLAlchemy repositories, each call in its own transaction."""
+
+from contextlib import contextmanager
+from itertools import count
+from typing import Iterator
+
+from quizzing.pkg.db.sqlalchemy import SQLATransactionManager
+from quizzing.quiz.domain.dto import QuizFilter
+from quizzing.quiz.domain.entities.author import Author, AuthorID
+from quizzing.quiz.domain.entities.quiz import (
+    AnswerOption,
+    Question,
+    Quiz,
+    QuizID,
+    QuizStatus,
+)
+from quizzing.quiz.domain.entities.submission import Answer, Submission, SubmissionID
+from quizzing.quiz.infrastructure.repository.sqlalchemy.repository import (
+    SQLAAuthorRepository,
+    SQLAQuizRepository,
+    SQLASubmissionRepository,
+)
+
+from .database import scratch_engine
+from .dataset import DatasetSpec, load_dataset
+from .suite import Case
+
+OPTIONS = [AnswerOption(o) for o in "ABCDE"]
+QUESTIONS = 10
+# Quizzes of the author whose quizzes and submissions get listed.
+QUIZZES = 50
+
+
+def make_quiz(n: int, author_id: AuthorID) -> Quiz:
+    quiz = Quiz(QuizID(f"quiz{n:04}"), f"Quiz {n}", author_id, QuizStatus.PUBLISHED)
+    quiz.questions = [
+        Question(f"Question {i}", OPTIONS, {OPTIONS[0]}) for i in range(QUESTIONS)
+    ]
+    return quiz
+
+
+def make_submission(quiz: Quiz, author_id: AuthorID) -> Submission:
+    return Submission(
+        SubmissionID(f"{quiz.id}-{author_id}"),
+        quiz.id,
+        author_id,
+        Submission.Status.IN_PROGRESS,
+        [Answer(0b1) for _ in range(QUESTIONS)],
+        None,
+    )
+
+
+@contextmanager
+def cases(samples: int, dataset: int = 0) -> Iterator[list[Case]]:
+    with scratch_engine() as engine:
+        if dataset > 0:
+            load_dataset(engine, DatasetSpec.scaled(dataset))
+        manager = SQLATransactionManager(engine)
+        authors = SQLAAuthorRepository(manager)
+        quizzes = SQLAQuizRepository(manager)
+        submissions = SQLASubmissionRepository(manager)
+        author = Author(AuthorID("author"), "author@example.com", "hashed")
+        with manager.transaction():
+            authors.save(author)
+            quizzes_of_author = [make_quiz(n, author.id) for n in range(QUIZZES)]
+            for quiz in quizzes_of_author:
+                quizzes.save(quiz)
+            for n in range(QUIZZES):
+                answerer = Author(
+                    AuthorID(f"answerer{n}"), f"answerer{n}@example.com", "hashed"
+                )
+                authors.save(answerer)
+                submissions.save(make_submission(quizzes_of_author[0], answerer.id))
+                submissions.save(make_submission(quizzes_of_author[n], author.id))
+        quiz = quizzes_of_author[0]
+        submission = submissions.get(f"{quiz.id}-{author.id}")
+        edits = count()
+
+        def save_quiz() -> None:
+            quiz.title = f"Quiz {next(edits)}"
+            quizzes.save(quiz)
+
+        def save_submission() -> None:
+            n = next(edits)
+            submission.answers = list(submission.answers)
+            submission.answers[n % QUESTIONS] = Answer(1 << n % len(OPTIONS))
+            submissions.save(submission)
+
+        yield [
+            Case("quiz.get", lambda: quizzes.get(quiz.id), 10),
+            Case("quiz.get_for_update", lambda: quizzes.get_for_update(quiz.id), 10),
+            Case("quiz.save", save_quiz, 10),
+            Case(
+                "quiz.list",
+                lambda: quizzes.list(QuizFilter(author_id=author.id, page_size=20)),
+                10,
+            ),
+            Case(
+                "quiz.list_published",
+                lambda: quizzes.list(
+                    QuizFilter(QuizStatus.PUBLISHED, page_size=20, after="quiz0010")
+                ),
+                10,
+            ),
+            Case("submission.get", lambda: submissions.get(submission.id), 10),
+            Case(
+                "submission.get_for_update",
+                lambda: submissions.get_for_update(submission.id),
+                10,
+            ),
+            Case("submission.save", save_submission, 10),
+            Case("submission.by_author", lambda: submissions.by_author(author.id), 10),
+            Case(
+                "submission.by_quiz",
+                lambda: submissions.by_quiz(quiz.id, 1, 20),
+                10,
+            ),
+            Case("author.get", lambda: authors.get(author.id), 10),
+            Case("author.by_email", lambda: authors.by_email(author.email), 10),
+            Case("author.save", lambda: authors.save(author), 10),
+        ]
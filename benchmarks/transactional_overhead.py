@@ -0,0 +1,105 @@
+"""Per-call overhead of `@transactional` service methods.
+
+Calls `QuizService.get` and `SubmissionService.list` over in-memory repositories
+with a transaction manager that does nothing, so what is left is the cost of
+the transactional wrapping itself. Each method is timed three ways: its
+undecorated body, a top-level call, and a call made while a transaction is
+already active, as happens for service methods calling each other.
+
+    python -m benchmarks.transactional_overhead --calls 200000
+"""
+
+import argparse
+import inspect
+import timeit
+from typing import Callable
+
+from quizzing.pkg.transactional import IsolationLevel, Transaction
+from quizzing.quiz.application.quiz import QuizService
+from quizzing.quiz.application.submission import SubmissionService
+from quizzing.quiz.domain.entities.author import Author, AuthorID
+from quizzing.quiz.domain.entities.quiz import Quiz
+from quizzing.quiz.domain.registry import DomainRegistry
+from quizzing.quiz.infrastructure.repository.inmemory.repository import (
+    InMemoryAuthorRepository,
+    InMemoryQuizRepository,
+    InMemorySubmissionRepository,
+)
+
+
+class NullTransaction(Transaction):
+    def __init__(self, manager: "NullTransactionManager") -> None:
+        self._manager = manager
+
+    def begin(self):
+        self._manager.depth += 1
+
+    def commit(self):
+        self._manager.depth -= 1
+
+    def rollback(self):
+        self._manager.depth -= 1
+
+
+class NullTransactionManager:
+    def __init__(self) -> None:
+        self.depth = 0
+
+    def transaction(
+        self, isolation_level: IsolationLevel = IsolationLevel.READ_COMMITTED
+    ) -> Transaction:
+        return NullTransaction(self)
+
+    def is_retriable_exception(self, ex: Exception) -> bool:
+        return False
+
+    def in_transaction(self) -> bool:
+        return self.depth > 0
+
+
+def per_call_ns(fn: Callable[[], object], calls: int) -> float:
+    return min(timeit.repeat(fn, number=calls, repeat=5)) / calls * 1e9
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=200_000)
+    args = parser.parse_args()
+
+    DomainRegistry.initialize(
+        InMemoryQuizRepository(),
+        InMemorySubmissionRepository(),
+        InMemoryAuthorRepository(),
+    )
+    manager = NullTransactionManager()
+    quizzes = QuizService(manager)
+    submissions = SubmissionService(manager)
+    author = Author(AuthorID("author"), "author@example.com", "hashed")
+    quiz = Quiz.new("Quiz", author.id)
+    DomainRegistry.quizzes.save(quiz)
+
+    cases = {
+        "QuizService.get": (
+            quizzes,
+            lambda: quizzes.get(author, quiz.id),
+            inspect.unwrap(QuizService.get),
+            (author, quiz.id),
+        ),
+        "SubmissionService.list": (
+            submissions,
+            lambda: submissions.list(author),
+            inspect.unwrap(SubmissionService.list),
+            (author,),
+        ),
+    }
+    print(f"{'method':<24} {'body ns':>10} {'call ns':>10} {'nested ns':>10}")
+    for name, (service, call, body, body_args) in cases.items():
+        direct = per_call_ns(lambda: body(service, *body_args), args.calls)
+        outer = per_call_ns(call, args.calls)
+        with manager.transaction():
+            nested = per_call_ns(call, args.calls)
+        print(f"{name:<24} {direct:>10.0f} {outer:>10.0f} {nested:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""Transaction throughput as a function of the worker thread pool size.
+
+Every worker opens a transaction through `SQLATransactionManager`, runs a nested
+`with tx:` block (as the repositories do) and issues a query that keeps the
+connection busy for `--query-ms` milliseconds. With per-context transactions the
+throughput should grow roughly linearly with the number of threads until the
+connection pool is exhausted.
+
+    python -m benchmarks.transactions --threads 1 2 4 8 16
+"""
+
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from sqlalchemy import create_engine, text
+
+from quizzing.pkg.db.sqlalchemy import SQLATransactionManager
+from quizzing.quiz.infrastructure.repository.sqlalchemy.config import (
+    QUIZZING_QUIZ_DB_URL,
+)
+
+
+def run(manager: SQLATransactionManager, query_seconds: float) -> None:
+    with manager.transaction() as tx:
+        with manager.transaction() as nested:
+            assert nested is tx
+            tx.session.execute(text("SELECT pg_sleep(:s)"), {"s": query_seconds})
+
+
+def measure(threads: int, transactions: int, query_seconds: float) -> float:
+    engine = create_engine(QUIZZING_QUIZ_DB_URL, pool_size=threads, max_overflow=0)
+    manager = SQLATransactionManager(engine)
+    try:
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            # Warm up the pool so connection setup is not part of the measurement.
+            list(executor.map(lambda _: run(manager, 0), range(threads)))
+            start = time.perf_counter()
+            futures = [
+                executor.submit(run, manager, query_seconds)
+                for _ in range(transactions)
+            ]
+            for future in futures:
+                future.result()
+            return transactions / (time.perf_counter() - start)
+    finally:
+        engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 2, 4, 8, 16])
+    parser.add_argument("--transactions", type=int, default=400)
+    parser.add_argument("--query-ms", type=float, default=5.0)
+    args = parser.parse_args()
+
+    baseline: float | None = None
+    print(f"{'threads':>8} {'tx/s':>10} {'speedup':>8}")
+    for threads in args.threads:
+        throughput = measure(threads, args.transactions, args.query_ms / 1000)
+        baseline = baseline or throughput
+        print(f"{threads:>8} {throughput:>10.1f} {throughput / baseline:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Iterator
+
+from sqlalchemy import Engine, event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+
+@dataclass(frozen=True)
+class Statement:
+    sql: str
+    seconds: float
+    rows: int
+
+
+@dataclass
+class QueryStats:
+    """The statements an instrumented engine executed while recording.
+
+    `rows` counts the rows returned by queries and the rows changed by other
+    statements, as far as the driver reports them.
+    """
+
+    statements: list[Statement] = field(default_factory=list)
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    @property
+    def seconds(self) -> float:
+        return sum(s.seconds for s in self.statements)
+
+    @property
+    def rows(self) -> int:
+        return sum(s.rows for s in self.statements)
+
+    @property
+    def slowest(self) -> Statement | None:
+        return max(self.statements, key=lambda s: s.seconds, default=None)
+
+    def summary(self) -> str:
+        slowest = self.slowest
+        slowest_ms = slowest.seconds * 1000 if slowest is not None else 0.0
+        return (
+            f"count={self.count}, time_ms={self.seconds * 1000:.2f}, "
+            f"slowest_ms={slowest_ms:.2f}, rows={self.rows}"
+        )
+
+
+# Every recording active in the current context, the outermost first.
+_recordings: ContextVar[tuple[QueryStats, ...]] = ContextVar(
+    "query_recordings", default=()
+)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, *args):
+    if _recordings.get():
+        context._query_start = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, *args):
+    recordings = _recordings.get()
+    start = getattr(context, "_query_start", None)
+    if not recordings or start is None:
+        return
+    executed = Statement(
+        statement, time.perf_counter() - start, max(cursor.rowcount, 0)
+    )
+    for stats in recordings:
+        stats.statements.append(executed)
+
+
+def instrument(engine: Engine | AsyncEngine) -> None:
+    """Makes `engine` report its statements to `record_queries`. Instrumenting
+    an engine again does nothing."""
+    if isinstance(engine, AsyncEngine):
+        engine = engine.sync_engine
+    if event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        return
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+@contextmanager
+def record_queries() -> Iterator[QueryStats]:
+    """Records the statements instrumented engines execute in this context,
+    including the threads and tasks it is copied to. Recordings nest, the
+    outer ones see the statements of the inner ones too."""
+    stats = QueryStats()
+    token = _recordings.set(_recordings.get() + (stats,))
+    try:
+        yield stats
+    finally:
+        _recordings.reset(token)
+
+
+@contextmanager
+def assert_max_queries(limit: int) -> Iterator[QueryStats]:
+    """Fails with the executed statements when the block executes more than
+    `limit` of them, which is how N+1 query patterns show up in tests."""
+    with record_queries() as stats:
+        yield stats
+    if stats.count > limit:
+        executed = "\n".join(f"  {s.sql}" for s in stats.statements)
+        raise AssertionError(
+            f"{stats.count} statements executed, at most {limit} expected:\n"
+            f"{executed}"
+        )
@@ -0,0 +1,154 @@
+import time
+from dataclasses import dataclass
+from threading import Lock
+from typing import Any, Callable
+
+from sqlalchemy import Engine, event
+from sqlalchemy.exc import TimeoutError
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, PoolProxiedConnection, QueuePool
+
+
+@dataclass(frozen=True)
+class PoolCheckout:
+    """A request for a connection: how long it waited and how it ended.
+
+    The wait includes opening a new connection when the pool had none idle.
+    """
+
+    wait_seconds: float
+    timed_out: bool
+    in_use: int
+    capacity: int | None
+
+
+class PoolMetrics:
+    """Connection pool statistics, updated by `instrument_pool`.
+
+    `capacity` is `pool_size + max_overflow`, or None when the overflow is
+    unbounded. Listeners are called with a `PoolCheckout` on every checkout of
+    a timed pool, on the thread that asked for the connection.
+    """
+
+    def __init__(self, capacity: int | None) -> None:
+        self.capacity = capacity
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+        self.in_use = 0
+        self.peak_in_use = 0
+        self.connections = 0
+        self._listeners: list[Callable[[PoolCheckout], None]] = []
+        self._lock = Lock()
+
+    @property
+    def saturation(self) -> float:
+        """Fraction of the pool capacity checked out right now."""
+        if not self.capacity:
+            return 0.0
+        return self.in_use / self.capacity
+
+    def add_listener(self, listener: Callable[[PoolCheckout], None]) -> None:
+        self._listeners.append(listener)
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "capacity": self.capacity,
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "wait_seconds": self.wait_seconds,
+                "max_wait_seconds": self.max_wait_seconds,
+                "in_use": self.in_use,
+                "peak_in_use": self.peak_in_use,
+                "connections": self.connections,
+                "saturation": self.saturation,
+            }
+
+    def _record_checkout(self, *args) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self.in_use += 1
+            self.peak_in_use = max(self.peak_in_use, self.in_use)
+
+    def _record_checkin(self, *args) -> None:
+        with self._lock:
+            self.in_use -= 1
+
+    def _record_connect(self, *args) -> None:
+        with self._lock:
+            self.connections += 1
+
+    def _record_close(self, *args) -> None:
+        with self._lock:
+            self.connections -= 1
+
+    def _record_wait(self, wait_seconds: float, timed_out: bool) -> None:
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            self.wait_seconds += wait_seconds
+            self.max_wait_seconds = max(self.max_wait_seconds, wait_seconds)
+            checkout = PoolCheckout(wait_seconds, timed_out, self.in_use, self.capacity)
+        for listener in self._listeners:
+            listener(checkout)
+
+
+class _TimedPoolMixin:
+    """Times `Pool.connect`, where a checkout waits for a connection, which no
+    pool event covers. Recorded in the `metrics` `instrument_pool` sets."""
+
+    metrics: PoolMetrics | None = None
+
+    def connect(self) -> PoolProxiedConnection:
+        metrics = self.metrics
+        if metrics is None:
+            return super().connect()  # type: ignore[misc]
+        start = time.perf_counter()
+        try:
+            connection = super().connect()  # type: ignore[misc]
+        except TimeoutError:
+            metrics._record_wait(time.perf_counter() - start, True)
+            raise
+        metrics._record_wait(time.perf_counter() - start, False)
+        return connection
+
+
+class InstrumentedQueuePool(_TimedPoolMixin, QueuePool):
+    pass
+
+
+class InstrumentedAsyncAdaptedQueuePool(_TimedPoolMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def instrument_pool(engine: Engine | AsyncEngine, capacity: int | None) -> PoolMetrics:
+    """Collects the `PoolMetrics` of the engine's pool through the public pool
+    events, which keep being delivered after `engine.dispose()` replaces the
+    pool. Checkout waits and timeouts are only recorded by the instrumented
+    pool classes. Instrumenting an engine again returns its metrics."""
+    if isinstance(engine, AsyncEngine):
+        engine = engine.sync_engine
+    metrics = pool_metrics(engine)
+    if metrics is not None:
+        return metrics
+    metrics = PoolMetrics(capacity)
+    event.listen(engine, "checkout", metrics._record_checkout)
+    event.listen(engine, "checkin", metrics._record_checkin)
+    event.listen(engine, "connect", metrics._record_connect)
+    event.listen(engine, "close", metrics._record_close)
+
+    def attach(engine: Engine) -> None:
+        engine.pool.metrics = metrics  # type: ignore[attr-defined]
+
+    event.listen(engine, "engine_disposed", attach)
+    attach(engine)
+    return metrics
+
+
+def pool_metrics(engine: Engine | AsyncEngine) -> PoolMetrics | None:
+    """Metrics of the engine's pool, None when the pool isn't instrumented."""
+    if isinstance(engine, AsyncEngine):
+        engine = engine.sync_engine
+    return getattr(engine.pool, "metrics", None)
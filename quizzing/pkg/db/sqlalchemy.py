@@ -1,17 +1,49 @@
-from psycopg2.errors import SerializationFailure
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Iterator, TypeVar
+
+from psycopg2.errors import DeadlockDetected, SerializationFailure
 from sqlalchemy import Engine
-from sqlalchemy.exc import OperationalError
+from sqlalchemy.exc import DBAPIError, OperationalError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
 from sqlalchemy.orm import Session
 
-from quizzing.pkg.transactional import IsolationLevel, Transaction
+from quizzing.pkg.identity_map import IdentityMap
+from quizzing.pkg.transactional import (
+    AsyncTransaction,
+    IsolationLevel,
+    Transaction,
+    TransientError,
+)
+from quizzing.pkg.unit_of_work import UnitOfWork
+
+R = TypeVar("R")
+
+SERIALIZATION_FAILURE = "40001"
+DEADLOCK_DETECTED = "40P01"
 
 
 class SQLATransaction(Transaction):
-    def __init__(self, session: Session, isolation_level: IsolationLevel) -> None:
+    """Session-backed transaction, shared by nested `with tx:` blocks.
+
+    Repositories don't write on save: they register the entity with the unit of
+    work, whose pending changes are flushed right before the outermost block
+    commits, or earlier by a repository that needs to query them.
+    """
+
+    def __init__(
+        self,
+        session: Session,
+        isolation_level: IsolationLevel,
+        identity_map: IdentityMap | None = None,
+        unit_of_work: UnitOfWork | None = None,
+    ) -> None:
         self._session: Session = session
         self._begin_count = 0
         self._is_started = False
         self._isolation_level = isolation_level
+        self._identity_map = identity_map if identity_map is not None else IdentityMap()
+        self._unit_of_work = unit_of_work if unit_of_work is not None else UnitOfWork()
 
     def begin(self) -> None:
         self._begin_count += 1
@@ -26,12 +58,20 @@ class SQLATransaction(Transaction):
         self._is_started = True
 
     def commit(self) -> None:
+        if self._begin_count == 1 and self._is_started:
+            try:
+                self.flush()
+            except BaseException:
+                self.rollback()
+                raise
         self._begin_count -= 1
         self._begin_count = max(0, self._begin_count)
         if self._begin_count == 0 and self._is_started:
             self._session.commit()
             self._session.close()
+            self._identity_map.clear()
             self._is_started = False
+            self._unit_of_work.committed()
 
     def rollback(self) -> None:
         self._begin_count -= 1
@@ -39,17 +79,49 @@ class SQLATransaction(Transaction):
         if self._begin_count == 0 and self._is_started:
             self._session.rollback()
             self._session.close()
+            self._identity_map.clear()
+            self._unit_of_work.clear()
             self._is_started = False
 
+    def flush(self) -> None:
+        """Writes the changes pending in the unit of work."""
+        self._unit_of_work.flush()
+
     @property
     def is_closed(self) -> bool:
-        return self._is_started and self._begin_count == 0
+        return not self._is_started
 
     @property
     def session(self) -> Session:
         return self._session
 
-    def _map_isolation_level(self, il: IsolationLevel) -> str:
+    @property
+    def identity_map(self) -> IdentityMap:
+        """Entities loaded or saved so far, emptied when the transaction ends."""
+        return self._identity_map
+
+    @property
+    def unit_of_work(self) -> UnitOfWork:
+        return self._unit_of_work
+
+    @classmethod
+    def bound_to(
+        cls,
+        session: Session,
+        identity_map: IdentityMap | None = None,
+        unit_of_work: UnitOfWork | None = None,
+    ) -> "SQLATransaction":
+        """Wraps a session whose transaction is begun, committed and rolled back
+        by someone else: nested `with tx:` blocks never end it, nor flush it."""
+        transaction = cls(
+            session, IsolationLevel.READ_COMMITTED, identity_map, unit_of_work
+        )
+        transaction._begin_count = 1
+        transaction._is_started = True
+        return transaction
+
+    @staticmethod
+    def _map_isolation_level(il: IsolationLevel) -> str:
         if il == IsolationLevel.READ_UNCOMMITTED:
             return "READ UNCOMMITTED"
         elif il == IsolationLevel.READ_COMMITTED:
@@ -63,20 +135,175 @@ class SQLATransaction(Transaction):
 
 
 class SQLATransactionManager:
+    """Hands out one transaction per execution context.
+
+    The active transaction lives in a context variable, so every thread (and every
+    asyncio task) gets its own session and connection, while nested `with tx:`
+    blocks running in the same context keep reusing the outermost transaction.
+    """
+
     def __init__(self, engine: Engine) -> None:
-        self._transaction: SQLATransaction | None = None
+        self._transaction: ContextVar[SQLATransaction | None] = ContextVar(
+            f"sqla_transaction_{id(self)}", default=None
+        )
         self._engine = engine
 
     def transaction(
         self, isolation_level: IsolationLevel = IsolationLevel.READ_COMMITTED
     ) -> SQLATransaction:
-        if self._transaction is None or self._transaction.is_closed:
-            self._transaction = SQLATransaction(Session(self._engine), isolation_level)
-        return self._transaction
+        transaction = self._transaction.get()
+        if transaction is None or transaction.is_closed:
+            transaction = SQLATransaction(Session(self._engine), isolation_level)
+            self._transaction.set(transaction)
+        return transaction
 
     def is_retriable_exception(self, ex: Exception) -> bool:
+        if isinstance(ex, TransientError):
+            return True
         if isinstance(ex, OperationalError):
-            if isinstance(ex.orig, SerializationFailure):
-                return True
-            return False
+            return isinstance(ex.orig, (SerializationFailure, DeadlockDetected))
         return False
+
+    def in_transaction(self) -> bool:
+        transaction = self._transaction.get()
+        return transaction is not None and not transaction.is_closed
+
+    def after_commit(self, callback: Callable[[], None]) -> None:
+        """Calls `callback` once the active transaction commits, or right away
+        outside of one. The callbacks of a transaction rolled back are dropped."""
+        transaction = self._transaction.get()
+        if transaction is None or transaction.is_closed:
+            callback()
+            return
+        transaction.unit_of_work.after_commit(callback)
+
+    @contextmanager
+    def bind(
+        self,
+        session: Session,
+        identity_map: IdentityMap | None = None,
+        unit_of_work: UnitOfWork | None = None,
+    ) -> Iterator[SQLATransaction]:
+        """Makes an externally managed session the active transaction of the
+        current context, so repositories pick it up."""
+        token = self._transaction.set(
+            SQLATransaction.bound_to(session, identity_map, unit_of_work)
+        )
+        try:
+            yield self._transaction.get()
+        finally:
+            self._transaction.reset(token)
+
+
+class AsyncSQLATransaction(AsyncTransaction):
+    def __init__(
+        self,
+        session: AsyncSession,
+        isolation_level: IsolationLevel,
+        manager: SQLATransactionManager,
+    ) -> None:
+        self._session = session
+        self._begin_count = 0
+        self._is_started = False
+        self._isolation_level = isolation_level
+        self._manager = manager
+        self._identity_map = IdentityMap()
+        self._unit_of_work = UnitOfWork()
+
+    async def begin(self) -> None:
+        self._begin_count += 1
+        if self._is_started:
+            return
+        await self._session.begin()
+        await self._session.connection(
+            execution_options={
+                "isolation_level": SQLATransaction._map_isolation_level(
+                    self._isolation_level
+                )
+            }
+        )
+        self._is_started = True
+
+    async def commit(self) -> None:
+        if self._begin_count == 1 and self._is_started:
+            try:
+                await self.run_sync(self._unit_of_work.flush)
+            except BaseException:
+                await self.rollback()
+                raise
+        self._begin_count -= 1
+        self._begin_count = max(0, self._begin_count)
+        if self._begin_count == 0 and self._is_started:
+            await self._session.commit()
+            await self._session.close()
+            self._identity_map.clear()
+            self._is_started = False
+            self._unit_of_work.committed()
+
+    async def rollback(self) -> None:
+        self._begin_count -= 1
+        self._begin_count = max(0, self._begin_count)
+        if self._begin_count == 0 and self._is_started:
+            await self._session.rollback()
+            await self._session.close()
+            self._identity_map.clear()
+            self._unit_of_work.clear()
+            self._is_started = False
+
+    async def run_sync(self, fn: Callable[..., R], *args, **kwargs) -> R:
+        """Runs `fn` with the sync session behind this transaction bound to the
+        repositories' manager. Its queries are awaited on the event loop."""
+
+        def bridge(session: Session) -> R:
+            with self._manager.bind(session, self._identity_map, self._unit_of_work):
+                return fn(*args, **kwargs)
+
+        return await self._session.run_sync(bridge)
+
+    @property
+    def is_closed(self) -> bool:
+        return not self._is_started
+
+
+class AsyncSQLATransactionManager:
+    """Async counterpart of `SQLATransactionManager`.
+
+    Repositories keep talking to `manager`, the sync transaction manager; while a
+    transactional method runs, `manager` hands them this transaction's session.
+    """
+
+    def __init__(self, engine: AsyncEngine, manager: SQLATransactionManager) -> None:
+        self._transaction: ContextVar[AsyncSQLATransaction | None] = ContextVar(
+            f"async_sqla_transaction_{id(self)}", default=None
+        )
+        self._engine = engine
+        self._manager = manager
+
+    def transaction(
+        self, isolation_level: IsolationLevel = IsolationLevel.READ_COMMITTED
+    ) -> AsyncSQLATransaction:
+        transaction = self._transaction.get()
+        if transaction is None or transaction.is_closed:
+            transaction = AsyncSQLATransaction(
+                AsyncSession(self._engine), isolation_level, self._manager
+            )
+            self._transaction.set(transaction)
+        return transaction
+
+    def is_retriable_exception(self, ex: Exception) -> bool:
+        if isinstance(ex, TransientError):
+            return True
+        if isinstance(ex, DBAPIError):
+            return getattr(ex.orig, "sqlstate", None) in (
+                SERIALIZATION_FAILURE,
+                DEADLOCK_DETECTED,
+            )
+        return False
+
+    def in_transaction(self) -> bool:
+        return self._manager.in_transaction()
+
+    def after_commit(self, callback: Callable[[], None]) -> None:
+        # Transactional methods run with this manager's transaction bound to
+        # `manager`, sharing its unit of work.
+        self._manager.after_commit(callback)
@@ -0,0 +1,61 @@
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
+
+import pytest
+from sqlalchemy import create_engine, text
+
+from quizzing.pkg.db.instrumentation import (
+    assert_max_queries,
+    instrument,
+    record_queries,
+)
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine("sqlite://")
+    instrument(engine)
+    # Instrumenting twice must not count statements twice.
+    instrument(engine)
+    with engine.begin() as connection:
+        connection.execute(text("CREATE TABLE item (id INTEGER)"))
+    yield engine
+    engine.dispose()
+
+
+def test_records_the_statements_of_the_context(engine):
+    with engine.begin() as connection:
+        with record_queries() as outer:
+            connection.execute(text("INSERT INTO item VALUES (1), (2)"))
+            with record_queries() as inner:
+                connection.execute(text("SELECT * FROM item")).all()
+        connection.execute(text("SELECT * FROM item")).all()
+
+    assert inner.count == 1
+    assert outer.count == 2
+    assert outer.rows == 2
+    assert outer.slowest in outer.statements
+    assert outer.seconds >= outer.slowest.seconds
+    assert outer.summary().startswith("count=2, ")
+
+
+def test_recording_follows_the_context_to_other_threads(engine):
+    def query() -> None:
+        with engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+
+    with record_queries() as stats, ThreadPoolExecutor(1) as executor:
+        executor.submit(copy_context().run, query).result()
+        executor.submit(query).result()
+
+    assert stats.count == 1
+
+
+def test_assert_max_queries_lists_the_statements(engine):
+    with assert_max_queries(1), engine.connect() as connection:
+        connection.execute(text("SELECT 1"))
+
+    with pytest.raises(AssertionError, match="2 statements executed(.|\n)*SELECT 2"):
+        with assert_max_queries(1), engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+            connection.execute(text("SELECT 2"))
@@ -0,0 +1,86 @@
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.exc import TimeoutError
+
+from quizzing.pkg.db.pool import (
+    InstrumentedQueuePool,
+    PoolCheckout,
+    instrument_pool,
+    pool_metrics,
+)
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'test.db'}",
+        poolclass=InstrumentedQueuePool,
+        pool_size=1,
+        max_overflow=1,
+        pool_timeout=0.05,
+    )
+    instrument_pool(engine, 2)
+    yield engine
+    engine.dispose()
+
+
+def test_checkouts_and_saturation(engine):
+    metrics = pool_metrics(engine)
+    checkouts: list[PoolCheckout] = []
+    metrics.add_listener(checkouts.append)
+
+    with engine.connect():
+        assert metrics.saturation == 0.5
+        with engine.connect():
+            assert metrics.saturation == 1.0
+    assert metrics.in_use == 0
+    assert metrics.peak_in_use == 2
+    assert metrics.checkouts == 2
+    assert [c.in_use for c in checkouts] == [1, 2]
+    assert all(not c.timed_out and c.capacity == 2 for c in checkouts)
+
+
+def test_timeouts_are_counted(engine):
+    metrics = pool_metrics(engine)
+
+    with engine.connect(), engine.connect():
+        with pytest.raises(TimeoutError):
+            engine.connect()
+    assert metrics.timeouts == 1
+    assert metrics.max_wait_seconds >= 0.05
+    assert metrics.in_use == 0
+
+
+def test_metrics_survive_dispose(engine):
+    metrics = pool_metrics(engine)
+    checkouts: list[PoolCheckout] = []
+    metrics.add_listener(checkouts.append)
+
+    with engine.connect():
+        pass
+    engine.dispose()
+    with engine.connect():
+        pass
+    assert pool_metrics(engine) is metrics
+    assert metrics.checkouts == 2
+    assert len(checkouts) == 2
+
+
+def test_connections_are_counted_until_closed(engine):
+    metrics = pool_metrics(engine)
+
+    with engine.connect(), engine.connect():
+        assert metrics.connections == 2
+    # pool_size is 1, the overflow connection is closed on checkin.
+    assert metrics.connections == 1
+    engine.dispose()
+    assert metrics.connections == 0
+
+
+def test_instrumenting_again_keeps_the_metrics(engine):
+    metrics = pool_metrics(engine)
+
+    assert instrument_pool(engine, 2) is metrics
+    with engine.connect():
+        pass
+    assert metrics.checkouts == 1
@@ -0,0 +1,51 @@
+import threading
+
+import pytest
+from sqlalchemy import create_engine, text
+
+from quizzing.pkg.db.sqlalchemy import SQLATransactionManager
+from quizzing.pkg.transactional import IsolationLevel
+
+
+@pytest.fixture
+def manager(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}")
+    return SQLATransactionManager(engine)
+
+
+def test_nested_transactions_are_reused(manager):
+    with manager.transaction(IsolationLevel.SERIALIZABLE) as outer:
+        with manager.transaction(IsolationLevel.SERIALIZABLE) as inner:
+            assert inner is outer
+            inner.session.execute(text("SELECT 1"))
+        assert not outer.is_closed
+    assert outer.is_closed
+
+
+def test_new_transaction_after_commit(manager):
+    with manager.transaction(IsolationLevel.SERIALIZABLE) as first:
+        pass
+    with manager.transaction(IsolationLevel.SERIALIZABLE) as second:
+        assert second is not first
+        assert second.session is not first.session
+
+
+def test_transactions_are_scoped_by_thread(manager):
+    barrier = threading.Barrier(2)
+    transactions = []
+
+    def worker():
+        with manager.transaction(IsolationLevel.SERIALIZABLE) as tx:
+            barrier.wait(timeout=5)
+            transactions.append(tx)
+            barrier.wait(timeout=5)
+
+    threads = [threading.Thread(target=worker) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(transactions) == 2
+    assert transactions[0] is not transactions[1]
+    assert transactions[0].session is not transactions[1].session
@@ -0,0 +1,53 @@
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from threading import BoundedSemaphore, Lock
+from typing import Callable, TypeVar
+
+R = TypeVar("R")
+
+
+class ExecutorSaturated(Exception): ...
+
+
+class BoundedProcessExecutor:
+    """Runs CPU-bound functions on a dedicated process pool.
+
+    At most `max_pending` calls can be queued or running at once; further calls
+    fail immediately with `ExecutorSaturated` instead of piling up. The pool is
+    started on first use, so it is never forked together with the parent's
+    threads, and its processes are spawned rather than forked.
+    """
+
+    def __init__(self, max_workers: int, max_pending: int) -> None:
+        self._max_workers = max_workers
+        self._slots = BoundedSemaphore(max_pending)
+        self._executor: ProcessPoolExecutor | None = None
+        self._lock = Lock()
+
+    async def run(self, fn: Callable[..., R], *args) -> R:
+        if not self._slots.acquire(blocking=False):
+            raise ExecutorSaturated(f"{fn.__name__} has too many pending calls")
+        try:
+            future = self._get_executor().submit(fn, *args)
+        except BaseException:
+            self._slots.release()
+            raise
+        # Released once the call is done rather than when the caller stops
+        # waiting: a cancelled caller leaves the call running in its process.
+        future.add_done_callback(lambda _: self._slots.release())
+        return await asyncio.wrap_future(future)
+
+    def shutdown(self) -> None:
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(cancel_futures=True)
+                self._executor = None
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    self._max_workers, mp_context=multiprocessing.get_context("spawn")
+                )
+            return self._executor
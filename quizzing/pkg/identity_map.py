@@ -0,0 +1,52 @@
+from typing import Any, Hashable, TypeVar
+
+E = TypeVar("E")
+
+
+class IdentityMap:
+    """The entities loaded or saved during one transaction, one instance per id.
+
+    Repositories look entities up here before querying, so reading the same
+    entity twice in a transaction costs a single round-trip and every reader gets
+    the same instance. Entries are keyed by the entity's type and id. The map
+    also remembers which of them are locked until the transaction ends.
+
+    Lookups take no lock. Sharing a map beyond its transaction would also hand
+    one instance, with its unsaved changes, to readers of other transactions.
+    """
+
+    def __init__(self) -> None:
+        self._entities: dict[tuple[type, Hashable], Any] = {}
+        self._locked: set[tuple[type, Hashable]] = set()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, type_: type[E], id_: Hashable) -> E | None:
+        entity = self._entities.get((type_, id_))
+        if entity is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return entity
+
+    def add(self, entity: Any, locked: bool = False) -> None:
+        """Maps `entity` by its `id`, replacing any other instance with that id."""
+        key = (type(entity), entity.id)
+        self._entities[key] = entity
+        if locked:
+            self._locked.add(key)
+
+    def merge(self, entity: E) -> E:
+        """Returns the instance already mapped with the id of `entity`, mapping
+        `entity` itself when there's none."""
+        return self._entities.setdefault((type(entity), entity.id), entity)
+
+    def is_locked(self, type_: type, id_: Hashable) -> bool:
+        return (type_, id_) in self._locked
+
+    def clear(self) -> None:
+        self._entities.clear()
+        self._locked.clear()
+
+    def __len__(self) -> int:
+        return len(self._entities)
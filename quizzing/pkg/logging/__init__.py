@@ -1,5 +1,6 @@
 import logging
 import logging.config
+import os
 from typing import Any
 
 import yaml
@@ -9,6 +10,12 @@ def config() -> dict[str, Any]:
     with open("quizzing/pkg/logging/logging.yaml", "r") as log_config_file:
         config = yaml.load(log_config_file, Loader=yaml.FullLoader)
 
+    # One JSON object per line instead of the plain text format.
+    if bool(int(os.environ.get("LOG_JSON", 0))):
+        for handler in config["handlers"].values():
+            if "formatter" in handler:
+                handler["formatter"] = "json"
+
     logging.basicConfig(level=logging.INFO)
     logging.config.dictConfig(config)
     return config
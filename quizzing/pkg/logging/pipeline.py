@@ -0,0 +1,185 @@
+import json
+import logging
+import queue
+import random
+import time
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from threading import Lock
+from typing import Any
+
+_exception_formatter = logging.Formatter()
+
+# How long the listener thread formats and writes records before letting the
+# threads that log have the GIL, in seconds.
+YIELD_INTERVAL = 0.0005
+
+# Attributes every LogRecord has, anything else was passed through `extra`.
+_RECORD_ATTRIBUTES = set(vars(logging.makeLogRecord({}))) | {"message", "asctime"}
+
+
+class JsonFormatter(logging.Formatter):
+    """Formats records as one JSON object per line, with the fields passed
+    through `extra` next to the standard ones."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry: dict[str, Any] = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "process": record.process,
+            "thread": record.threadName,
+        }
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES and not key.startswith("_"):
+                entry[key] = value
+        return json.dumps(entry, default=str)
+
+
+class BoundedQueueHandler(QueueHandler):
+    """Hands records over to a background thread through a bounded queue, so
+    that logging never does I/O on the calling thread.
+
+    Under overload, once the queue is more than `sample_above` full, records
+    below WARNING are only kept with probability `sample_rate`; when it is
+    full, records below ERROR are dropped and the rest wait up to
+    `error_timeout` seconds for room. The listener logs how many records were
+    dropped, at most once per `report_interval` seconds.
+    """
+
+    def __init__(
+        self,
+        handlers: list[logging.Handler],
+        maxsize: int = 10_000,
+        sample_above: float = 0.8,
+        sample_rate: float = 0.1,
+        error_timeout: float = 0.1,
+        report_interval: float = 10.0,
+    ) -> None:
+        super().__init__(queue.Queue(maxsize))
+        self._high_water = int(maxsize * sample_above)
+        self._sample_rate = sample_rate
+        self._error_timeout = error_timeout
+        self._report_interval = report_interval
+        self._last_report = 0.0
+        self._reported = 0
+        self.dropped = 0
+        self._lock = Lock()
+        self.listener = _DropReportingListener(self, handlers)
+        self.listener.start()
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        if record.levelno >= logging.ERROR:
+            try:
+                self.queue.put(record, timeout=self._error_timeout)
+            except queue.Full:
+                self._drop()
+            return
+        if (
+            record.levelno < logging.WARNING
+            and self.queue.qsize() >= self._high_water
+            and random.random() >= self._sample_rate
+        ):
+            self._drop()
+            return
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self._drop()
+
+    def handle(self, record: logging.LogRecord) -> bool:
+        # The queue is thread-safe already, skip the handler lock.
+        rv = self.filter(record)
+        if rv:
+            self.emit(record)
+        return bool(rv)
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Unlike QueueHandler.prepare, neither copy the record nor run a
+        # formatter on the calling thread: only resolve, in place, what may
+        # change or holds on to frames. Other handlers format it all the same.
+        if record.args:
+            record.msg = record.getMessage()
+            record.args = None
+        if record.exc_info:
+            if not record.exc_text:
+                record.exc_text = _exception_formatter.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def close(self) -> None:
+        # Stopping the listener handles the records still in the queue.
+        if self.listener._thread is not None:
+            self.listener.stop()
+        super().close()
+
+    def _drop(self) -> None:
+        with self._lock:
+            self.dropped += 1
+
+    def _dropped_to_report(self) -> int:
+        now = time.monotonic()
+        with self._lock:
+            if (
+                self.dropped == self._reported
+                or now - self._last_report < self._report_interval
+            ):
+                return 0
+            dropped, self._reported = self.dropped - self._reported, self.dropped
+            self._last_report = now
+            return dropped
+
+
+class _DropReportingListener(QueueListener):
+    def __init__(self, handler: BoundedQueueHandler, handlers: list[logging.Handler]):
+        super().__init__(handler.queue, *handlers, respect_handler_level=True)
+        self._handler = handler
+        self._last_yield = 0.0
+
+    def enqueue_sentinel(self) -> None:
+        # The queue may be full, wait for room instead of failing to stop,
+        # unless there is no thread left to make room.
+        if self._thread is not None and self._thread.is_alive():
+            self.queue.put(self._sentinel)
+
+    def handle(self, record: logging.LogRecord) -> None:
+        super().handle(record)
+        # Formatting is CPU-bound: without a switch, a thread waking up from I/O
+        # would wait for the GIL up to the whole switch interval (5 ms).
+        now = time.perf_counter()
+        if now - self._last_yield >= YIELD_INTERVAL:
+            time.sleep(0)
+            self._last_yield = now
+        dropped = self._handler._dropped_to_report()
+        if dropped:
+            super().handle(
+                logging.makeLogRecord(
+                    {
+                        "name": __name__,
+                        "levelno": logging.WARNING,
+                        "levelname": "WARNING",
+                        "msg": f"Dropped {dropped} log records, the queue is full",
+                    }
+                )
+            )
+
+
+def queue_handler(handlers: list, **kwargs) -> BoundedQueueHandler:
+    """`dictConfig` factory of a `BoundedQueueHandler` in front of `handlers`,
+    given as `cfg://handlers.<name>` references.
+
+    dictConfig configures handlers in alphabetical order, the name of this one
+    must sort after the names of `handlers`.
+    """
+    # Indexing, unlike iterating, resolves the references.
+    resolved = [handlers[i] for i in range(len(handlers))]
+    if not all(isinstance(h, logging.Handler) for h in resolved):
+        raise ValueError(
+            "The queue handler must sort after the handlers it feeds, by name"
+        )
+    return BoundedQueueHandler(resolved, **kwargs)
@@ -0,0 +1,9 @@
+from dataclasses import dataclass
+
+
+@dataclass(eq=False)
+class Entity:
+    """A minimal entity for the transaction bookkeeping tests: only its `id`
+    matters and instances compare by identity, like the domain entities."""
+
+    id: str
@@ -0,0 +1,70 @@
+from quizzing.pkg.cache import LRUCache
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_cache_hit_and_miss():
+    cache: LRUCache[str, int] = LRUCache(max_size=2)
+
+    assert cache.get("a") is None
+    cache.put("a", 1)
+
+    assert cache.get("a") == 1
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_cache_listeners_see_every_lookup():
+    cache: LRUCache[str, int] = LRUCache(max_size=2)
+    lookups: list[bool] = []
+    cache.add_listener(lookups.append)
+
+    cache.get("a")
+    cache.put("a", 1)
+    cache.get("a")
+
+    assert lookups == [False, True]
+
+
+def test_cache_evicts_least_recently_used():
+    cache: LRUCache[str, int] = LRUCache(max_size=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.get("a")
+    cache.put("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+
+def test_cache_entries_expire():
+    clock = FakeClock()
+    cache: LRUCache[str, int] = LRUCache(max_size=2, ttl=10, clock=clock)
+    cache.put("a", 1)
+
+    clock.now = 9.9
+    assert cache.get("a") == 1
+    clock.now = 10
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_cache_invalidate():
+    cache: LRUCache[str, int] = LRUCache(max_size=2)
+    cache.put("a", 1)
+    cache.invalidate("a")
+
+    assert cache.get("a") is None
+
+
+def test_disabled_cache_stores_nothing():
+    cache: LRUCache[str, int] = LRUCache(max_size=0)
+    cache.put("a", 1)
+
+    assert cache.get("a") is None
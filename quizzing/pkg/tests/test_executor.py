@@ -0,0 +1,47 @@
+import asyncio
+import time
+
+import pytest
+
+from quizzing.pkg.executor import BoundedProcessExecutor, ExecutorSaturated
+
+
+@pytest.fixture
+def executor():
+    executor = BoundedProcessExecutor(max_workers=1, max_pending=1)
+    yield executor
+    executor.shutdown()
+
+
+def test_executor_runs_function_in_another_process(executor):
+    result = asyncio.run(executor.run(pow, 2, 10))
+
+    assert result == 1024
+
+
+def test_executor_rejects_calls_over_the_pending_limit(executor):
+    async def run_two():
+        slow = asyncio.ensure_future(executor.run(time.sleep, 0.5))
+        await asyncio.sleep(0)
+        with pytest.raises(ExecutorSaturated):
+            await executor.run(pow, 2, 10)
+        await slow
+        return await executor.run(pow, 2, 10)
+
+    assert asyncio.run(run_two()) == 1024
+
+
+def test_cancelled_calls_hold_their_slot_until_done(executor):
+    async def cancel_one():
+        await executor.run(pow, 2, 10)  # starts the worker process
+        slow = asyncio.ensure_future(executor.run(time.sleep, 0.5))
+        await asyncio.sleep(0.2)
+        slow.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await slow
+        with pytest.raises(ExecutorSaturated):
+            await executor.run(pow, 2, 10)
+        await asyncio.sleep(0.5)
+        return await executor.run(pow, 2, 10)
+
+    assert asyncio.run(cancel_one()) == 1024
@@ -0,0 +1,39 @@
+from dataclasses import dataclass
+
+from quizzing.pkg.identity_map import IdentityMap
+from quizzing.pkg.tests.entities import Entity
+
+
+@dataclass(eq=False)
+class OtherEntity:
+    id: str
+
+
+def test_entities_are_mapped_by_type_and_id():
+    identity_map = IdentityMap()
+    entity = Entity("1")
+    identity_map.add(entity)
+
+    assert identity_map.get(Entity, "1") is entity
+    assert identity_map.get(OtherEntity, "1") is None
+    assert (identity_map.hits, identity_map.misses) == (1, 1)
+
+
+def test_merge_keeps_the_mapped_instance():
+    identity_map = IdentityMap()
+    entity = Entity("1")
+
+    assert identity_map.merge(entity) is entity
+    assert identity_map.merge(Entity("1")) is entity
+    assert len(identity_map) == 1
+
+
+def test_clear_forgets_entities_and_locks():
+    identity_map = IdentityMap()
+    identity_map.add(Entity("1"), locked=True)
+    assert identity_map.is_locked(Entity, "1")
+
+    identity_map.clear()
+
+    assert identity_map.get(Entity, "1") is None
+    assert not identity_map.is_locked(Entity, "1")
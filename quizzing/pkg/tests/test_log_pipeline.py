@@ -0,0 +1,125 @@
+import json
+import logging
+import sys
+import threading
+
+import pytest
+
+from quizzing.pkg.logging.pipeline import BoundedQueueHandler, JsonFormatter
+
+
+class BlockingHandler(logging.Handler):
+    """Collects records and the threads writing them, once `unblocked` is set."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.unblocked = threading.Event()
+        self.records: list[logging.LogRecord] = []
+        self.threads: set[threading.Thread] = set()
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.unblocked.wait()
+        self.records.append(record)
+        self.threads.add(threading.current_thread())
+
+
+@pytest.fixture
+def sink():
+    sink = BlockingHandler()
+    yield sink
+    sink.unblocked.set()
+
+
+def make_logger(handler: logging.Handler) -> logging.Logger:
+    logger = logging.getLogger(f"test_log_pipeline.{id(handler)}")
+    logger.propagate = False
+    logger.setLevel(logging.DEBUG)
+    logger.addHandler(handler)
+    return logger
+
+
+def test_records_are_written_on_the_listener_thread(sink):
+    sink.unblocked.set()
+    handler = BoundedQueueHandler([sink])
+    logger = make_logger(handler)
+
+    logger.info("hello %s", "world")
+    handler.close()
+
+    assert [r.getMessage() for r in sink.records] == ["hello world"]
+    assert threading.current_thread() not in sink.threads
+
+
+def test_arguments_are_resolved_when_logging(sink):
+    handler = BoundedQueueHandler([sink])
+    logger = make_logger(handler)
+    answers = ["A"]
+
+    logger.info("answers %s", answers)
+    answers.append("B")
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        logger.exception("failed")
+    sink.unblocked.set()
+    handler.close()
+
+    assert [r.getMessage() for r in sink.records] == ["answers ['A']", "failed"]
+    assert sink.records[1].exc_info is None
+    assert "ValueError: boom" in sink.records[1].exc_text
+
+
+def test_overload_drops_and_samples_low_levels_first(sink):
+    handler = BoundedQueueHandler(
+        [sink], maxsize=4, sample_above=0.5, sample_rate=0, error_timeout=0.01
+    )
+    logger = make_logger(handler)
+
+    # The listener takes the first record and blocks writing it.
+    logger.info("taken")
+    while handler.queue.qsize() > 0:
+        pass
+    for n in range(4):
+        logger.info("info %d", n)
+    logger.warning("warning 1")
+    logger.warning("warning 2")
+    logger.warning("warning 3")
+    logger.error("error")
+    sink.unblocked.set()
+    handler.close()
+
+    assert handler.dropped == 4
+    assert [r.getMessage() for r in sink.records] == [
+        "taken",
+        "Dropped 4 log records, the queue is full",
+        "info 0",
+        "info 1",
+        "warning 1",
+        "warning 2",
+    ]
+
+
+def test_json_formatter_keeps_extra_fields_and_exceptions():
+    try:
+        1 / 0
+    except ZeroDivisionError:
+        exc_info = sys.exc_info()
+    record = logging.makeLogRecord(
+        {
+            "name": "test_log_pipeline.json",
+            "levelno": logging.ERROR,
+            "levelname": "ERROR",
+            "msg": "failed %s",
+            "args": ("request",),
+            "exc_info": exc_info,
+            "request_id": "r1",
+        }
+    )
+
+    entry = json.loads(JsonFormatter().format(record))
+
+    assert entry["message"] == "failed request"
+    assert entry["level"] == "ERROR"
+    assert entry["logger"] == "test_log_pipeline.json"
+    assert entry["request_id"] == "r1"
+    assert "ZeroDivisionError" in entry["exception"]
@@ -0,0 +1,161 @@
+import pytest
+
+from quizzing.pkg.transactional import (
+    IsolationLevel,
+    MaxRetryError,
+    RetryAttempt,
+    RetryParams,
+    Transaction,
+    TransactionalMethod,
+    TransactionalServiceMixin,
+    retry_stats,
+    transactional,
+)
+
+
+class Conflict(Exception): ...
+
+
+class FakeTransaction(Transaction):
+    def __init__(self, manager: "FakeTransactionManager") -> None:
+        self._manager = manager
+
+    def begin(self):
+        self._manager.depth += 1
+        self._manager.begun += 1
+
+    def commit(self):
+        self._manager.depth -= 1
+
+    def rollback(self):
+        self._manager.depth -= 1
+
+
+class FakeTransactionManager:
+    def __init__(self) -> None:
+        self.depth = 0
+        self.begun = 0
+
+    def transaction(self, isolation_level=IsolationLevel.READ_COMMITTED):
+        return FakeTransaction(self)
+
+    def is_retriable_exception(self, ex: Exception) -> bool:
+        return isinstance(ex, Conflict)
+
+    def in_transaction(self) -> bool:
+        return self.depth > 0
+
+
+class Service(TransactionalServiceMixin):
+    def __init__(self, manager: FakeTransactionManager) -> None:
+        self._transaction_manager = manager
+
+    @transactional(IsolationLevel.SERIALIZABLE)
+    def outer(self) -> bool:
+        """Calls inner."""
+        return self.inner()
+
+    @transactional()
+    def inner(self) -> bool:
+        return self._transaction_manager.in_transaction()
+
+
+class FlakyService(TransactionalServiceMixin):
+    def __init__(self, failures: int) -> None:
+        self._transaction_manager = FakeTransactionManager()
+        self.failures = failures
+        self.attempts = 0
+
+    def _attempt(self) -> str:
+        self.attempts += 1
+        if self.attempts <= self.failures:
+            raise Conflict()
+        return "written"
+
+    @transactional(retry_params=RetryParams(max_retries=3, min_delay=0.001))
+    def write(self) -> str:
+        return self._attempt()
+
+    @transactional(
+        retry_params=RetryParams(
+            max_retries=100, min_delay=0.01, max_delay=0.01, deadline=0.05
+        )
+    )
+    def write_with_deadline(self) -> str:
+        return self._attempt()
+
+
+def test_wrapper_is_built_once_per_instance():
+    service = Service(FakeTransactionManager())
+
+    assert service.outer is service.outer
+    assert service.__dict__["outer"] is service.outer
+    assert Service(FakeTransactionManager()).outer is not service.outer
+
+
+def test_class_access_keeps_method_metadata():
+    method = Service.outer
+
+    assert isinstance(method, TransactionalMethod)
+    assert method.isolation_level == IsolationLevel.SERIALIZABLE
+    assert method.__name__ == "outer"
+    assert method.__doc__ == "Calls inner."
+
+
+def test_nested_calls_run_in_the_active_transaction():
+    manager = FakeTransactionManager()
+    service = Service(manager)
+
+    assert service.outer()
+    assert manager.begun == 1
+    assert manager.depth == 0
+
+
+def test_retriable_failures_are_retried():
+    service = FlakyService(failures=3)
+    stats = FlakyService.write.stats.snapshot()
+
+    assert service.write() == "written"
+    assert service.attempts == 4
+    after = FlakyService.write.stats.snapshot()
+    assert after["retries"] - stats["retries"] == 3
+    assert after["backoff_seconds"] > stats["backoff_seconds"]
+
+
+def test_exhausted_retries_raise():
+    service = FlakyService(failures=4)
+    exhausted = FlakyService.write.stats.exhausted
+
+    with pytest.raises(MaxRetryError) as info:
+        service.write()
+    assert isinstance(info.value.__cause__, Conflict)
+    assert service.attempts == 4
+    assert FlakyService.write.stats.exhausted == exhausted + 1
+    assert retry_stats()["FlakyService.write"] is FlakyService.write.stats
+
+
+def test_retry_listeners_see_every_conflict():
+    attempts: list[RetryAttempt] = []
+    FlakyService.write.stats.add_listener(attempts.append)
+
+    with pytest.raises(MaxRetryError):
+        FlakyService(failures=4).write()
+    assert [a.exhausted for a in attempts] == [False, False, False, True]
+    assert all(a.delay_seconds > 0 for a in attempts[:-1])
+
+
+def test_retries_stop_at_the_deadline():
+    service = FlakyService(failures=1000)
+
+    with pytest.raises(MaxRetryError):
+        service.write_with_deadline()
+    assert 1 < service.attempts <= 5
+
+
+def test_backoff_is_decorrelated_jitter():
+    params = RetryParams(min_delay=0.1, max_delay=1.0)
+    delay = None
+    for _ in range(100):
+        next_delay = params.next_delay(delay)
+        assert 0.1 <= next_delay <= min(1.0, 3 * (delay or 0.1))
+        delay = next_delay
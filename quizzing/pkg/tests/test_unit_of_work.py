@@ -0,0 +1,66 @@
+from typing import Any
+
+from quizzing.pkg.tests.entities import Entity
+from quizzing.pkg.unit_of_work import UnitOfWork
+
+
+class RecordingFlusher:
+    def __init__(self, flush_order: int, flushed: list) -> None:
+        self.flush_order = flush_order
+        self._flushed = flushed
+
+    def flush(self, entities: list[Any]) -> None:
+        self._flushed.append((self.flush_order, [e.id for e in entities]))
+
+
+def test_flushes_in_dependency_order_one_batch_per_flusher():
+    flushed: list = []
+    unit_of_work = UnitOfWork()
+    children = RecordingFlusher(1, flushed)
+    parents = RecordingFlusher(0, flushed)
+    unit_of_work.register(children, Entity("c1"))
+    unit_of_work.register(parents, Entity("p1"))
+    unit_of_work.register(children, Entity("c2"))
+
+    unit_of_work.flush()
+
+    assert flushed == [(0, ["p1"]), (1, ["c1", "c2"])]
+    assert len(unit_of_work) == 0
+
+
+def test_registering_an_entity_again_replaces_it():
+    flushed: list = []
+    unit_of_work = UnitOfWork()
+    flusher = RecordingFlusher(0, flushed)
+    unit_of_work.register(flusher, Entity("1"))
+    unit_of_work.register(flusher, Entity("1"))
+
+    assert len(unit_of_work) == 1
+    unit_of_work.flush()
+    assert flushed == [(0, ["1"])]
+
+
+def test_clear_drops_pending_entities():
+    flushed: list = []
+    unit_of_work = UnitOfWork()
+    unit_of_work.register(RecordingFlusher(0, flushed), Entity("1"))
+
+    unit_of_work.clear()
+    unit_of_work.flush()
+
+    assert flushed == []
+
+
+def test_after_commit_callbacks_run_once_and_are_dropped_on_clear():
+    called: list = []
+    unit_of_work = UnitOfWork()
+    unit_of_work.after_commit(lambda: called.append("committed"))
+
+    unit_of_work.committed()
+    unit_of_work.committed()
+    assert called == ["committed"]
+
+    unit_of_work.after_commit(lambda: called.append("rolled back"))
+    unit_of_work.clear()
+    unit_of_work.committed()
+    assert called == ["committed"]
@@ -1,13 +1,18 @@
+import asyncio
 import time
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
 from enum import Enum
-from functools import wraps
+from functools import update_wrapper, wraps
 from random import uniform
+from threading import Lock
 from typing import Any, Callable, ParamSpec, Protocol, TypeVar
 
 from typing_extensions import Self
 
+P = ParamSpec("P")
+R = TypeVar("R")
+
 
 class IsolationLevel(Enum):
     READ_UNCOMMITTED = 1
@@ -16,11 +21,102 @@ class IsolationLevel(Enum):
     SERIALIZABLE = 4
 
 
+class LockingMode(Enum):
+    """How a service keeps concurrent writes to the same rows apart.
+
+    With OPTIMISTIC, writes check on save that nobody else saved the rows since
+    they were read, and fail otherwise. With PESSIMISTIC, writes lock the rows
+    they load and wait for each other.
+    """
+
+    OPTIMISTIC = 1
+    PESSIMISTIC = 2
+
+
 @dataclass
 class RetryParams:
+    """How a transactional method retries attempts that failed with an exception
+    the transaction manager deems retriable.
+
+    Delays grow exponentially with decorrelated jitter: each one is drawn between
+    `min_delay` and three times the previous one, and capped at `max_delay`.
+    `deadline` is a budget in seconds for the whole call, attempts and sleeps
+    included; a retry that would only start after it is not made. Override
+    `next_delay` to plug in another backoff policy.
+    """
+
     max_retries: int = 3
     min_delay: float = 0.1
     max_delay: float = 1.0
+    deadline: float | None = None
+
+    def next_delay(self, previous_delay: float | None) -> float:
+        previous_delay = previous_delay or self.min_delay
+        return min(self.max_delay, uniform(self.min_delay, previous_delay * 3))
+
+
+@dataclass(frozen=True)
+class RetryAttempt:
+    """A conflict of a transactional method: retried after `delay_seconds`, or
+    given up on when `exhausted`."""
+
+    delay_seconds: float
+    exhausted: bool
+
+
+class RetryStats:
+    """Retries of one transactional method, across all instances of its service.
+
+    Listeners are called with a `RetryAttempt` on every conflict, on the thread
+    or task running the method.
+    """
+
+    def __init__(self) -> None:
+        self.retries = 0
+        self.exhausted = 0
+        self.backoff_seconds = 0.0
+        self._listeners: list[Callable[[RetryAttempt], None]] = []
+        self._lock = Lock()
+
+    def add_listener(self, listener: Callable[[RetryAttempt], None]) -> None:
+        self._listeners.append(listener)
+
+    def snapshot(self) -> dict[str, float]:
+        with self._lock:
+            return {
+                "retries": self.retries,
+                "exhausted": self.exhausted,
+                "backoff_seconds": self.backoff_seconds,
+            }
+
+    def _record_retry(self, delay: float) -> None:
+        with self._lock:
+            self.retries += 1
+            self.backoff_seconds += delay
+        self._notify(RetryAttempt(delay, False))
+
+    def _record_exhausted(self) -> None:
+        with self._lock:
+            self.exhausted += 1
+        self._notify(RetryAttempt(0.0, True))
+
+    def _notify(self, attempt: RetryAttempt) -> None:
+        for listener in self._listeners:
+            listener(attempt)
+
+
+_retry_stats: dict[str, RetryStats] = {}
+
+
+def retry_stats() -> dict[str, RetryStats]:
+    """Retry statistics of every transactional method, by qualified name."""
+    return dict(_retry_stats)
+
+
+class TransientError(Exception):
+    """Base for errors caused by a concurrent transaction rather than by the
+    call itself. Transaction managers deem them retriable: running the
+    transactional method again, on fresh data, can succeed."""
 
 
 class Transaction(ABC):
@@ -51,9 +147,90 @@ class TransactionManager(Protocol):
 
     def is_retriable_exception(self, ex: Exception) -> bool: ...
 
+    def in_transaction(self) -> bool: ...
+
+    def after_commit(self, callback: Callable[[], None]) -> None: ...
 
-P = ParamSpec("P")
-R = TypeVar("R")
+
+class AsyncTransaction(ABC):
+    """Transaction driven from asyncio code.
+
+    The transactional work itself is plain synchronous code handed to `run_sync`,
+    which runs it with the transaction active without blocking the event loop.
+    """
+
+    async def __aenter__(self) -> Self:
+        await self.begin()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is not None:
+            await self.rollback()
+            return
+        await self.commit()
+
+    @abstractmethod
+    async def begin(self): ...
+
+    @abstractmethod
+    async def commit(self): ...
+
+    @abstractmethod
+    async def rollback(self): ...
+
+    @abstractmethod
+    async def run_sync(self, fn: Callable[..., R], *args, **kwargs) -> R: ...
+
+
+class AsyncTransactionManager(Protocol):
+    def transaction(
+        self, isolation_level: IsolationLevel = IsolationLevel.READ_COMMITTED
+    ) -> AsyncTransaction: ...
+
+    def is_retriable_exception(self, ex: Exception) -> bool: ...
+
+    def in_transaction(self) -> bool: ...
+
+    def after_commit(self, callback: Callable[[], None]) -> None: ...
+
+
+class TransactionalMethod:
+    """What `@transactional` turns a service method into.
+
+    The first time the method is looked up on a service instance, the service's
+    `_wrap_transactional` builds the transactional wrapper around the bound
+    method and it is stored in the instance `__dict__`. Later lookups find it
+    there before reaching this (non-data) descriptor, so they cost a plain
+    attribute read.
+    """
+
+    def __init__(
+        self,
+        fn: Callable[..., Any],
+        isolation_level: IsolationLevel,
+        retry_params: RetryParams,
+    ) -> None:
+        update_wrapper(self, fn)
+        self.fn = fn
+        self.isolation_level = isolation_level
+        self.retry_params = retry_params
+        self.stats = RetryStats()
+
+    def __set_name__(self, owner: type, name: str) -> None:
+        self.name = name
+        _retry_stats[f"{owner.__qualname__}.{name}"] = self.stats
+
+    def __get__(self, instance: Any, owner: type | None = None) -> Any:
+        if instance is None:
+            return self
+        wrapper = instance._wrap_transactional(
+            self.fn.__get__(instance, owner),
+            self.isolation_level,
+            self.retry_params,
+            self.stats,
+        )
+        instance.__dict__[self.name] = wrapper
+        return wrapper
 
 
 def transactional(
@@ -61,12 +238,9 @@ def transactional(
     retry_params: RetryParams | None = None,
 ):
     def func(f: Callable[P, R]) -> Callable[P, R]:
-        f._is_transactional = True
-        f._isolation_level = isolation_level
-        f._retry_params = retry_params
-        if retry_params is None:
-            f._retry_params = RetryParams()
-        return f
+        return TransactionalMethod(  # type: ignore[return-value]
+            f, isolation_level, retry_params or RetryParams()
+        )
 
     return func
 
@@ -75,27 +249,114 @@ class MaxRetryError(Exception):
     pass
 
 
+class _Retry:
+    """Retry bookkeeping of a single call of a transactional method."""
+
+    def __init__(self, name: str, params: RetryParams, stats: RetryStats) -> None:
+        self._name = name
+        self._params = params
+        self._stats = stats
+        self._start = time.monotonic()
+        self._retries = 0
+        self._delay: float | None = None
+
+    def backoff(self, ex: Exception) -> float:
+        """Returns how long to wait before retrying after `ex`, or raises
+        MaxRetryError when out of retries or when the retry would miss the
+        deadline."""
+        delay = self._params.next_delay(self._delay)
+        deadline = self._params.deadline
+        if self._retries >= self._params.max_retries or (
+            deadline is not None and time.monotonic() + delay - self._start >= deadline
+        ):
+            self._stats._record_exhausted()
+            raise MaxRetryError(
+                f"{self._name} failed after {self._retries + 1} attempts"
+            ) from ex
+        self._retries += 1
+        self._delay = delay
+        self._stats._record_retry(delay)
+        return delay
+
+
 class TransactionalServiceMixin:
+    """Runs the `@transactional` methods of a service in a transaction.
+
+    Calls made while a transaction is already active, e.g. a service method
+    calling another one, run directly in that transaction.
+    """
+
     _transaction_manager: TransactionManager
+    locking_mode: LockingMode = LockingMode.OPTIMISTIC
+
+    def _get_for_write(self, repository: Any, entity_id: str) -> Any:
+        """Loads an entity the calling method is about to modify, locking its row
+        when the service runs in pessimistic mode."""
+        if self.locking_mode is LockingMode.PESSIMISTIC:
+            return repository.get_for_update(entity_id)
+        return repository.get(entity_id)
 
-    def __getattribute__(self, __name: str) -> Any:
-        attr = super().__getattribute__(__name)
-        if not callable(attr) or not getattr(attr, "_is_transactional", False):
-            return attr
-        isolation_level: IsolationLevel = getattr(attr, "_isolation_level")
-        retry_params: RetryParams = getattr(attr, "_retry_params")
+    def _wrap_transactional(
+        self,
+        method: Callable[..., Any],
+        isolation_level: IsolationLevel,
+        retry_params: RetryParams,
+        stats: RetryStats,
+    ) -> Callable[..., Any]:
+        manager = self._transaction_manager
 
-        @wraps(attr)
+        @wraps(method)
         def wrapper(*args, **kwargs):
-            for _ in range(retry_params.max_retries + 1):
+            if manager.in_transaction():
+                return method(*args, **kwargs)
+            retry = _Retry(method.__qualname__, retry_params, stats)
+            while True:
+                try:
+                    with manager.transaction(isolation_level):
+                        return method(*args, **kwargs)
+                except Exception as ex:
+                    if not manager.is_retriable_exception(ex):
+                        raise ex
+                    time.sleep(retry.backoff(ex))
+
+        return wrapper
+
+
+class AsyncTransactionalServiceMixin(TransactionalServiceMixin):
+    """Turns the `@transactional` methods of a service into coroutines.
+
+    The method bodies stay synchronous: each call opens an async transaction and
+    runs the method through `AsyncTransaction.run_sync`. Transactional methods
+    called from inside another one run directly in the caller's transaction and
+    return their result instead of a coroutine.
+    """
+
+    _transaction_manager: AsyncTransactionManager  # type: ignore[assignment]
+
+    def _wrap_transactional(
+        self,
+        method: Callable[..., Any],
+        isolation_level: IsolationLevel,
+        retry_params: RetryParams,
+        stats: RetryStats,
+    ) -> Callable[..., Any]:
+        manager = self._transaction_manager
+
+        async def run(*args, **kwargs):
+            retry = _Retry(method.__qualname__, retry_params, stats)
+            while True:
                 try:
-                    with self._transaction_manager.transaction(isolation_level):
-                        return attr(*args, **kwargs)
+                    async with manager.transaction(isolation_level) as tx:
+                        return await tx.run_sync(method, *args, **kwargs)
                 except Exception as ex:
-                    if not self._transaction_manager.is_retriable_exception(ex):
+                    if not manager.is_retriable_exception(ex):
                         raise ex
-                    if retry_params.max_retries == 0:
-                        raise MaxRetryError() from ex
-                    time.sleep(uniform(retry_params.min_delay, retry_params.max_delay))
+                    await asyncio.sleep(retry.backoff(ex))
+
+        @wraps(method)
+        def wrapper(*args, **kwargs):
+            if manager.in_transaction():
+                return method(*args, **kwargs)
+            return run(*args, **kwargs)
 
         return wrapper
@@ -0,0 +1,59 @@
+from typing import Any, Callable, Hashable, Protocol
+
+
+class Flusher(Protocol):
+    """Writes the pending entities of one kind, usually their repository.
+
+    Flushers run in ascending `flush_order`, so the rows other rows reference
+    are written first."""
+
+    flush_order: int
+
+    def flush(self, entities: list[Any]) -> None: ...
+
+
+class UnitOfWork:
+    """The entities saved during one transaction and not yet written.
+
+    Saves only register the entity with the flusher that knows how to write it;
+    `flush` then writes every pending entity, one batch per flusher. Registering
+    an entity again before the flush just replaces the pending instance.
+
+    It also holds what has to happen once the transaction commits, like
+    invalidating caches of the rows it writes: done any earlier, a concurrent
+    reader could cache the rows as they were before the commit.
+
+    Registering, flushing and committing take no lock; they all happen on the
+    context that runs the transaction, when it saves and when it commits.
+    """
+
+    def __init__(self) -> None:
+        self._pending: dict[Flusher, dict[Hashable, Any]] = {}
+        self._after_commit: list[Callable[[], None]] = []
+
+    def register(self, flusher: Flusher, entity: Any) -> None:
+        self._pending.setdefault(flusher, {})[entity.id] = entity
+
+    def flush(self) -> None:
+        # Flushers may register more entities while they run, flush those too.
+        while self._pending:
+            pending, self._pending = self._pending, {}
+            for flusher in sorted(pending, key=lambda f: f.flush_order):
+                flusher.flush(list(pending[flusher].values()))
+
+    def after_commit(self, callback: Callable[[], None]) -> None:
+        self._after_commit.append(callback)
+
+    def committed(self) -> None:
+        """Runs the callbacks registered for the commit that just happened."""
+        callbacks, self._after_commit = self._after_commit, []
+        for callback in callbacks:
+            callback()
+
+    def clear(self) -> None:
+        """Drops the pending entities and callbacks of a rolled back transaction."""
+        self._pending.clear()
+        self._after_commit.clear()
+
+    def __len__(self) -> int:
+        return sum(len(entities) for entities in self._pending.values())
@@ -1,4 +1,6 @@
+from quizzing.pkg.cache import LRUCache
 from quizzing.pkg.transactional import (
+    AsyncTransactionalServiceMixin,
     TransactionalServiceMixin,
     TransactionManager,
     transactional,
@@ -10,18 +12,45 @@ from ..domain.registry import DomainRegistry
 
 
 class AuthorService(TransactionalServiceMixin):
-    def __init__(self, transaction_manager: TransactionManager) -> None:
+    def __init__(
+        self,
+        transaction_manager: TransactionManager,
+        cache: "LRUCache[str, Author] | None" = None,
+    ) -> None:
         self._transaction_manager = transaction_manager
+        self._cache = cache if cache is not None else LRUCache(max_size=0)
 
     @transactional()
     def by_email(self, email: str) -> Author:
         return DomainRegistry.authors.by_email(email)
 
+    def authenticated(self, email: str) -> Author:
+        """Resolves the author of an authenticated request, going through the
+        cache so that most requests don't need a database round-trip."""
+        author = self._cache.get(email)
+        if author is None:
+            author = self.by_email(email)
+            self._cache.put(email, author)
+        return author
+
+    def invalidate(self, email: str) -> None:
+        self._cache.invalidate(email)
+
     @transactional()
-    def create(self, email: str, password: str):
+    def create(self, email: str, hashed_password: str):
         try:
             self.by_email(email)
             raise AuthorExists(f"Author with email '{email}' already exists")
         except NotFound:
-            author = Author.new(email, password)
+            author = Author.with_hashed_password(email, hashed_password)
             DomainRegistry.authors.save(author)
+            self._transaction_manager.after_commit(lambda: self.invalidate(email))
+
+
+class AsyncAuthorService(AsyncTransactionalServiceMixin, AuthorService):
+    async def authenticated(self, email: str) -> Author:
+        author = self._cache.get(email)
+        if author is None:
+            author = await self.by_email(email)
+            self._cache.put(email, author)
+        return author
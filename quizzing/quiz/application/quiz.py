@@ -1,7 +1,8 @@
 from dataclasses import dataclass
 
 from quizzing.pkg.transactional import (
-    IsolationLevel,
+    AsyncTransactionalServiceMixin,
+    LockingMode,
     TransactionalServiceMixin,
     TransactionManager,
     transactional,
@@ -16,8 +17,13 @@ from ..domain.registry import DomainRegistry
 
 
 class QuizService(TransactionalServiceMixin):
-    def __init__(self, transaction_manager: TransactionManager) -> None:
+    def __init__(
+        self,
+        transaction_manager: TransactionManager,
+        locking_mode: LockingMode = LockingMode.OPTIMISTIC,
+    ) -> None:
         self._transaction_manager = transaction_manager
+        self.locking_mode = locking_mode
 
     @transactional()
     def create(self, author: Author, title: str) -> Quiz:
@@ -27,11 +33,20 @@ class QuizService(TransactionalServiceMixin):
 
     @transactional()
     def get(self, author: Author, quiz_id: str) -> Quiz:
+        return self._get_as_seen_by(author, quiz_id)
+
+    @transactional()
+    def get_many(self, author: Author, quiz_ids: "set[QuizID]") -> "dict[QuizID, Quiz]":
+        """The quizzes `get` returns for each of `quiz_ids`, e.g. to read the
+        answers of submissions to them."""
+        return {quiz_id: self._get_as_seen_by(author, quiz_id) for quiz_id in quiz_ids}
+
+    def _get_as_seen_by(self, author: Author, quiz_id: str) -> Quiz:
         quiz = DomainRegistry.quizzes.get(quiz_id)
         if not quiz.is_published() and quiz.author_id != author.id:
             raise NotFound(f"Quiz {quiz_id} not found")
         if quiz.author_id != author.id:
-            quiz.hide_correct_answers()
+            quiz = quiz.without_correct_answers()
         return quiz
 
     @transactional()
@@ -39,41 +54,54 @@ class QuizService(TransactionalServiceMixin):
         if filter_.status is None or filter_.status != QuizStatus.PUBLISHED:
             filter_.author_id = author.id
         quizzes = DomainRegistry.quizzes.list(filter_)
-        for quiz in quizzes:
-            if quiz.author_id != author.id:
-                quiz.hide_correct_answers()
-        return quizzes
+        return [
+            quiz if quiz.author_id == author.id else quiz.without_correct_answers()
+            for quiz in quizzes
+        ]
 
-    @transactional(IsolationLevel.SERIALIZABLE)
+    @transactional()
     def edit(
         self,
         author: Author,
         quiz_id: QuizID,
         title: str,
         questions: "list[Question]",
+        version: int | None = None,
     ) -> Quiz:
-        quiz = DomainRegistry.quizzes.get(quiz_id)
+        quiz = self._get_for_write(DomainRegistry.quizzes, quiz_id)
         if quiz.author_id != author.id:
             raise NotFound(f"Quiz {quiz_id} not found")
+        quiz.check_version(version)
         quiz.set_title(title)
         quiz.set_questions(questions)
         DomainRegistry.quizzes.save(quiz)
         return quiz
 
     @transactional()
-    def publish(self, author: Author, quiz_id: QuizID) -> Quiz:
-        quiz = DomainRegistry.quizzes.get(quiz_id)
+    def publish(
+        self, author: Author, quiz_id: QuizID, version: int | None = None
+    ) -> Quiz:
+        quiz = self._get_for_write(DomainRegistry.quizzes, quiz_id)
         if quiz.author_id != author.id:
             raise NotFound(f"Quiz {quiz_id} not found")
+        quiz.check_version(version)
         quiz.publish()
         DomainRegistry.quizzes.save(quiz)
         return quiz
 
     @transactional()
     def submissions(
-        self, author: Author, quiz_id: QuizID, page: int, page_size: int
+        self,
+        author: Author,
+        quiz_id: QuizID,
+        page: int,
+        page_size: int,
+        after: str | None = None,
     ) -> "list[Submission]":
         quiz = DomainRegistry.quizzes.get(quiz_id)
         if quiz.author_id != author.id:
             raise NotFound(f"Quiz {quiz_id} not found")
-        return DomainRegistry.submissions.by_quiz(quiz_id, page, page_size)
+        return DomainRegistry.submissions.by_quiz(quiz_id, page, page_size, after)
+
+
+class AsyncQuizService(AsyncTransactionalServiceMixin, QuizService): ...
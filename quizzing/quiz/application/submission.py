@@ -1,7 +1,9 @@
 from dataclasses import dataclass
+from typing import Callable
 
 from quizzing.pkg.transactional import (
-    IsolationLevel,
+    AsyncTransactionalServiceMixin,
+    LockingMode,
     TransactionalServiceMixin,
     TransactionManager,
     transactional,
@@ -15,8 +17,13 @@ from ..domain.registry import DomainRegistry
 
 
 class SubmissionService(TransactionalServiceMixin):
-    def __init__(self, transaction_manager: TransactionManager) -> None:
+    def __init__(
+        self,
+        transaction_manager: TransactionManager,
+        locking_mode: LockingMode = LockingMode.OPTIMISTIC,
+    ) -> None:
         self._transaction_manager = transaction_manager
+        self.locking_mode = locking_mode
 
     @transactional()
     def list(self, author: Author) -> list[Submission]:
@@ -28,25 +35,46 @@ class SubmissionService(TransactionalServiceMixin):
         DomainRegistry.submissions.save(submission)
         return submission
 
-    @transactional(IsolationLevel.SERIALIZABLE)
+    @transactional()
     def answer(
         self,
         author: Author,
         submission_id: SubmissionID,
         answers: "list[set[AnswerOption]]",
+        version: int | None = None,
     ) -> Submission:
-        submission = DomainRegistry.submissions.get(submission_id)
+        submission = self._get_for_write(DomainRegistry.submissions, submission_id)
         if submission.author_id != author.id:
             raise NotFound(f"Submission {submission_id} not found")
+        submission.check_version(version)
         submission.answer(answers)
         DomainRegistry.submissions.save(submission)
         return submission
 
-    @transactional(IsolationLevel.SERIALIZABLE)
-    def complete(self, author: Author, submission_id: SubmissionID) -> Submission:
-        submission = DomainRegistry.submissions.get(submission_id)
+    @transactional()
+    def complete(
+        self,
+        author: Author,
+        submission_id: SubmissionID,
+        version: int | None = None,
+    ) -> Submission:
+        submission = self._get_for_write(DomainRegistry.submissions, submission_id)
         if submission.author_id != author.id:
             raise NotFound(f"Submission {submission_id} not found")
+        submission.check_version(version)
         submission.complete()
         DomainRegistry.submissions.save(submission)
         return submission
+
+    @transactional()
+    def with_quiz(
+        self, method: Callable[..., Submission], *args, **kwargs
+    ) -> tuple[Submission, Quiz]:
+        """Calls `method`, a method of this service returning a submission, and
+        loads the quiz answered in the same transaction, e.g. to decode the
+        answers of the submission."""
+        submission = method(*args, **kwargs)
+        return submission, DomainRegistry.quizzes.get(submission.quiz_id)
+
+
+class AsyncSubmissionService(AsyncTransactionalServiceMixin, SubmissionService): ...
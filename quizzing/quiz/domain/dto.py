@@ -9,3 +9,6 @@ class QuizFilter:
     author_id: str | None = None
     page: int = 1
     page_size: int = 10
+    # Id of the last quiz of the previous page. When set, the page starts right
+    # after it and `page` is ignored.
+    after: str | None = None
@@ -6,6 +6,19 @@ import bcrypt
 class AuthorID(str): ...
 
 
+def hash_password(password: str) -> str:
+    pwd_bytes = password.encode("utf-8")
+    salt = bcrypt.gensalt()
+    return bcrypt.hashpw(password=pwd_bytes, salt=salt).decode("utf-8")
+
+
+def check_password(plain_password: str, hashed_password: str) -> bool:
+    return bcrypt.checkpw(
+        password=plain_password.encode("utf-8"),
+        hashed_password=hashed_password.encode("utf-8"),
+    )
+
+
 class Author:
     def __init__(
         self,
@@ -18,19 +31,16 @@ class Author:
         self._hashed_password = hashed_password
 
     def verify_password(self, plain_password: str) -> bool:
-        password_byte_enc = plain_password.encode("utf-8")
-        return bcrypt.checkpw(
-            password=password_byte_enc,
-            hashed_password=self._hashed_password.encode("utf-8"),
-        )
+        return check_password(plain_password, self._hashed_password)
 
     @classmethod
     def new(cls, email: str, password: str) -> "Author":
+        return cls.with_hashed_password(email, hash_password(password))
+
+    @classmethod
+    def with_hashed_password(cls, email: str, hashed_password: str) -> "Author":
         id_ = AuthorID(str(uuid4()))
-        pwd_bytes = password.encode("utf-8")
-        salt = bcrypt.gensalt()
-        hashed_password = bcrypt.hashpw(password=pwd_bytes, salt=salt)
-        return cls(id_, email, hashed_password.decode("utf-8"))
+        return cls(id_, email, hashed_password)
 
     @property
     def email(self) -> str:
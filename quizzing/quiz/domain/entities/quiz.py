@@ -1,8 +1,9 @@
+from copy import copy
 from enum import Enum
 from typing import TYPE_CHECKING
 from uuid import uuid4
 
-from ..exceptions import QuizValidationError, SubmissionValidationError
+from ..exceptions import QuizValidationError, SubmissionValidationError, VersionConflict
 from .author import AuthorID
 
 if TYPE_CHECKING:
@@ -24,12 +25,15 @@ class Quiz:
         title: str,
         author_id: AuthorID,
         status: QuizStatus,
+        version: int = 0,
     ) -> None:
         self.id = id
         self.title = title
         self.questions: list[Question] = []
         self.status = status
         self.author_id = author_id
+        # Bumped on every save, 0 until the quiz is first saved.
+        self.version = version
 
     @classmethod
     def new(
@@ -40,10 +44,21 @@ class Quiz:
         id_ = QuizID(str(uuid4()))
         return cls(id_, title, author_id, QuizStatus.DRAFT)
 
+    def check_version(self, version: int | None) -> None:
+        """Makes sure the quiz is the expected version, if one is given."""
+        if version is not None and version != self.version:
+            raise VersionConflict(
+                f"Quiz {self.id} is at version {self.version}, not {version}"
+            )
+
     def set_title(
         self,
         title: str,
     ):
+        if self.status != QuizStatus.DRAFT:
+            raise QuizValidationError(
+                [f"Quiz {self.title} can only be edited if it is in draft status"]
+            )
         self.title = title
 
     def set_questions(
@@ -62,6 +77,8 @@ class Quiz:
         self.questions = questions
 
     def publish(self) -> None:
+        if self.status == QuizStatus.PUBLISHED:
+            raise QuizValidationError([f"Quiz {self.title} is already published"])
         if len(self.questions) == 0:
             raise QuizValidationError(
                 [f"Quiz {self.title} must have at least one question"]
@@ -72,18 +89,22 @@ class Quiz:
     def is_published(self) -> bool:
         return self.status == QuizStatus.PUBLISHED
 
-    def validate_answers(self, answers: list["Answer"]):
-        if self.status != QuizStatus.PUBLISHED:
-            raise SubmissionValidationError(
-                [f"Quiz {self.title} is not published and cannot be answered"]
-            )
+    def encode_answers(self, answers: list[set["AnswerOption"]]) -> list[int]:
+        """The bitmasks of the options chosen for every question."""
+        self._check_answerable(len(answers))
+        masks: list[int] = []
+        errors: list[str] = []
+        for question, options in zip(self.questions, answers):
+            try:
+                masks.append(question.encode(options))
+            except SubmissionValidationError as e:
+                errors.extend(e.errors)
+        if len(errors) > 0:
+            raise SubmissionValidationError(errors)
+        return masks
 
-        if len(answers) != len(self.questions):
-            raise SubmissionValidationError(
-                [
-                    f"Quiz {self.title} has {len(self.questions)} questions, but {len(answers)} answers were submitted"
-                ]
-            )
+    def validate_answers(self, answers: list["Answer"]):
+        self._check_answerable(len(answers))
         errors: list[str] = []
         for question, answer in zip(self.questions, answers):
             if answer is None:
@@ -94,6 +115,19 @@ class Quiz:
         if len(errors) > 0:
             raise SubmissionValidationError(errors)
 
+    def _check_answerable(self, answers: int) -> None:
+        if self.status != QuizStatus.PUBLISHED:
+            raise SubmissionValidationError(
+                [f"Quiz {self.title} is not published and cannot be answered"]
+            )
+
+        if answers != len(self.questions):
+            raise SubmissionValidationError(
+                [
+                    f"Quiz {self.title} has {len(self.questions)} questions, but {answers} answers were submitted"
+                ]
+            )
+
     def score(self, answers: list["Answer"]) -> list["Answer"]:
         self.validate_answers(answers)
         scored_answers: list["Answer"] = []
@@ -103,9 +137,19 @@ class Quiz:
             scored_answers.append(question._score(answer))
         return scored_answers
 
-    def hide_correct_answers(self) -> None:
+    def without_correct_answers(self) -> "Quiz":
+        """Returns a copy of the quiz whose questions hide their correct options.
+
+        The quiz itself is left untouched, since published quizzes are shared
+        between requests.
+        """
+        quiz = copy(self)
+        quiz.questions = []
         for question in self.questions:
+            question = copy(question)
             question.hide_correct_options()
+            quiz.questions.append(question)
+        return quiz
 
     def can_be_answered(self) -> bool:
         return self.status == QuizStatus.PUBLISHED
@@ -144,6 +188,9 @@ class Question:
         self.options = options
         self._correct_options = correct_options
         self._hidden_correct_options = False
+        # Answers are bitmasks, bit i standing for options[i].
+        self._bits = {option: 1 << i for i, option in enumerate(options)}
+        self._correct_mask = self.encode(correct_options)
 
     @property
     def correct_options(self) -> set[AnswerOption]:
@@ -160,6 +207,24 @@ class Question:
     def _is_multiple_choice(self) -> bool:
         return len(self._correct_options) > 1
 
+    def encode(self, options: set[AnswerOption]) -> int:
+        """The bitmask of the chosen `options`."""
+        mask = 0
+        for option in options:
+            bit = self._bits.get(option)
+            if bit is None:
+                raise SubmissionValidationError(
+                    [
+                        f"Question '{self.text}' has invalid options {options.difference(self.options)}"
+                    ]
+                )
+            mask |= bit
+        return mask
+
+    def decode(self, mask: int) -> list[AnswerOption]:
+        """The options chosen in `mask`, in the order of the question's."""
+        return [option for option, bit in self._bits.items() if mask & bit]
+
     def _validate_answer(self, answer: "Answer") -> list[str]:
         if answer.is_empty():
             return []
@@ -168,9 +233,9 @@ class Question:
         if not answer.is_single() and self.is_single_choice():
             errors.append(f"Question '{self.text}' must have a single choice answer")
 
-        if len(answer.options.intersection(self.options)) != len(answer.options):
+        if answer.mask >> len(self.options):
             errors.append(
-                f"Question '{self.text}' has invalid options {answer.options.difference(self.options)}"
+                f"Question '{self.text}' has invalid options, it only has {len(self.options)}"
             )
         return errors
 
@@ -178,7 +243,7 @@ class Question:
         if self.is_single_choice():
             if answer.is_empty():
                 return answer.with_score(0)
-            if answer.options == self._correct_options:
+            if answer.mask == self._correct_mask:
                 return answer.with_score(1)
             return answer.with_score(-1)
 
@@ -188,8 +253,14 @@ class Question:
             wrong_question_weight = 1 / (len(self.options) - len(self._correct_options))
         right_question_weight = 1 / len(self._correct_options)
         score = 0
-        for option in answer.options:
-            if option in self._correct_options:
+        # Added up option by option, in the order of the options, rather than
+        # multiplying popcounts: the floats differ in the last ulp, e.g.
+        # -0.49999999999999994 instead of -0.5, and scores already stored were
+        # computed this way.
+        for bit in self._bits.values():
+            if not answer.mask & bit:
+                continue
+            if self._correct_mask & bit:
                 score += right_question_weight
             else:
                 score -= wrong_question_weight
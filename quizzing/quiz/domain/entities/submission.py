@@ -1,7 +1,7 @@
 from enum import Enum
 from uuid import uuid4
 
-from ..exceptions import NotFound, SubmissionValidationError
+from ..exceptions import NotFound, SubmissionValidationError, VersionConflict
 from ..registry import DomainRegistry
 from .author import AuthorID
 from .quiz import AnswerOption, QuizID
@@ -24,6 +24,7 @@ class Submission:
         status: Status,
         answers: list["Answer"],
         score: float | None,
+        version: int = 0,
     ):
         self.id = id
         self.quiz_id = quiz_id
@@ -31,6 +32,8 @@ class Submission:
         self.status = status
         self.answers = answers
         self.score = score
+        # Bumped on every save, 0 until the submission is first saved.
+        self.version = version
 
     @classmethod
     def start(cls, quiz_id: QuizID, author_id: AuthorID):
@@ -49,6 +52,13 @@ class Submission:
         answers = [Answer.empty()] * len(quiz.questions)
         return cls(id_, quiz_id, author_id, cls.Status.IN_PROGRESS, answers, None)
 
+    def check_version(self, version: int | None) -> None:
+        """Makes sure the submission is the expected version, if one is given."""
+        if version is not None and version != self.version:
+            raise VersionConflict(
+                f"Submission {self.id} is at version {self.version}, not {version}"
+            )
+
     def answer(self, answers: list[set["AnswerOption"]]):
         if self.status == self.Status.COMPLETED:
             raise SubmissionValidationError(
@@ -56,7 +66,7 @@ class Submission:
             )
 
         quiz = DomainRegistry.quizzes.get(self.quiz_id)
-        parsed_answers: list[Answer] = [Answer(answer) for answer in answers]
+        parsed_answers = [Answer(mask) for mask in quiz.encode_answers(answers)]
         quiz.validate_answers(parsed_answers)
         self.answers = parsed_answers
 
@@ -78,21 +88,22 @@ class Submission:
 class Answer:
     def __init__(
         self,
-        options: set["AnswerOption"],
+        mask: int = 0,
         score: float | None = None,
     ):
-        self.options = options
+        # The chosen options, bit i standing for option i of the question.
+        self.mask = mask
         self.score = score
 
     @classmethod
     def empty(cls):
-        return cls(set())
+        return cls(0)
 
     def is_empty(self):
-        return len(self.options) == 0
+        return self.mask == 0
 
     def is_single(self):
-        return len(self.options) == 1
+        return self.mask.bit_count() == 1
 
     def with_score(self, score: float):
-        return Answer(self.options, score=score)
+        return Answer(self.mask, score=score)
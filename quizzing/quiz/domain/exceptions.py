@@ -16,3 +16,8 @@ class NotFound(Exception): ...
 
 
 class AuthorExists(Exception): ...
+
+
+class VersionConflict(Exception):
+    """An entity was saved by someone else since the version being written was
+    read."""
@@ -8,6 +8,7 @@ from .entities.submission import Submission
 
 class QuizRepository(Protocol):
     def get(self, quiz_id: str) -> "Quiz": ...
+    def get_for_update(self, quiz_id: str) -> "Quiz": ...
     def save(self, quiz: "Quiz") -> None: ...
     def list(self, filter_: QuizFilter) -> list["Quiz"]: ...
 
@@ -15,10 +16,15 @@ class QuizRepository(Protocol):
 class SubmissionRepository(Protocol):
     def by_author(self, author_id: AuthorID) -> list["Submission"]: ...
     def by_quiz(
-        self, quiz_id: QuizID, page: int | None = None, page_size: int | None = None
+        self,
+        quiz_id: QuizID,
+        page: int | None = None,
+        page_size: int | None = None,
+        after: str | None = None,
     ) -> list["Submission"]: ...
     def save(self, submission: "Submission") -> None: ...
     def get(self, submission_id: str) -> "Submission": ...
+    def get_for_update(self, submission_id: str) -> "Submission": ...
 
 
 class AuthorRepository(Protocol):
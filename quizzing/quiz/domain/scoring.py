@@ -0,0 +1,82 @@
+from typing import Sequence
+
+import numpy as np
+
+from .entities.quiz import Quiz
+from .entities.submission import Answer
+from .exceptions import SubmissionValidationError
+
+# Questions have at most this many options, so an answer fits in a uint8 mask.
+MAX_OPTIONS = 5
+
+
+class BatchScorer:
+    """A published quiz compiled for scoring many submissions at once.
+
+    Answers are bitmasks, bit `i` set when option `i` of the question was
+    chosen, and a batch is an (N submissions, questions) uint8 array of them.
+    For every question the score of each of the 2 ** MAX_OPTIONS masks is
+    computed once with `Question._score`, so scoring a batch is a table lookup
+    and gives exactly the scores scoring the answers one by one does.
+    """
+
+    def __init__(self, quiz: Quiz) -> None:
+        if not quiz.is_published():
+            raise SubmissionValidationError(
+                [f"Quiz {quiz.title} is not published and cannot be answered"]
+            )
+        self.quiz = quiz
+        self._n_options = np.array([len(q.options) for q in quiz.questions])
+        self._single_choice = np.array([q.is_single_choice() for q in quiz.questions])
+        self._table = np.zeros((len(quiz.questions), 1 << MAX_OPTIONS))
+        for q, question in enumerate(quiz.questions):
+            for mask in range(1 << len(question.options)):
+                self._table[q, mask] = question._score(Answer(mask)).score
+
+    def encode(self, submissions: Sequence[Sequence[Answer]]) -> np.ndarray:
+        """The masks of the answers of every submission, validated like
+        `Quiz.validate_answers` does."""
+        questions = len(self.quiz.questions)
+        for answers in submissions:
+            if len(answers) != questions:
+                raise SubmissionValidationError(
+                    [
+                        f"Quiz {self.quiz.title} has {questions} questions, "
+                        f"but {len(answers)} answers were submitted"
+                    ]
+                )
+        masks = np.array(
+            [[answer.mask for answer in answers] for answers in submissions],
+            dtype=np.uint8,
+        ).reshape(len(submissions), questions)
+        self._check(masks)
+        return masks
+
+    def score(self, masks: np.ndarray) -> np.ndarray:
+        """The (N, questions) scores of the answers in `masks`."""
+        self._check(masks)
+        return self._table[np.arange(len(self.quiz.questions)), masks]
+
+    @staticmethod
+    def totals(scores: np.ndarray) -> np.ndarray:
+        """The score of every submission, added question by question in the
+        same order `Submission.complete` does, so that it is the same float."""
+        total = np.zeros(len(scores))
+        for q in range(scores.shape[1]):
+            total = total + scores[:, q]
+        return total
+
+    def _check(self, masks: np.ndarray) -> None:
+        questions = len(self.quiz.questions)
+        if masks.ndim != 2 or masks.shape[1] != questions:
+            raise SubmissionValidationError(
+                [f"Quiz {self.quiz.title} has {questions} questions"]
+            )
+        errors: list[str] = []
+        if (masks >> self._n_options).any():
+            errors.append("Answers choose options their questions don't have")
+        multiple = (masks & (masks - 1)) != 0
+        if (multiple & self._single_choice).any():
+            errors.append("Single choice questions must have a single choice answer")
+        if errors:
+            raise SubmissionValidationError(errors)
@@ -12,6 +12,7 @@ from quizzing.quiz.domain.entities.submission import Answer
 from quizzing.quiz.domain.exceptions import (
     QuizValidationError,
     SubmissionValidationError,
+    VersionConflict,
 )
 
 
@@ -48,6 +49,29 @@ def test_set_title():
     assert quiz.title == new_title
 
 
+def test_set_title_published():
+    quiz_id = QuizID("1234")
+    title = "Sample Quiz"
+    author_id = AuthorID("author1")
+    quiz = Quiz(quiz_id, title, author_id, QuizStatus.PUBLISHED)
+
+    with pytest.raises(QuizValidationError):
+        quiz.set_title("Updated Title")
+    assert quiz.title == title
+
+
+def test_check_version():
+    quiz_id = QuizID("1234")
+    title = "Sample Quiz"
+    author_id = AuthorID("author1")
+    quiz = Quiz(quiz_id, title, author_id, QuizStatus.DRAFT, version=3)
+
+    quiz.check_version(None)
+    quiz.check_version(3)
+    with pytest.raises(VersionConflict):
+        quiz.check_version(2)
+
+
 def test_set_questions():
     quiz_id = QuizID("1234")
     title = "Sample Quiz"
@@ -95,6 +119,8 @@ def test_publish():
     quiz.set_questions([question])
     quiz.publish()
     assert quiz.status == QuizStatus.PUBLISHED
+    with pytest.raises(QuizValidationError):
+        quiz.publish()
 
 
 def test_publish_no_questions():
@@ -122,7 +148,7 @@ def test_validate_answers_not_published():
     author_id = AuthorID("author1")
     quiz = Quiz(quiz_id, title, author_id, QuizStatus.DRAFT)
 
-    answers = [Answer({AnswerOption("Option 1")})]
+    answers = [Answer(0b001)]
     with pytest.raises(SubmissionValidationError):
         quiz.validate_answers(answers)
 
@@ -145,7 +171,7 @@ def test_validate_answers_length_mismatch():
             {AnswerOption("Option 1")},
         ),
     ]
-    answers = [Answer({AnswerOption("Option 1")})]
+    answers = [Answer(0b001)]
     with pytest.raises(SubmissionValidationError):
         quiz.validate_answers(answers)
 
@@ -162,12 +188,12 @@ def test_score():
     )
     quiz.set_questions([question])
     quiz.publish()
-    answers = [Answer({AnswerOption("Option 1")})]
+    answers = [Answer(0b001)]
     scored_answers = quiz.score(answers)
     assert scored_answers[0].score == 1
 
 
-def test_hide_correct_answers():
+def test_without_correct_answers():
     quiz_id = QuizID("1234")
     title = "Sample Quiz"
     author_id = AuthorID("author1")
@@ -179,8 +205,9 @@ def test_hide_correct_answers():
         {AnswerOption("Option 1")},
     )
     quiz.set_questions([question])
-    quiz.hide_correct_answers()
-    assert question.correct_options == set()
+    hidden = quiz.without_correct_answers()
+    assert hidden.questions[0].correct_options == set()
+    assert question.correct_options == {AnswerOption("Option 1")}
 
 
 def test_can_be_answered():
@@ -228,7 +255,7 @@ def test_validate_answer():
     correct_options = {AnswerOption("Option 1")}
     question = Question(text, options, correct_options)
 
-    answer = Answer({AnswerOption("Option 1")})
+    answer = Answer(0b001)
     assert question._validate_answer(answer) == []
 
 
@@ -238,7 +265,7 @@ def test_score_single_choice():
     correct_options = {AnswerOption("Option 1")}
     question = Question(text, options, correct_options)
 
-    answer = Answer({AnswerOption("Option 1")})
+    answer = Answer(0b001)
     scored_answer = question._score(answer)
     assert scored_answer.score == 1
 
@@ -253,7 +280,7 @@ def test_score_multiple_choice():
     correct_options = {AnswerOption("Option 1"), AnswerOption("Option 2")}
     question = Question(text, options, correct_options)
 
-    answer = Answer({AnswerOption("Option 1"), AnswerOption("Option 2")})
+    answer = Answer(0b011)
     scored_answer = question._score(answer)
     assert scored_answer.score == 1.0
 
@@ -268,7 +295,7 @@ def test_score_partial_credit():
     correct_options = {AnswerOption("Option 1"), AnswerOption("Option 2")}
     question = Question(text, options, correct_options)
 
-    answer = Answer({AnswerOption("Option 1")})
+    answer = Answer(0b001)
     scored_answer = question._score(answer)
     assert scored_answer.score == 0.5
 
@@ -283,6 +310,32 @@ def test_score_negative():
     correct_options = {AnswerOption("Option 1"), AnswerOption("Option 2")}
     question = Question(text, options, correct_options)
 
-    answer = Answer({AnswerOption("Option 3")})
+    answer = Answer(0b100)
     scored_answer = question._score(answer)
     assert scored_answer.score == -1.0
+
+
+def test_encode_and_decode_answer():
+    text = "Sample Question"
+    options = [
+        AnswerOption("Option 1"),
+        AnswerOption("Option 2"),
+        AnswerOption("Option 3"),
+    ]
+    question = Question(text, options, {AnswerOption("Option 1")})
+
+    mask = question.encode({AnswerOption("Option 3"), AnswerOption("Option 1")})
+    assert mask == 0b101
+    assert question.decode(mask) == ["Option 1", "Option 3"]
+    assert question.encode(set()) == 0
+    with pytest.raises(SubmissionValidationError):
+        question.encode({AnswerOption("Option 4")})
+
+
+def test_validate_answer_invalid_options():
+    text = "Sample Question"
+    options = [AnswerOption("Option 1"), AnswerOption("Option 2")]
+    correct_options = {AnswerOption("Option 1"), AnswerOption("Option 2")}
+    question = Question(text, options, correct_options)
+
+    assert len(question._validate_answer(Answer(0b101))) == 1
@@ -0,0 +1,87 @@
+import random
+
+import numpy as np
+import pytest
+
+from quizzing.quiz.domain.entities.author import AuthorID
+from quizzing.quiz.domain.entities.quiz import AnswerOption, Question, Quiz
+from quizzing.quiz.domain.entities.submission import Answer
+from quizzing.quiz.domain.exceptions import SubmissionValidationError
+from quizzing.quiz.domain.scoring import BatchScorer
+
+
+def make_quiz(rng: random.Random) -> Quiz:
+    quiz = Quiz.new("Quiz", AuthorID("author1"))
+    questions = []
+    for i in range(10):
+        options = [AnswerOption(f"q{i}o{j}") for j in range(rng.randint(1, 5))]
+        correct = set(rng.sample(options, rng.randint(1, len(options))))
+        questions.append(Question(f"Question {i}", options, correct))
+    quiz.set_questions(questions)
+    quiz.publish()
+    return quiz
+
+
+def random_answers(rng: random.Random, quiz: Quiz) -> list[Answer]:
+    answers = []
+    for question in quiz.questions:
+        if question.is_single_choice():
+            options = rng.sample(question.options, rng.randint(0, 1))
+        else:
+            options = rng.sample(
+                question.options, rng.randint(0, len(question.options))
+            )
+        answers.append(Answer(question.encode(set(options))))
+    return answers
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_batch_scores_match_scoring_one_by_one(seed):
+    rng = random.Random(seed)
+    quiz = make_quiz(rng)
+    submissions = [random_answers(rng, quiz) for _ in range(500)]
+
+    scorer = BatchScorer(quiz)
+    scores = scorer.score(scorer.encode(submissions))
+    totals = scorer.totals(scores)
+
+    for n, answers in enumerate(submissions):
+        scored = quiz.score(answers)
+        assert scores[n].tolist() == [answer.score for answer in scored]
+        total = 0
+        for answer in scored:
+            total = total + answer.score
+        assert totals[n] == total
+
+
+def test_scores_add_the_weights_in_option_order():
+    options = [AnswerOption(o) for o in "ABCDE"]
+    question = Question("Question", options, set(options[:2]))
+
+    # Not 0.0 and -0.5: the weights are added one option at a time.
+    assert question._score(Answer(0b11111)).score == 1.1102230246251565e-16
+    assert question._score(Answer(0b11110)).score == -0.49999999999999994
+
+
+def test_batch_scorer_rejects_invalid_answers():
+    quiz = Quiz.new("Quiz", AuthorID("author1"))
+    quiz.set_questions(
+        [
+            Question("Single", [AnswerOption("a"), AnswerOption("b")], {"a"}),
+            Question("Multiple", [AnswerOption("a"), AnswerOption("b")], {"a", "b"}),
+        ]
+    )
+    with pytest.raises(SubmissionValidationError):
+        BatchScorer(quiz)
+    quiz.publish()
+    scorer = BatchScorer(quiz)
+
+    with pytest.raises(SubmissionValidationError):
+        scorer.encode([[Answer(0b01)]])
+    with pytest.raises(SubmissionValidationError):
+        scorer.encode([[Answer(0b01), Answer(0b100)]])
+    with pytest.raises(SubmissionValidationError):
+        scorer.encode([[Answer(0b11), Answer(0b01)]])
+    with pytest.raises(SubmissionValidationError):
+        scorer.score(np.array([[1, 4]], dtype=np.uint8))
+    assert scorer.score(np.array([[0, 3]], dtype=np.uint8)).tolist() == [[0, 1]]
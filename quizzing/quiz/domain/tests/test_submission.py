@@ -30,7 +30,7 @@ def test_submission_initialization():
     quiz_id = QuizID("quiz1")
     author_id = AuthorID("author1")
     status = Submission.Status.IN_PROGRESS
-    answers = [Answer({AnswerOption("Option 1")})]
+    answers = [Answer(0b01)]
     score = None
 
     submission = Submission(submission_id, quiz_id, author_id, status, answers, score)
@@ -109,7 +109,8 @@ def test_submission_answer():
     answers = [{AnswerOption("Option 1")}]
     submission.answer(answers)
     assert len(submission.answers) == 1
-    assert submission.answers[0].options == answers[0]
+    assert submission.answers[0].mask == 0b01
+    assert question.decode(submission.answers[0].mask) == ["Option 1"]
 
 
 def test_submission_complete():
@@ -0,0 +1,56 @@
+from copy import copy
+
+from quizzing.pkg.cache import LRUCache
+from quizzing.pkg.transactional import TransactionManager
+from quizzing.quiz.domain.dto import QuizFilter
+from quizzing.quiz.domain.entities.quiz import Quiz
+from quizzing.quiz.domain.ports import QuizRepository
+
+
+class CachedQuizRepository:
+    """Read-through cache of published quizzes in front of another repository.
+
+    Published quizzes can no longer be edited, so once a quiz is cached it never
+    goes stale. Drafts always go to the underlying repository. The cache keeps
+    its own instance of each quiz and hands out shallow copies of it, so a
+    write changing the quiz it loaded, e.g. its version on save, never reaches
+    the cache, even when its transaction rolls back. Questions are shared
+    between the copies and must not be mutated.
+
+    Saved quizzes are evicted once the transaction saving them commits, through
+    `transaction_manager`, so that nobody reads them back in the meantime.
+    """
+
+    def __init__(
+        self,
+        repository: QuizRepository,
+        cache: LRUCache[str, Quiz],
+        transaction_manager: TransactionManager,
+    ):
+        self._repository = repository
+        self._cache = cache
+        self._transaction_manager = transaction_manager
+
+    def get(self, quiz_id: str) -> Quiz:
+        quiz = self._cache.get(quiz_id)
+        if quiz is not None:
+            return copy(quiz)
+        quiz = self._repository.get(quiz_id)
+        if quiz.is_published():
+            self._cache.put(quiz_id, copy(quiz))
+        return quiz
+
+    def get_for_update(self, quiz_id: str) -> Quiz:
+        return self._repository.get_for_update(quiz_id)
+
+    def save(self, quiz: Quiz) -> None:
+        self._repository.save(quiz)
+        quiz_id = quiz.id
+        self._transaction_manager.after_commit(lambda: self._cache.invalidate(quiz_id))
+
+    def list(self, filter_: QuizFilter) -> list[Quiz]:
+        return self._repository.list(filter_)
+
+    @property
+    def cache(self) -> LRUCache[str, Quiz]:
+        return self._cache
@@ -0,0 +1,132 @@
+import pytest
+
+from quizzing.pkg.cache import LRUCache
+from quizzing.quiz.domain.entities.author import AuthorID
+from quizzing.quiz.domain.entities.quiz import (
+    AnswerOption,
+    Question,
+    Quiz,
+    QuizID,
+    QuizStatus,
+)
+from quizzing.quiz.infrastructure.repository.cache.repository import (
+    CachedQuizRepository,
+)
+from quizzing.quiz.infrastructure.repository.inmemory.repository import (
+    InMemoryQuizRepository,
+)
+from quizzing.quiz.infrastructure.repository.inmemory.transaction import (
+    InMemoryTransactionManager,
+)
+
+
+class CountingQuizRepository(InMemoryQuizRepository):
+    def __init__(self):
+        super().__init__()
+        self.gets = 0
+
+    def get(self, quiz_id: str) -> Quiz:
+        self.gets += 1
+        return super().get(quiz_id)
+
+
+def make_quiz(status: QuizStatus) -> Quiz:
+    quiz = Quiz(QuizID("quiz1"), "Sample Quiz", AuthorID("author1"), status)
+    quiz.questions = [
+        Question(
+            "Question 1",
+            [AnswerOption("Option 1"), AnswerOption("Option 2")],
+            {AnswerOption("Option 1")},
+        )
+    ]
+    return quiz
+
+
+def test_published_quizzes_are_cached():
+    repository = CountingQuizRepository()
+    cached = CachedQuizRepository(
+        repository, LRUCache(max_size=10), InMemoryTransactionManager()
+    )
+    quiz = make_quiz(QuizStatus.PUBLISHED)
+    cached.save(quiz)
+
+    first = cached.get(quiz.id)
+    second = cached.get(quiz.id)
+    assert first is not second
+    assert (first.title, second.title) == (quiz.title, quiz.title)
+    assert repository.gets == 1
+    assert (cached.cache.hits, cached.cache.misses) == (1, 1)
+
+
+def test_draft_quizzes_are_not_cached():
+    repository = CountingQuizRepository()
+    cached = CachedQuizRepository(
+        repository, LRUCache(max_size=10), InMemoryTransactionManager()
+    )
+    quiz = make_quiz(QuizStatus.DRAFT)
+    cached.save(quiz)
+
+    cached.get(quiz.id)
+    cached.get(quiz.id)
+
+    assert repository.gets == 2
+
+
+def test_save_invalidates_cached_quiz():
+    repository = CountingQuizRepository()
+    cached = CachedQuizRepository(
+        repository, LRUCache(max_size=10), InMemoryTransactionManager()
+    )
+    quiz = make_quiz(QuizStatus.PUBLISHED)
+    cached.save(quiz)
+    cached.get(quiz.id)
+
+    cached.save(quiz)
+    cached.get(quiz.id)
+
+    assert repository.gets == 2
+
+
+def test_save_invalidates_cached_quiz_once_committed():
+    repository = CountingQuizRepository()
+    manager = InMemoryTransactionManager()
+    cached = CachedQuizRepository(repository, LRUCache(max_size=10), manager)
+    quiz = make_quiz(QuizStatus.PUBLISHED)
+    cached.save(quiz)
+    cached.get(quiz.id)
+
+    with pytest.raises(RuntimeError):
+        with manager.transaction():
+            cached.save(quiz)
+            raise RuntimeError()
+    cached.get(quiz.id)
+    assert repository.gets == 1
+
+    with manager.transaction():
+        cached.save(quiz)
+        cached.get(quiz.id)
+        assert repository.gets == 1
+    cached.get(quiz.id)
+    assert repository.gets == 2
+
+
+def test_rolled_back_writes_leave_the_cached_quiz_untouched():
+    manager = InMemoryTransactionManager()
+    cached = CachedQuizRepository(
+        CountingQuizRepository(), LRUCache(max_size=10), manager
+    )
+    cached.save(make_quiz(QuizStatus.PUBLISHED))
+    cached.get("quiz1")
+
+    with pytest.raises(RuntimeError):
+        with manager.transaction():
+            quiz = cached.get("quiz1")
+            quiz.title = "Changed"
+            cached.save(quiz)
+            raise RuntimeError()
+
+    assert quiz.version == 2
+    assert (cached.get("quiz1").title, cached.get("quiz1").version) == (
+        "Sample Quiz",
+        1,
+    )
@@ -0,0 +1,11 @@
+from quizzing.pkg.transactional import TransientError
+from quizzing.quiz.domain.exceptions import VersionConflict
+
+
+class ConcurrentSave(VersionConflict, TransientError):
+    """An entity was saved by a concurrent transaction between being read and
+    written by this one.
+
+    Unlike a stale version the caller asked to write, running the operation
+    again reads the new version and can succeed, so services retry it.
+    """
@@ -1,67 +1,219 @@
-from dataclasses import dataclass
+from bisect import bisect_left, bisect_right, insort
+from copy import deepcopy
+from threading import Lock
+from typing import Callable, Hashable
 
 from quizzing.quiz.domain.dto import QuizFilter
 from quizzing.quiz.domain.entities.author import Author, AuthorID
-from quizzing.quiz.domain.entities.quiz import Quiz, QuizID
+from quizzing.quiz.domain.entities.quiz import Quiz, QuizID, QuizStatus
 from quizzing.quiz.domain.entities.submission import Submission
 from quizzing.quiz.domain.exceptions import NotFound
+from quizzing.quiz.infrastructure.repository.exceptions import ConcurrentSave
+
+
+class _SortedIndex:
+    """Ids grouped by a key, each group sorted like the SQL repositories order
+    their results, so that pages are sliced out of it without sorting."""
+
+    def __init__(self) -> None:
+        self._ids: dict[Hashable, list[str]] = {}
+
+    def add(self, key: Hashable, id_: str) -> None:
+        insort(self._ids.setdefault(key, []), id_)
+
+    def remove(self, key: Hashable, id_: str) -> None:
+        ids = self._ids[key]
+        del ids[bisect_left(ids, id_)]
+        if len(ids) == 0:
+            del self._ids[key]
+
+    def ids(self, key: Hashable) -> list[str]:
+        return self._ids.get(key, [])
+
+
+def _page(
+    ids: list[str],
+    matches: Callable[[str], bool] | None,
+    page: int | None,
+    page_size: int | None,
+    after: str | None,
+) -> list[str]:
+    """The ids of one page out of sorted `ids`, keeping those `matches` accepts,
+    with the same semantics as the SQL repositories' pagination."""
+    if page_size is None:
+        return [id_ for id_ in ids if matches is None or matches(id_)]
+    start, skip = 0, 0
+    if after is not None:
+        start = bisect_right(ids, after)
+    elif page is not None:
+        skip = (page - 1) * page_size
+    if matches is None:
+        return ids[start + skip : start + skip + page_size]
+    result: list[str] = []
+    for i in range(start, len(ids)):
+        if not matches(ids[i]):
+            continue
+        if skip > 0:
+            skip -= 1
+            continue
+        result.append(ids[i])
+        if len(result) == page_size:
+            break
+    return result
+
+
+def _check_version(stored: Quiz | Submission | None, entity: Quiz | Submission):
+    if stored is not None and stored.version != entity.version:
+        raise ConcurrentSave(
+            f"{type(entity).__name__} {entity.id} was modified concurrently"
+        )
 
 
 class InMemoryQuizRepository:
+    """Thread-safe quiz repository indexed by id, author and status.
+
+    Quizzes are copied when saved and when handed out, so changes to a quiz
+    only reach other readers once it is saved, like with the SQL repository.
+    Saves bump the version and refuse a quiz read at an older one.
+    """
+
     def __init__(self):
-        self.quizzes = {}
+        self.quizzes: dict[str, Quiz] = {}
+        self._ids: list[str] = []
+        self._by_author = _SortedIndex()
+        self._by_status = _SortedIndex()
+        # Author and status each quiz is indexed under, as it was last saved.
+        self._keys: dict[str, tuple[AuthorID, QuizStatus]] = {}
+        self._lock = Lock()
 
     def get(self, quiz_id: str) -> Quiz:
-        if quiz_id not in self.quizzes:
+        quiz = self.quizzes.get(quiz_id)
+        if quiz is None:
             raise NotFound(f"Quiz {quiz_id} not found")
-        return self.quizzes[quiz_id]
+        return deepcopy(quiz)
+
+    def get_for_update(self, quiz_id: str) -> Quiz:
+        return self.get(quiz_id)
 
     def save(self, quiz: Quiz) -> None:
-        self.quizzes[quiz.id] = quiz
+        with self._lock:
+            _check_version(self.quizzes.get(quiz.id), quiz)
+            keys = self._keys.get(quiz.id)
+            if keys is None:
+                insort(self._ids, quiz.id)
+            else:
+                self._by_author.remove(keys[0], quiz.id)
+                self._by_status.remove(keys[1], quiz.id)
+            self._by_author.add(quiz.author_id, quiz.id)
+            self._by_status.add(quiz.status, quiz.id)
+            self._keys[quiz.id] = (quiz.author_id, quiz.status)
+            quiz.version += 1
+            self.quizzes[quiz.id] = deepcopy(quiz)
 
     def list(self, filter_: QuizFilter) -> list[Quiz]:
-        return list(self.quizzes.values())
+        with self._lock:
+            # (ids matching the condition, position in _keys, expected value)
+            conditions: list[tuple[list[str], int, Hashable]] = []
+            if filter_.author_id is not None:
+                conditions.append(
+                    (self._by_author.ids(filter_.author_id), 0, filter_.author_id)
+                )
+            if filter_.status is not None:
+                conditions.append(
+                    (self._by_status.ids(filter_.status), 1, filter_.status)
+                )
+            # Walk the smallest index, checking the other condition on the way.
+            conditions.sort(key=lambda c: len(c[0]))
+            ids = conditions[0][0] if conditions else self._ids
+            matches = None
+            if len(conditions) > 1:
+                _, position, value = conditions[1]
+                matches = lambda id_: self._keys[id_][position] == value
+            page = _page(ids, matches, filter_.page, filter_.page_size, filter_.after)
+            return [deepcopy(self.quizzes[id_]) for id_ in page]
 
 
 class InMemorySubmissionRepository:
+    """Thread-safe submission repository indexed by id, author and quiz.
+
+    Submissions are copied and versioned like quizzes, see
+    `InMemoryQuizRepository`.
+    """
+
     def __init__(self):
-        self.submissions = []
+        self.submissions: dict[str, Submission] = {}
+        self._by_author = _SortedIndex()
+        self._by_quiz = _SortedIndex()
+        self._lock = Lock()
 
     def by_author(self, author_id: AuthorID) -> list[Submission]:
-        return [
-            submission
-            for submission in self.submissions
-            if submission.author_id == author_id
-        ]
+        with self._lock:
+            return [
+                deepcopy(self.submissions[id_])
+                for id_ in self._by_author.ids(author_id)
+            ]
 
     def by_quiz(
-        self, quiz_id: QuizID, page: int | None = None, page_size: int | None = None
+        self,
+        quiz_id: QuizID,
+        page: int | None = None,
+        page_size: int | None = None,
+        after: str | None = None,
     ) -> list[Submission]:
-        return [
-            submission
-            for submission in self.submissions
-            if submission.quiz_id == quiz_id
-        ]
+        with self._lock:
+            ids = _page(self._by_quiz.ids(quiz_id), None, page, page_size, after)
+            return [deepcopy(self.submissions[id_]) for id_ in ids]
 
     def save(self, submission: Submission) -> None:
-        self.submissions.append(submission)
+        with self._lock:
+            stored = self.submissions.get(submission.id)
+            _check_version(stored, submission)
+            if stored is None:
+                # The quiz and author of a submission never change.
+                self._by_author.add(submission.author_id, submission.id)
+                self._by_quiz.add(submission.quiz_id, submission.id)
+            submission.version += 1
+            self.submissions[submission.id] = deepcopy(submission)
 
     def get(self, submission_id: str) -> Submission:
-        for submission in self.submissions:
-            if submission.id == submission_id:
-                return submission
-        raise NotFound(f"Submission {submission_id} not found")
+        submission = self.submissions.get(submission_id)
+        if submission is None:
+            raise NotFound(f"Submission {submission_id} not found")
+        return deepcopy(submission)
+
+    def get_for_update(self, submission_id: str) -> Submission:
+        return self.get(submission_id)
 
 
 class InMemoryAuthorRepository:
+    """Thread-safe author repository indexed by id and email. Authors are
+    copied when saved and when handed out, like quizzes."""
+
     def __init__(self):
-        self.authors = {}
+        self.authors: dict[AuthorID, Author] = {}
+        self._by_email: dict[str, Author] = {}
+        # Email each author is indexed under, as it was last saved.
+        self._emails: dict[AuthorID, str] = {}
+        self._lock = Lock()
 
     def by_email(self, email: str) -> Author:
-        for author in self.authors.values():
-            if author.email == email:
-                return author
-        raise NotFound(f"Author with email {email} not found")
+        author = self._by_email.get(email)
+        if author is None:
+            raise NotFound(f"Author with email {email} not found")
+        return deepcopy(author)
+
+    def get(self, author_id: AuthorID) -> Author:
+        author = self.authors.get(author_id)
+        if author is None:
+            raise NotFound(f"Author {author_id} not found")
+        return deepcopy(author)
 
     def save(self, author: Author) -> None:
-        self.authors[author.id] = author
+        with self._lock:
+            email = self._emails.get(author.id)
+            if email is not None:
+                del self._by_email[email]
+            author = deepcopy(author)
+            self._by_email[author.email] = author
+            self._emails[author.id] = author.email
+            self.authors[author.id] = author
@@ -0,0 +1,181 @@
+from copy import copy
+from threading import Thread
+
+import pytest
+
+from quizzing.quiz.application.quiz import QuizService
+from quizzing.quiz.domain.dto import QuizFilter
+from quizzing.quiz.domain.entities.author import Author, AuthorID
+from quizzing.quiz.domain.entities.quiz import (
+    AnswerOption,
+    Question,
+    Quiz,
+    QuizID,
+    QuizStatus,
+)
+from quizzing.quiz.domain.entities.submission import Submission, SubmissionID
+from quizzing.quiz.domain.exceptions import (
+    NotFound,
+    QuizValidationError,
+    VersionConflict,
+)
+from quizzing.quiz.domain.registry import DomainRegistry
+from quizzing.quiz.infrastructure.repository.inmemory.repository import (
+    InMemoryAuthorRepository,
+    InMemoryQuizRepository,
+    InMemorySubmissionRepository,
+)
+from quizzing.quiz.infrastructure.repository.inmemory.transaction import (
+    InMemoryTransactionManager,
+)
+
+
+def make_submission(n: int, quiz_id: str, author_id: str) -> Submission:
+    return Submission(
+        SubmissionID(f"submission{n:03}"),
+        QuizID(quiz_id),
+        AuthorID(author_id),
+        Submission.Status.IN_PROGRESS,
+        [],
+        None,
+    )
+
+
+def test_quiz_list_filters_and_paginates_like_the_sql_repository():
+    repository = InMemoryQuizRepository()
+    quizzes = []
+    for n in range(30):
+        status = QuizStatus.PUBLISHED if n % 3 else QuizStatus.DRAFT
+        quiz = Quiz(QuizID(f"quiz{n:03}"), "Quiz", AuthorID(f"author{n % 2}"), status)
+        repository.save(quiz)
+        quizzes.append(quiz)
+    expected = [
+        quiz.id
+        for quiz in quizzes
+        if quiz.author_id == "author1" and quiz.status == QuizStatus.PUBLISHED
+    ]
+
+    offset_pages, keyset_pages = [], []
+    after = None
+    for page in range(1, 4):
+        filter_ = QuizFilter(QuizStatus.PUBLISHED, "author1", page, 4)
+        offset_pages += [quiz.id for quiz in repository.list(filter_)]
+        filter_ = QuizFilter(QuizStatus.PUBLISHED, "author1", page_size=4, after=after)
+        keyset_page = repository.list(filter_)
+        keyset_pages += [quiz.id for quiz in keyset_page]
+        after = keyset_page[-1].id
+
+    assert offset_pages == keyset_pages == expected
+    assert len(repository.list(QuizFilter(page_size=100))) == 30
+
+
+def test_quiz_save_moves_the_quiz_between_indexes():
+    repository = InMemoryQuizRepository()
+    quiz = Quiz(QuizID("quiz1"), "Quiz", AuthorID("author1"), QuizStatus.DRAFT)
+    repository.save(quiz)
+
+    quiz.status = QuizStatus.PUBLISHED
+    repository.save(quiz)
+
+    assert repository.list(QuizFilter(status=QuizStatus.DRAFT)) == []
+    assert [q.id for q in repository.list(QuizFilter(status=QuizStatus.PUBLISHED))] == [
+        quiz.id
+    ]
+    assert quiz.version == 2
+
+
+def test_saving_a_stale_copy_conflicts():
+    repository = InMemoryQuizRepository()
+    quiz = Quiz(QuizID("quiz1"), "Quiz", AuthorID("author1"), QuizStatus.DRAFT)
+    repository.save(quiz)
+    stale = copy(quiz)
+    repository.save(quiz)
+
+    with pytest.raises(VersionConflict):
+        repository.save(stale)
+
+
+def test_concurrent_edits_conflict():
+    repository = InMemoryQuizRepository()
+    repository.save(
+        Quiz(QuizID("quiz1"), "Quiz", AuthorID("author1"), QuizStatus.DRAFT)
+    )
+    first = repository.get("quiz1")
+    second = repository.get("quiz1")
+
+    first.title = "First"
+    second.title = "Second"
+    repository.save(first)
+
+    assert repository.get("quiz1").title == "First"
+    with pytest.raises(VersionConflict):
+        repository.save(second)
+    assert repository.get("quiz1").title == "First"
+
+
+def test_rejected_edits_leave_the_stored_quiz_unchanged():
+    DomainRegistry.initialize(
+        InMemoryQuizRepository(),
+        InMemorySubmissionRepository(),
+        InMemoryAuthorRepository(),
+    )
+    service = QuizService(InMemoryTransactionManager())
+    author = Author(AuthorID("author1"), "author1@example.com", "hashed")
+    quiz = service.create(author, "Quiz")
+    options = [AnswerOption("A"), AnswerOption("B")]
+    questions = [Question(f"Question {i}", options, {options[0]}) for i in range(11)]
+
+    with pytest.raises(QuizValidationError):
+        service.edit(author, quiz.id, "Changed", questions)
+    with pytest.raises(VersionConflict):
+        service.edit(author, quiz.id, "Changed", questions[:1], quiz.version + 1)
+
+    stored = service.get(author, quiz.id)
+    assert (stored.title, stored.questions, stored.version) == ("Quiz", [], 1)
+
+
+def test_submission_save_replaces_the_submission():
+    repository = InMemorySubmissionRepository()
+    submissions = [make_submission(n, f"quiz{n % 2}", "author1") for n in range(10)]
+    for submission in submissions:
+        repository.save(submission)
+    repository.save(submissions[0])
+
+    assert len(repository.by_author(AuthorID("author1"))) == 10
+    assert [s.id for s in repository.by_quiz(QuizID("quiz0"), 2, 2)] == [
+        "submission004",
+        "submission006",
+    ]
+    assert [
+        s.id for s in repository.by_quiz(QuizID("quiz0"), 1, 2, "submission006")
+    ] == ["submission008"]
+    assert repository.get("submission000").version == 2
+
+
+def test_concurrent_saves_keep_the_indexes_consistent():
+    repository = InMemorySubmissionRepository()
+
+    def save(thread: int) -> None:
+        for n in range(200):
+            repository.save(make_submission(thread * 1000 + n, "quiz1", "author1"))
+
+    threads = [Thread(target=save, args=(thread,)) for thread in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    submissions = repository.by_quiz(QuizID("quiz1"))
+    assert len(submissions) == len(repository.by_author(AuthorID("author1"))) == 1600
+    assert [s.id for s in submissions] == sorted(s.id for s in submissions)
+
+
+def test_authors_are_found_by_email():
+    repository = InMemoryAuthorRepository()
+    author = Author(AuthorID("author1"), "author1@example.com", "hashed")
+    repository.save(author)
+
+    assert repository.by_email("author1@example.com").id == author.id
+    assert repository.get(AuthorID("author1")).email == author.email
+    with pytest.raises(NotFound):
+        repository.by_email("author2@example.com")
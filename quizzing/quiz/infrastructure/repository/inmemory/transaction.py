@@ -0,0 +1,63 @@
+from contextvars import ContextVar
+from typing import Callable
+
+from quizzing.pkg.transactional import IsolationLevel, Transaction, TransientError
+
+
+class InMemoryTransaction(Transaction):
+    """Only tracks nesting: the in-memory repositories apply every save right
+    away, so rolling back doesn't undo the saves already made. They hand out
+    copies though, so changes a failed call never saved don't reach them."""
+
+    def __init__(self, manager: "InMemoryTransactionManager") -> None:
+        self._manager = manager
+
+    def begin(self) -> None:
+        if self._manager._depth.get() == 0:
+            self._manager._after_commit.set([])
+        self._manager._depth.set(self._manager._depth.get() + 1)
+
+    def commit(self) -> None:
+        self._end()
+        if self._manager._depth.get() == 0:
+            for callback in self._manager._after_commit.get():
+                callback()
+
+    def rollback(self) -> None:
+        self._end()
+
+    def _end(self) -> None:
+        self._manager._depth.set(max(0, self._manager._depth.get() - 1))
+
+
+class InMemoryTransactionManager:
+    """Transaction manager for services running over the in-memory repositories.
+
+    Like `SQLATransactionManager`, transactions are tracked per execution
+    context, so nested service calls see the transaction of their caller.
+    """
+
+    def __init__(self) -> None:
+        self._depth: ContextVar[int] = ContextVar(
+            f"inmemory_transaction_{id(self)}", default=0
+        )
+        self._after_commit: ContextVar[list[Callable[[], None]]] = ContextVar(
+            f"inmemory_after_commit_{id(self)}"
+        )
+
+    def transaction(
+        self, isolation_level: IsolationLevel = IsolationLevel.READ_COMMITTED
+    ) -> InMemoryTransaction:
+        return InMemoryTransaction(self)
+
+    def is_retriable_exception(self, ex: Exception) -> bool:
+        return isinstance(ex, TransientError)
+
+    def in_transaction(self) -> bool:
+        return self._depth.get() > 0
+
+    def after_commit(self, callback: Callable[[], None]) -> None:
+        if self.in_transaction():
+            self._after_commit.get().append(callback)
+        else:
+            callback()
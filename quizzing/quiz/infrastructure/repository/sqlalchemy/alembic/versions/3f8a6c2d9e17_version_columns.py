@@ -0,0 +1,36 @@
+"""version columns
+
+Revision ID: 3f8a6c2d9e17
+Revises: b5d93e61f0c7
+Create Date: 2026-10-17 16:05:12.804113
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "3f8a6c2d9e17"
+down_revision: Union[str, None] = "b5d93e61f0c7"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # A constant default makes these metadata-only changes, existing rows are
+    # not rewritten.
+    op.add_column(
+        "quiz",
+        sa.Column("version", sa.Integer(), server_default="1", nullable=False),
+    )
+    op.add_column(
+        "submission",
+        sa.Column("version", sa.Integer(), server_default="1", nullable=False),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("submission", "version")
+    op.drop_column("quiz", "version")
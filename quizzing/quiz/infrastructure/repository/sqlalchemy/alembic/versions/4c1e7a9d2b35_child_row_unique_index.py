@@ -0,0 +1,47 @@
+"""child row unique index
+
+Revision ID: 4c1e7a9d2b35
+Revises: dfd15f65ccf6
+Create Date: 2026-10-17 10:12:41.318203
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "4c1e7a9d2b35"
+down_revision: Union[str, None] = "dfd15f65ccf6"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+CONSTRAINTS = [
+    ("question_quiz_id_index_key", "question", ["quiz_id", "index"]),
+    ("answer_submission_id_index_key", "answer", ["submission_id", "index"]),
+]
+
+
+def upgrade() -> None:
+    # Adding the constraints directly would build their indexes under an
+    # ACCESS EXCLUSIVE lock. Building them concurrently keeps the tables
+    # writable, and attaching a built index only takes the lock briefly.
+    with op.get_context().autocommit_block():
+        for name, table, columns in CONSTRAINTS:
+            op.create_index(
+                name,
+                table,
+                columns,
+                unique=True,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+            op.execute(
+                f"ALTER TABLE {table} ADD CONSTRAINT {name} UNIQUE USING INDEX {name}"
+            )
+
+
+def downgrade() -> None:
+    for name, table, _ in reversed(CONSTRAINTS):
+        op.drop_constraint(name, table, type_="unique")
@@ -0,0 +1,51 @@
+"""foreign key lookup indexes
+
+Revision ID: 7e2f0b3c8a41
+Revises: 4c1e7a9d2b35
+Create Date: 2026-10-17 11:40:05.902117
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "7e2f0b3c8a41"
+down_revision: Union[str, None] = "4c1e7a9d2b35"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# question (quiz_id, index), answer (submission_id, index) and submission
+# (quiz_id, author_id) are already covered by their unique constraints.
+INDEXES = [
+    ("ix_quiz_author_id_status", "quiz", ["author_id", "status"]),
+    ("ix_quiz_status", "quiz", ["status"]),
+    ("ix_submission_author_id", "submission", ["author_id"]),
+]
+
+
+def upgrade() -> None:
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block, and it
+    # keeps the tables writable while the indexes are built.
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(
+                name,
+                table,
+                columns,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(
+                name,
+                table_name=table,
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
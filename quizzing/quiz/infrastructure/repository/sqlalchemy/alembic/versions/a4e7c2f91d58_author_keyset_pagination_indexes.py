@@ -0,0 +1,62 @@
+"""author keyset pagination indexes
+
+Revision ID: a4e7c2f91d58
+Revises: e81f5a3c6b92
+Create Date: 2026-10-18 09:34:12.604187
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "a4e7c2f91d58"
+down_revision: Union[str, None] = "e81f5a3c6b92"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = [
+    ("ix_quiz_author_id_id", "quiz", ["author_id", "id"]),
+    ("ix_quiz_author_id_status_id", "quiz", ["author_id", "status", "id"]),
+]
+
+
+def upgrade() -> None:
+    # Listings filtered by author, and by author and status, are sorted by id
+    # like the others. ix_quiz_author_id_status_id supersedes
+    # ix_quiz_author_id_status.
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(
+                name,
+                table,
+                columns,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+        op.drop_index(
+            "ix_quiz_author_id_status",
+            table_name="quiz",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_quiz_author_id_status",
+            "quiz",
+            ["author_id", "status"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(
+                name,
+                table_name=table,
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
@@ -0,0 +1,67 @@
+"""keyset pagination indexes
+
+Revision ID: b5d93e61f0c7
+Revises: 7e2f0b3c8a41
+Create Date: 2026-10-17 14:21:52.517340
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "b5d93e61f0c7"
+down_revision: Union[str, None] = "7e2f0b3c8a41"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Listings are sorted by id and paginated with `id > :after`, so each filter
+    # needs an index that ends with id. ix_quiz_status_id supersedes ix_quiz_status.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_quiz_status_id",
+            "quiz",
+            ["status", "id"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            "ix_submission_quiz_id_id",
+            "submission",
+            ["quiz_id", "id"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.drop_index(
+            "ix_quiz_status",
+            table_name="quiz",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_quiz_status",
+            "quiz",
+            ["status"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.drop_index(
+            "ix_submission_quiz_id_id",
+            table_name="submission",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+        op.drop_index(
+            "ix_quiz_status_id",
+            table_name="quiz",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
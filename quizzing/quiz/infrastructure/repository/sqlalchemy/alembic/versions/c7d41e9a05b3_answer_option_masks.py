@@ -0,0 +1,121 @@
+"""answer option masks
+
+Revision ID: c7d41e9a05b3
+Revises: 3f8a6c2d9e17
+Create Date: 2026-10-17 19:42:37.511208
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "c7d41e9a05b3"
+down_revision: Union[str, None] = "3f8a6c2d9e17"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Answers backfilled per transaction, so that no transaction holds the row
+# locks of the whole table.
+BATCH_SIZE = 10_000
+
+
+def upgrade() -> None:
+    op.add_column("answer", sa.Column("mask", sa.SmallInteger(), nullable=True))
+    connection = op.get_bind()
+    # Options that aren't in the question any more have no bit, the mask would
+    # silently lose them.
+    unmatched = connection.execute(
+        sa.text(
+            """
+            SELECT answer.submission_id, answer.index, answer.options
+            FROM answer
+            JOIN submission ON submission.id = answer.submission_id
+            LEFT JOIN question
+                ON question.quiz_id = submission.quiz_id
+                AND question.index = answer.index
+            WHERE question.id IS NULL OR NOT answer.options <@ question.options
+            ORDER BY answer.submission_id, answer.index
+            LIMIT 20
+            """
+        )
+    ).all()
+    if unmatched:
+        raise RuntimeError(
+            "Answers with options their question doesn't have, fix or delete "
+            "them before migrating: "
+            + ", ".join(
+                f"submission {submission_id} answer {index} {options}"
+                for submission_id, index, options in unmatched
+            )
+        )
+
+    with op.get_context().autocommit_block():
+        first, last = connection.execute(
+            sa.text("SELECT min(id), max(id) FROM answer")
+        ).one()
+        # Bit i stands for options[i] of the question answered, found through
+        # the submission's quiz and the answer's index.
+        for start in range(first or 0, (last or 0) + 1, BATCH_SIZE):
+            connection.execute(
+                sa.text(
+                    """
+                    UPDATE answer
+                    SET mask = coalesce(
+                        (
+                            SELECT sum(
+                                1 << (array_position(question.options, chosen) - 1)
+                            )
+                            FROM unnest(answer.options) AS chosen
+                        ),
+                        0
+                    )
+                    FROM submission, question
+                    WHERE submission.id = answer.submission_id
+                    AND question.quiz_id = submission.quiz_id
+                    AND question.index = answer.index
+                    AND answer.id >= :start AND answer.id < :end
+                    AND answer.mask IS NULL
+                    """
+                ),
+                {"start": start, "end": start + BATCH_SIZE},
+            )
+        # SET NOT NULL alone scans the table under an ACCESS EXCLUSIVE lock.
+        # Validating a check first only blocks schema changes, and lets SET NOT
+        # NULL skip the scan.
+        op.execute(
+            "ALTER TABLE answer ADD CONSTRAINT answer_mask_not_null "
+            "CHECK (mask IS NOT NULL) NOT VALID"
+        )
+        op.execute("ALTER TABLE answer VALIDATE CONSTRAINT answer_mask_not_null")
+        op.alter_column("answer", "mask", nullable=False)
+        op.drop_constraint("answer_mask_not_null", "answer", type_="check")
+    op.drop_column("answer", "options")
+
+
+def downgrade() -> None:
+    op.add_column(
+        "answer",
+        sa.Column("options", postgresql.ARRAY(sa.String()), nullable=True),
+    )
+    op.execute(
+        """
+        UPDATE answer
+        SET options = ARRAY(
+            SELECT question.options[i]
+            FROM generate_subscripts(question.options, 1) AS i
+            WHERE answer.mask & (1 << (i - 1)) <> 0
+            ORDER BY question.options[i]
+        )
+        FROM submission, question
+        WHERE submission.id = answer.submission_id
+        AND question.quiz_id = submission.quiz_id
+        AND question.index = answer.index
+        """
+    )
+    op.alter_column("answer", "options", nullable=False)
+    op.drop_column("answer", "mask")
@@ -0,0 +1,85 @@
+"""inline submission answers
+
+Revision ID: e81f5a3c6b92
+Revises: c7d41e9a05b3
+Create Date: 2026-10-17 21:18:04.365920
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "e81f5a3c6b92"
+down_revision: Union[str, None] = "c7d41e9a05b3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "submission",
+        sa.Column(
+            "answer_masks",
+            postgresql.ARRAY(sa.SmallInteger()),
+            server_default="{}",
+            nullable=False,
+        ),
+    )
+    op.add_column(
+        "submission",
+        sa.Column(
+            "answer_scores",
+            postgresql.ARRAY(sa.Float()),
+            server_default="{}",
+            nullable=False,
+        ),
+    )
+    op.execute(
+        """
+        UPDATE submission
+        SET answer_masks = answers.masks, answer_scores = answers.scores
+        FROM (
+            SELECT
+                submission_id,
+                array_agg(mask ORDER BY index) AS masks,
+                array_agg(score ORDER BY index) AS scores
+            FROM answer
+            GROUP BY submission_id
+        ) AS answers
+        WHERE submission.id = answers.submission_id
+        """
+    )
+    op.drop_table("answer")
+
+
+def downgrade() -> None:
+    op.create_table(
+        "answer",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("submission_id", sa.String(), nullable=False),
+        sa.Column("index", sa.Integer(), nullable=False),
+        sa.Column("mask", sa.SmallInteger(), nullable=False),
+        sa.Column("score", sa.Float(), nullable=True),
+        sa.ForeignKeyConstraint(
+            ["submission_id"],
+            ["submission.id"],
+        ),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint(
+            "submission_id", "index", name="answer_submission_id_index_key"
+        ),
+    )
+    op.execute(
+        """
+        INSERT INTO answer (submission_id, index, mask, score)
+        SELECT submission.id, answers.index - 1, answers.mask, answers.score
+        FROM submission, unnest(submission.answer_masks, submission.answer_scores)
+            WITH ORDINALITY AS answers (mask, score, index)
+        """
+    )
+    op.drop_column("submission", "answer_scores")
+    op.drop_column("submission", "answer_masks")
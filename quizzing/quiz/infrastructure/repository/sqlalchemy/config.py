@@ -2,20 +2,69 @@ import os
 import urllib.parse as urlparse
 
 from sqlalchemy import Engine, MetaData, create_engine
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+
+from quizzing.pkg.db.pool import (
+    InstrumentedAsyncAdaptedQueuePool,
+    InstrumentedQueuePool,
+    instrument_pool,
+)
 
 _engine: Engine | None = None
+_async_engine: AsyncEngine | None = None
 
 _encoded_password = urlparse.quote(os.environ["DB_PASSWORD"])
-QUIZZING_QUIZ_DB_URL = f"postgresql://{os.environ['DB_USERNAME']}:{_encoded_password}@{os.environ['DB_HOST']}:{os.environ['DB_PORT']}/{os.environ['DB_NAME']}"
+_db_location = f"{os.environ['DB_USERNAME']}:{_encoded_password}@{os.environ['DB_HOST']}:{os.environ['DB_PORT']}/{os.environ['DB_NAME']}"
+QUIZZING_QUIZ_DB_URL = f"postgresql://{_db_location}"
+QUIZZING_QUIZ_ASYNC_DB_URL = f"postgresql+asyncpg://{_db_location}"
+
+# Every worker process has its own pool, so the database sees up to
+# workers * (DB_POOL_SIZE + DB_MAX_OVERFLOW) connections.
+DB_POOL_SIZE = int(os.environ.get("DB_POOL_SIZE", 5))
+DB_MAX_OVERFLOW = int(os.environ.get("DB_MAX_OVERFLOW", 10))
+DB_POOL_TIMEOUT = float(os.environ.get("DB_POOL_TIMEOUT", 30))
+DB_POOL_RECYCLE = int(os.environ.get("DB_POOL_RECYCLE", -1))
+DB_POOL_PRE_PING = bool(int(os.environ.get("DB_POOL_PRE_PING", 0)))
+
+
+def _pool_options() -> dict:
+    return {
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_timeout": DB_POOL_TIMEOUT,
+        "pool_recycle": DB_POOL_RECYCLE,
+        "pool_pre_ping": DB_POOL_PRE_PING,
+    }
+
+
+def _pool_capacity() -> int | None:
+    if DB_POOL_SIZE == 0 or DB_MAX_OVERFLOW < 0:
+        return None
+    return DB_POOL_SIZE + DB_MAX_OVERFLOW
 
 
 def get_engine():
     global _engine
     if _engine is None:
-        _engine = create_engine(QUIZZING_QUIZ_DB_URL)
+        _engine = create_engine(
+            QUIZZING_QUIZ_DB_URL, poolclass=InstrumentedQueuePool, **_pool_options()
+        )
+        instrument_pool(_engine, _pool_capacity())
     return _engine
 
 
+def get_async_engine():
+    global _async_engine
+    if _async_engine is None:
+        _async_engine = create_async_engine(
+            QUIZZING_QUIZ_ASYNC_DB_URL,
+            poolclass=InstrumentedAsyncAdaptedQueuePool,
+            **_pool_options(),
+        )
+        instrument_pool(_async_engine, _pool_capacity())
+    return _async_engine
+
+
 metadata: MetaData | None = None
 
 
@@ -3,7 +3,9 @@ from sqlalchemy import (
     Enum,
     Float,
     ForeignKey,
+    Index,
     Integer,
+    SmallInteger,
     String,
     Table,
     UniqueConstraint,
@@ -27,6 +29,10 @@ quiz_table = Table(
     Column("title", String, nullable=False),
     Column("author_id", String, ForeignKey("author.id"), nullable=False),
     Column("status", Enum("draft", "published", name="quiz_status")),
+    Column("version", Integer, nullable=False, server_default="1"),
+    Index("ix_quiz_author_id_id", "author_id", "id"),
+    Index("ix_quiz_author_id_status_id", "author_id", "status", "id"),
+    Index("ix_quiz_status_id", "status", "id"),
 )
 
 question_table = Table(
@@ -38,6 +44,7 @@ question_table = Table(
     Column("text", String, nullable=False),
     Column("options", ARRAY(String), nullable=False),
     Column("correct_options", ARRAY(String), nullable=False),
+    UniqueConstraint("quiz_id", "index"),
 )
 
 submission_table = Table(
@@ -48,15 +55,12 @@ submission_table = Table(
     Column("author_id", String, ForeignKey("author.id"), nullable=False),
     Column("status", Enum("in_progress", "completed", name="submission_status")),
     Column("score", Float, nullable=True),
+    Column("version", Integer, nullable=False, server_default="1"),
+    # The answers, in question order. Bit i of a mask is set when options[i] of
+    # the question was chosen, scores are NULL until the submission is completed.
+    Column("answer_masks", ARRAY(SmallInteger), nullable=False, server_default="{}"),
+    Column("answer_scores", ARRAY(Float), nullable=False, server_default="{}"),
     UniqueConstraint("quiz_id", "author_id"),
-)
-
-answer_table = Table(
-    "answer",
-    get_metadata(),
-    Column("id", Integer, primary_key=True, autoincrement=True),
-    Column("submission_id", String, ForeignKey("submission.id"), nullable=False),
-    Column("index", Integer, nullable=False),
-    Column("options", ARRAY(String), nullable=False),
-    Column("score", Float, nullable=True),
+    Index("ix_submission_author_id", "author_id"),
+    Index("ix_submission_quiz_id_id", "quiz_id", "id"),
 )
@@ -1,6 +1,5 @@
-from typing import Sequence
-
-from sqlalchemy import delete, insert, select, update
+from sqlalchemy import Column, Select, Table, and_, delete, or_, select
+from sqlalchemy.dialects.postgresql import Insert, insert
 from sqlalchemy.engine.row import Row
 
 from quizzing.pkg.db.sqlalchemy import SQLATransaction, SQLATransactionManager
@@ -15,17 +14,86 @@ from quizzing.quiz.domain.entities.quiz import (
 )
 from quizzing.quiz.domain.entities.submission import Answer, Submission, SubmissionID
 from quizzing.quiz.domain.exceptions import NotFound
+from quizzing.quiz.infrastructure.repository.exceptions import ConcurrentSave
 
-from .models import (
-    answer_table,
-    author_table,
-    question_table,
-    quiz_table,
-    submission_table,
-)
+from .models import author_table, question_table, quiz_table, submission_table
+
+
+def _upsert_changed(stmt: Insert, keys: list[str], columns: list[str]) -> Insert:
+    """Turns a multi-row INSERT of child rows into an upsert on `keys` that only
+    rewrites the rows where one of `columns` actually changed."""
+    table = stmt.table
+    return stmt.on_conflict_do_update(
+        index_elements=[table.c[k] for k in keys],
+        set_={c: stmt.excluded[c] for c in columns},
+        where=or_(*(table.c[c].is_distinct_from(stmt.excluded[c]) for c in columns)),
+    )
+
+
+def _upsert_versioned(stmt: Insert, columns: list[str]) -> Insert:
+    """Turns a multi-row INSERT of versioned rows, each carrying the version it
+    is saved as, into an upsert that only overwrites the rows still at the
+    version before it. Returns the (id, version) of the rows written; rows whose
+    stored version was different are missing."""
+    table = stmt.table
+    set_ = {c: stmt.excluded[c] for c in columns}
+    set_["version"] = stmt.excluded.version
+    return stmt.on_conflict_do_update(
+        index_elements=[table.c.id],
+        set_=set_,
+        where=table.c.version == stmt.excluded.version - 1,
+    ).returning(table.c.id, table.c.version)
+
+
+def _flush_order(table: Table) -> int:
+    """Position of `table` when sorted by foreign key dependency, so the rows
+    other rows reference are flushed first."""
+    return table.metadata.sorted_tables.index(table)
+
+
+def _is_current(
+    tx: SQLATransaction, entity: Quiz | Submission, table: Table, for_update: bool
+) -> bool:
+    """Whether `entity`, found in the identity map, can be returned as is.
+
+    Reads always can. Reads for update first lock the row if this transaction
+    hasn't yet, which only costs a reload when the row changed since the entity
+    was read."""
+    if not for_update:
+        return True
+    # A pending entity isn't in the database yet, flushing it also locks it.
+    tx.flush()
+    if tx.identity_map.is_locked(type(entity), entity.id):
+        return True
+    stmt = select(table.c.version).where(table.c.id == entity.id).with_for_update()
+    if tx.session.execute(stmt).scalar_one_or_none() != entity.version:
+        return False
+    tx.identity_map.add(entity, locked=True)
+    return True
+
+
+def _paginate(
+    stmt: Select,
+    key: Column,
+    page: int | None,
+    page_size: int | None,
+    after: str | None,
+) -> Select:
+    """Limits `stmt`, ordered by `key`, to one page. Pages that start after a
+    known key are fetched with a keyset condition instead of an OFFSET, so deep
+    pages cost the same as the first one."""
+    if page_size is None:
+        return stmt
+    if after is not None:
+        stmt = stmt.where(key > after)
+    elif page is not None:
+        stmt = stmt.offset((page - 1) * page_size)
+    return stmt.limit(page_size)
 
 
 class SQLAQuizRepository:
+    flush_order = _flush_order(quiz_table)
+
     def __init__(self, manager: SQLATransactionManager) -> None:
         self._manager = manager
 
@@ -33,76 +101,134 @@ class SQLAQuizRepository:
         return self._manager.transaction()
 
     def get(self, quiz_id: str) -> "Quiz":
+        return self._get(quiz_id, for_update=False)
+
+    def get_for_update(self, quiz_id: str) -> "Quiz":
+        """Same as `get`, also locking the quiz row until the transaction ends."""
+        return self._get(quiz_id, for_update=True)
+
+    def _get(self, quiz_id: str, for_update: bool) -> "Quiz":
         with self.transaction() as tx:
+            quiz = tx.identity_map.get(Quiz, quiz_id)
+            if quiz is not None and _is_current(tx, quiz, quiz_table, for_update):
+                return quiz
             stmt = select(quiz_table).where(quiz_table.c.id == quiz_id)
+            if for_update:
+                stmt = stmt.with_for_update()
             quiz = tx.session.execute(stmt).one_or_none()
             if quiz is None:
                 raise NotFound(f"Quiz {quiz_id} not found")
             quiz = self._quiz_from_row(quiz)
-            stmt = select(question_table).where(question_table.c.quiz_id == quiz_id)
+            stmt = (
+                select(question_table)
+                .where(question_table.c.quiz_id == quiz_id)
+                .order_by(question_table.c.index)
+            )
             questions = [
                 self._question_from_row(r) for r in tx.session.execute(stmt).all()
             ]
             quiz.questions = questions
+            tx.identity_map.add(quiz, locked=for_update)
             return quiz
 
     def save(self, quiz: "Quiz") -> None:
         with self.transaction() as tx:
-            stmts = []
-            try:
-                self.get(quiz.id)
-                stmts.append(
-                    update(quiz_table)
-                    .where(quiz_table.c.id == quiz.id)
-                    .values(
-                        title=quiz.title,
-                        author_id=quiz.author_id,
-                        status=quiz.status.value,
-                    )
-                )
-                stmts.append(
-                    delete(question_table).where(question_table.c.quiz_id == quiz.id)
-                )
-            except NotFound:
-                stmts.append(
-                    insert(quiz_table).values(
-                        id=quiz.id,
-                        title=quiz.title,
-                        author_id=quiz.author_id,
-                        status=quiz.status.value,
+            tx.identity_map.add(quiz)
+            tx.unit_of_work.register(self, quiz)
+
+    def flush(self, quizzes: list["Quiz"]) -> None:
+        """Writes the quizzes saved since the last flush, raising ConcurrentSave
+        when one of them was saved concurrently since it was read."""
+        with self.transaction() as tx:
+            existing = [quiz for quiz in quizzes if quiz.version > 0]
+            stmt = insert(quiz_table).values(
+                [
+                    {
+                        "id": quiz.id,
+                        "title": quiz.title,
+                        "author_id": quiz.author_id,
+                        "status": quiz.status.value,
+                        "version": quiz.version + 1,
+                    }
+                    for quiz in quizzes
+                ]
+            )
+            stmt = _upsert_versioned(stmt, ["title", "author_id", "status"])
+            versions = dict(tx.session.execute(stmt).tuples().all())
+            for quiz in quizzes:
+                if quiz.id not in versions:
+                    raise ConcurrentSave(f"Quiz {quiz.id} was modified concurrently")
+                quiz.version = versions[quiz.id]
+                # Writing the row locked it until the transaction ends.
+                tx.identity_map.add(quiz, locked=True)
+            if existing:
+                tx.session.execute(
+                    delete(question_table).where(
+                        or_(
+                            *(
+                                and_(
+                                    question_table.c.quiz_id == quiz.id,
+                                    question_table.c.index >= len(quiz.questions),
+                                )
+                                for quiz in existing
+                            )
+                        )
                     )
                 )
-            for idx, question in enumerate(quiz.questions):
-                stmt = insert(question_table).values(
-                    quiz_id=quiz.id,
-                    index=idx,
-                    text=question.text,
-                    options=[str(o) for o in question.options],
-                    correct_options=[str(c) for c in question.correct_options],
+            rows = [
+                {
+                    "quiz_id": quiz.id,
+                    "index": idx,
+                    "text": question.text,
+                    "options": [str(o) for o in question.options],
+                    "correct_options": sorted(str(c) for c in question.correct_options),
+                }
+                for quiz in quizzes
+                for idx, question in enumerate(quiz.questions)
+            ]
+            if len(rows) == 0:
+                return
+            tx.session.execute(
+                _upsert_changed(
+                    insert(question_table).values(rows),
+                    ["quiz_id", "index"],
+                    ["text", "options", "correct_options"],
                 )
-                stmts.append(stmt)
-            for stmt in stmts:
-                tx.session.execute(stmt)
+            )
 
     def list(self, filter_: QuizFilter) -> list["Quiz"]:
         with self.transaction() as tx:
-            stmt = select(quiz_table)
+            tx.flush()
+            stmt = select(quiz_table).order_by(quiz_table.c.id)
             if filter_.status is not None:
                 stmt = stmt.where(quiz_table.c.status == filter_.status.value)
             if filter_.author_id is not None:
                 stmt = stmt.where(quiz_table.c.author_id == filter_.author_id)
-            if filter_.page is not None and filter_.page_size is not None:
-                stmt = stmt.offset((filter_.page - 1) * filter_.page_size).limit(
-                    filter_.page_size
-                )
+            stmt = _paginate(
+                stmt, quiz_table.c.id, filter_.page, filter_.page_size, filter_.after
+            )
 
-            quizzes = [self._quiz_from_row(r) for r in tx.session.execute(stmt).all()]
-            for quiz in quizzes:
-                stmt = select(question_table).where(question_table.c.quiz_id == quiz.id)
-                questions = tx.session.execute(stmt).all()
-                quiz.questions = [
-                    self._question_from_row(question) for question in questions
-                ]
+            quizzes, loaded = [], []
+            for row in tx.session.execute(stmt).all():
+                quiz = self._quiz_from_row(row)
+                mapped = tx.identity_map.merge(quiz)
+                if mapped is quiz:
+                    loaded.append(quiz)
+                quizzes.append(mapped)
+            if len(loaded) == 0:
+                return quizzes
+            stmt = (
+                select(question_table)
+                .where(question_table.c.quiz_id.in_([quiz.id for quiz in loaded]))
+                .order_by(question_table.c.quiz_id, question_table.c.index)
+            )
+            quiz_id_to_questions: dict[str, list[Question]] = {}
+            for row in tx.session.execute(stmt).all():
+                quiz_id_to_questions.setdefault(row.quiz_id, []).append(
+                    self._question_from_row(row)
+                )
+            for quiz in loaded:
+                quiz.questions = quiz_id_to_questions.get(quiz.id, [])
             return quizzes
 
     def _quiz_from_row(self, quiz: Row) -> "Quiz":
@@ -111,6 +237,7 @@ class SQLAQuizRepository:
             title=quiz.title,
             author_id=AuthorID(quiz.author_id),
             status=QuizStatus(quiz.status),
+            version=quiz.version,
         )
         return quiz_entity
 
@@ -124,6 +251,8 @@ class SQLAQuizRepository:
 
 
 class SQLASubmissionRepository:
+    flush_order = _flush_order(submission_table)
+
     def __init__(self, manager: SQLATransactionManager) -> None:
         self._manager = manager
 
@@ -131,126 +260,123 @@ class SQLASubmissionRepository:
         return self._manager.transaction()
 
     def by_quiz(
-        self, quiz_id: QuizID, page: int | None = None, page_size: int | None = None
+        self,
+        quiz_id: QuizID,
+        page: int | None = None,
+        page_size: int | None = None,
+        after: str | None = None,
     ) -> list["Submission"]:
         with self.transaction() as tx:
-            stmt = select(submission_table).where(submission_table.c.quiz_id == quiz_id)
-            if page is not None and page_size is not None:
-                stmt = stmt.offset((page - 1) * page_size).limit(page_size)
-            submissions = tx.session.execute(stmt).all()
-            stmt = select(answer_table).where(
-                answer_table.c.submission_id.in_([s.id for s in submissions])
+            tx.flush()
+            stmt = (
+                select(submission_table)
+                .where(submission_table.c.quiz_id == quiz_id)
+                .order_by(submission_table.c.id)
             )
-            answers = tx.session.execute(stmt).all()
-            submission_id_to_answers: dict[str, list[Row]] = {}
-            for row in answers:
-                submission_id_to_answers.setdefault(row.submission_id, []).append(row)
+            stmt = _paginate(stmt, submission_table.c.id, page, page_size, after)
+            submissions = tx.session.execute(stmt).all()
             return [
-                self._submission_from_row(
-                    submission, submission_id_to_answers[submission.id]
-                )
+                tx.identity_map.merge(self._submission_from_row(submission))
                 for submission in submissions
             ]
 
     def by_author(self, author_id: AuthorID) -> list["Submission"]:
         with self.transaction() as tx:
-            stmt = (
-                select(answer_table)
-                .join(
-                    submission_table,
-                    answer_table.c.submission_id == submission_table.c.id,
-                )
-                .where(submission_table.c.author_id == author_id)
-            )
-            answers = tx.session.execute(stmt).all()
-            submission_id_to_answers: dict[str, list[Row]] = {}
-            for row in answers:
-                submission_id_to_answers.setdefault(row.submission_id, []).append(row)
+            tx.flush()
             stmt = select(submission_table).where(
                 submission_table.c.author_id == author_id
             )
             submissions = tx.session.execute(stmt).all()
-
             return [
-                self._submission_from_row(s, submission_id_to_answers[s.id])
-                for s in submissions
+                tx.identity_map.merge(self._submission_from_row(submission))
+                for submission in submissions
             ]
 
     def save(self, submission: "Submission") -> None:
         with self.transaction() as tx:
-            stmts = []
-            try:
-                self.get(submission.id)
-                stmts.append(
-                    update(submission_table)
-                    .where(submission_table.c.id == submission.id)
-                    .values(
-                        status=submission.status.value,
-                        score=submission.score,
-                    )
-                )
-                stmts.append(
-                    delete(answer_table).where(
-                        answer_table.c.submission_id == submission.id
-                    )
-                )
-            except NotFound:
-                stmts.append(
-                    insert(submission_table).values(
-                        id=submission.id,
-                        quiz_id=submission.quiz_id,
-                        author_id=submission.author_id,
-                        status=submission.status.value,
-                        score=submission.score,
+            tx.identity_map.add(submission)
+            tx.unit_of_work.register(self, submission)
+
+    def flush(self, submissions: list["Submission"]) -> None:
+        """Writes the submissions saved since the last flush, raising
+        ConcurrentSave when one of them was saved concurrently since it was
+        read."""
+        with self.transaction() as tx:
+            stmt = insert(submission_table).values(
+                [
+                    {
+                        "id": submission.id,
+                        "quiz_id": submission.quiz_id,
+                        "author_id": submission.author_id,
+                        "status": submission.status.value,
+                        "score": submission.score,
+                        "version": submission.version + 1,
+                        "answer_masks": [a.mask for a in submission.answers],
+                        "answer_scores": [a.score for a in submission.answers],
+                    }
+                    for submission in submissions
+                ]
+            )
+            stmt = _upsert_versioned(
+                stmt, ["status", "score", "answer_masks", "answer_scores"]
+            )
+            versions = dict(tx.session.execute(stmt).tuples().all())
+            for submission in submissions:
+                if submission.id not in versions:
+                    raise ConcurrentSave(
+                        f"Submission {submission.id} was modified concurrently"
                     )
-                )
-            for idx, answer in enumerate(submission.answers):
-                stmt = insert(answer_table).values(
-                    submission_id=submission.id,
-                    index=idx,
-                    options=[str(o) for o in answer.options],
-                    score=answer.score,
-                )
-                stmts.append(stmt)
-            for stmt in stmts:
-                tx.session.execute(stmt)
+                submission.version = versions[submission.id]
+                tx.identity_map.add(submission, locked=True)
 
     def get(self, submission_id: str) -> "Submission":
+        return self._get(submission_id, for_update=False)
+
+    def get_for_update(self, submission_id: str) -> "Submission":
+        """Same as `get`, also locking the submission row until the transaction
+        ends."""
+        return self._get(submission_id, for_update=True)
+
+    def _get(self, submission_id: str, for_update: bool) -> "Submission":
         with self.transaction() as tx:
+            submission = tx.identity_map.get(Submission, submission_id)
+            if submission is not None and _is_current(
+                tx, submission, submission_table, for_update
+            ):
+                return submission
             stmt = select(submission_table).where(
                 submission_table.c.id == submission_id
             )
+            if for_update:
+                stmt = stmt.with_for_update()
             submission = tx.session.execute(stmt).one_or_none()
             if submission is None:
                 raise NotFound(f"Submission {submission_id} not found")
-            stmt = select(answer_table).where(
-                answer_table.c.submission_id == submission_id
-            )
-            answers = tx.session.execute(stmt).all()
-            return self._submission_from_row(submission, answers)
+            submission = self._submission_from_row(submission)
+            tx.identity_map.add(submission, locked=for_update)
+            return submission
 
-    def _submission_from_row(
-        self, submission: Row, answers: Sequence[Row]
-    ) -> "Submission":
+    def _submission_from_row(self, submission: Row) -> "Submission":
         submission_entity = Submission(
             id=SubmissionID(submission.id),
             quiz_id=QuizID(submission.quiz_id),
             author_id=AuthorID(submission.author_id),
             status=Submission.Status(submission.status),
-            answers=[self._answer_from_row(a) for a in answers],
+            answers=[
+                Answer(mask=mask, score=score)
+                for mask, score in zip(
+                    submission.answer_masks, submission.answer_scores
+                )
+            ],
             score=submission.score,
+            version=submission.version,
         )
         return submission_entity
 
-    def _answer_from_row(self, answer: Row) -> Answer:
-        answer_entity = Answer(
-            options={AnswerOption(o) for o in answer.options},
-            score=answer.score,
-        )
-        return answer_entity
-
 
 class SQLAAuthorRepository:
+    flush_order = _flush_order(author_table)
+
     def __init__(self, manager: SQLATransactionManager) -> None:
         self._manager = manager
 
@@ -259,6 +385,7 @@ class SQLAAuthorRepository:
 
     def by_email(self, email: str) -> Author:
         with self.transaction() as tx:
+            tx.flush()
             stmt = select(author_table).where(author_table.c.email == email)
             author = tx.session.execute(stmt).one_or_none()
             if author is None:
@@ -267,31 +394,42 @@ class SQLAAuthorRepository:
 
     def get(self, author_id: AuthorID) -> Author:
         with self.transaction() as tx:
+            author = tx.identity_map.get(Author, author_id)
+            if author is not None:
+                return author
             stmt = select(author_table).where(author_table.c.id == author_id)
-            author = tx.session.execute(stmt).one_or_none()
-            if author is None:
+            row = tx.session.execute(stmt).one_or_none()
+            if row is None:
                 raise NotFound(f"Author {author_id} not found")
-            return self._author_from_row(author)
+            author = self._author_from_row(row)
+            tx.identity_map.add(author)
+            return author
 
     def save(self, author: Author) -> None:
         with self.transaction() as tx:
-            try:
-                self.get(author.id)
-                stmt = (
-                    update(author_table)
-                    .where(author_table.c.id == author.id)
-                    .values(
-                        email=author.email,
-                        hashed_password=author.hashed_password,
-                    )
-                )
-            except NotFound:
-                stmt = insert(author_table).values(
-                    id=author.id,
-                    email=author.email,
-                    hashed_password=author.hashed_password,
-                )
-                tx.session.execute(stmt)
+            tx.identity_map.add(author)
+            tx.unit_of_work.register(self, author)
+
+    def flush(self, authors: list[Author]) -> None:
+        with self.transaction() as tx:
+            stmt = insert(author_table).values(
+                [
+                    {
+                        "id": author.id,
+                        "email": author.email,
+                        "hashed_password": author.hashed_password,
+                    }
+                    for author in authors
+                ]
+            )
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[author_table.c.id],
+                set_={
+                    "email": stmt.excluded.email,
+                    "hashed_password": stmt.excluded.hashed_password,
+                },
+            )
+            tx.session.execute(stmt)
 
     def _author_from_row(self, author: Row) -> Author:
         return Author(
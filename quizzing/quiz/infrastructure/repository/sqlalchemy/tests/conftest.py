@@ -0,0 +1,65 @@
+from typing import Any
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import Engine, create_engine, event, text
+
+
+@pytest.fixture(scope="session")
+def engine():
+    from quizzing.quiz.infrastructure.repository.sqlalchemy import models  # noqa
+    from quizzing.quiz.infrastructure.repository.sqlalchemy.config import (
+        QUIZZING_QUIZ_DB_URL,
+        get_metadata,
+    )
+
+    # Every test session works in its own schema, so the tests never touch the
+    # tables of the configured database.
+    schema = f"test_{uuid4().hex}"
+    engine = create_engine(
+        QUIZZING_QUIZ_DB_URL, connect_args={"options": f"-csearch_path={schema}"}
+    )
+    with engine.begin() as connection:
+        connection.execute(text(f"CREATE SCHEMA {schema}"))
+        get_metadata().create_all(connection)
+    yield engine
+    with engine.begin() as connection:
+        connection.execute(text(f"DROP SCHEMA {schema} CASCADE"))
+    engine.dispose()
+
+
+@pytest.fixture
+def manager(engine: Engine):
+    from quizzing.pkg.db.sqlalchemy import SQLATransactionManager
+    from quizzing.quiz.infrastructure.repository.sqlalchemy.config import get_metadata
+
+    yield SQLATransactionManager(engine)
+    tables = ", ".join(t.name for t in get_metadata().sorted_tables)
+    with engine.begin() as connection:
+        connection.execute(text(f"TRUNCATE {tables} CASCADE"))
+
+
+@pytest.fixture
+def statements(engine: Engine):
+    """Collects the SQL statements sent to the database during a test."""
+    executed: list[str] = []
+
+    def before_cursor_execute(conn, cursor, statement, *args):
+        executed.append(statement)
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    yield executed
+    event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
+@pytest.fixture
+def queries(engine: Engine):
+    """Collects the (statement, parameters) pairs sent to the database."""
+    executed: list[tuple[str, Any]] = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, *args):
+        executed.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    yield executed
+    event.remove(engine, "before_cursor_execute", before_cursor_execute)
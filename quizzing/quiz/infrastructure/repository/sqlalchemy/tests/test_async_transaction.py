@@ -0,0 +1,129 @@
+import asyncio
+import os
+
+import pytest
+
+if "DB_HOST" not in os.environ:
+    pytest.skip(
+        "requires a PostgreSQL database configured through the DB_* variables",
+        allow_module_level=True,
+    )
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool
+
+from quizzing.pkg.cache import LRUCache
+from quizzing.pkg.db.sqlalchemy import AsyncSQLATransactionManager
+from quizzing.pkg.transactional import IsolationLevel
+from quizzing.quiz.application.auth import AsyncAuthorService
+from quizzing.quiz.application.submission import AsyncSubmissionService
+from quizzing.quiz.domain.entities.author import Author
+from quizzing.quiz.domain.entities.quiz import AnswerOption, Question, Quiz
+from quizzing.quiz.domain.exceptions import AuthorExists, NotFound
+from quizzing.quiz.domain.registry import DomainRegistry
+from quizzing.quiz.infrastructure.repository.sqlalchemy.config import (
+    QUIZZING_QUIZ_ASYNC_DB_URL,
+)
+from quizzing.quiz.infrastructure.repository.sqlalchemy.repository import (
+    SQLAAuthorRepository,
+    SQLAQuizRepository,
+    SQLASubmissionRepository,
+)
+
+
+@pytest.fixture
+def async_manager(engine, manager):
+    with engine.connect() as connection:
+        schema = connection.execute(text("SELECT current_schema()")).scalar()
+    # Every test runs its own event loop, so connections can't be pooled.
+    async_engine = create_async_engine(
+        QUIZZING_QUIZ_ASYNC_DB_URL,
+        connect_args={"server_settings": {"search_path": schema}},
+        poolclass=NullPool,
+    )
+    DomainRegistry.initialize(
+        SQLAQuizRepository(manager),
+        SQLASubmissionRepository(manager),
+        SQLAAuthorRepository(manager),
+    )
+    yield AsyncSQLATransactionManager(async_engine, manager)
+
+
+def test_async_service_runs_nested_calls_in_one_transaction(async_manager):
+    service = AsyncAuthorService(async_manager)
+
+    async def run() -> Author:
+        await service.create("author@example.com", "hashed")
+        with pytest.raises(AuthorExists):
+            await service.create("author@example.com", "hashed")
+        return await service.by_email("author@example.com")
+
+    assert asyncio.run(run()).hashed_password == "hashed"
+
+
+def test_async_transaction_rolls_back(async_manager):
+    service = AsyncAuthorService(async_manager)
+
+    def create_and_fail():
+        DomainRegistry.authors.save(
+            Author.with_hashed_password("author@example.com", "hashed")
+        )
+        raise RuntimeError()
+
+    async def run() -> None:
+        with pytest.raises(RuntimeError):
+            async with async_manager.transaction(IsolationLevel.SERIALIZABLE) as tx:
+                await tx.run_sync(create_and_fail)
+        assert not async_manager.in_transaction()
+        with pytest.raises(NotFound):
+            await service.by_email("author@example.com")
+
+    asyncio.run(run())
+
+
+def test_async_service_invalidates_its_cache_once_committed(async_manager):
+    cache: LRUCache = LRUCache(max_size=10)
+    service = AsyncAuthorService(async_manager, cache)
+    stale = Author.with_hashed_password("author@example.com", "stale")
+
+    async def create() -> None:
+        async with async_manager.transaction() as tx:
+
+            def create_and_check():
+                service.create("author@example.com", "hashed")
+                assert cache.get("author@example.com") is stale
+
+            await tx.run_sync(create_and_check)
+
+    cache.put("author@example.com", stale)
+    asyncio.run(create())
+    assert cache.get("author@example.com") is None
+
+
+def test_async_submission_is_loaded_with_its_quiz_in_one_transaction(
+    async_manager, monkeypatch
+):
+    author = Author.with_hashed_password("author@example.com", "hashed")
+    DomainRegistry.authors.save(author)
+    quiz = Quiz.new("Quiz", author.id)
+    options = [AnswerOption("A"), AnswerOption("B")]
+    quiz.set_questions([Question("Question", options, {options[0]})])
+    quiz.publish()
+    DomainRegistry.quizzes.save(quiz)
+    service = AsyncSubmissionService(async_manager)
+    transaction = async_manager.transaction
+    transactions = []
+
+    def counted_transaction(*args):
+        transactions.append(args)
+        return transaction(*args)
+
+    monkeypatch.setattr(async_manager, "transaction", counted_transaction)
+    submission, answered = asyncio.run(
+        service.with_quiz(service.start, author, quiz.id)
+    )
+
+    assert len(transactions) == 1
+    assert submission.quiz_id == answered.id == quiz.id
+    assert DomainRegistry.submissions.get(submission.id).version == 1
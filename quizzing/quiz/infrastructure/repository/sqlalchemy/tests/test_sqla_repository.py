@@ -0,0 +1,440 @@
+import os
+
+import pytest
+
+if "DB_HOST" not in os.environ:
+    pytest.skip(
+        "requires a PostgreSQL database configured through the DB_* variables",
+        allow_module_level=True,
+    )
+
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from quizzing.pkg.db.instrumentation import assert_max_queries, instrument
+from quizzing.pkg.db.sqlalchemy import SQLATransactionManager
+from quizzing.quiz.application.quiz import QuizService
+from quizzing.quiz.domain.dto import QuizFilter
+from quizzing.quiz.domain.entities.author import Author, AuthorID
+from quizzing.quiz.domain.entities.quiz import AnswerOption, Question, Quiz, QuizStatus
+from quizzing.quiz.domain.entities.submission import Answer, Submission, SubmissionID
+from quizzing.quiz.domain.exceptions import VersionConflict
+from quizzing.quiz.domain.registry import DomainRegistry
+from quizzing.quiz.infrastructure.repository.exceptions import ConcurrentSave
+from quizzing.quiz.infrastructure.repository.sqlalchemy.repository import (
+    SQLAAuthorRepository,
+    SQLAQuizRepository,
+    SQLASubmissionRepository,
+)
+
+
+@pytest.fixture
+def author(manager) -> Author:
+    author = Author(AuthorID("author1"), "author1@example.com", "hashed")
+    SQLAAuthorRepository(manager).save(author)
+    return author
+
+
+def make_quiz(author: Author, title: str, n_questions: int) -> Quiz:
+    quiz = Quiz.new(title, author.id)
+    quiz.set_questions(
+        [
+            Question(
+                f"{title} question {i}",
+                [AnswerOption("A"), AnswerOption("B"), AnswerOption("C")],
+                {AnswerOption("A")},
+            )
+            for i in range(n_questions)
+        ]
+    )
+    quiz.status = QuizStatus.PUBLISHED
+    return quiz
+
+
+def test_submissions_by_author_load_answers_in_one_query(manager, author, engine):
+    instrument(engine)
+    quizzes = SQLAQuizRepository(manager)
+    repository = SQLASubmissionRepository(manager)
+    for n in range(5):
+        quiz = make_quiz(author, f"Quiz {n}", 3)
+        quizzes.save(quiz)
+        repository.save(
+            Submission(
+                SubmissionID(f"submission{n}"),
+                quiz.id,
+                author.id,
+                Submission.Status.IN_PROGRESS,
+                [Answer.empty() for _ in quiz.questions],
+                None,
+            )
+        )
+
+    with assert_max_queries(1):
+        loaded = repository.by_author(author.id)
+
+    assert [len(s.answers) for s in loaded] == [3] * 5
+
+
+def test_quiz_get_keeps_question_order(manager, author):
+    repository = SQLAQuizRepository(manager)
+    quiz = make_quiz(author, "Quiz", 5)
+    repository.save(quiz)
+
+    loaded = repository.get(quiz.id)
+
+    assert [q.text for q in loaded.questions] == [q.text for q in quiz.questions]
+
+
+def test_quiz_list_loads_questions_in_one_query(manager, author, statements):
+    repository = SQLAQuizRepository(manager)
+    quizzes = [make_quiz(author, f"Quiz {i}", i + 1) for i in range(5)]
+    for quiz in quizzes:
+        repository.save(quiz)
+    statements.clear()
+
+    loaded = repository.list(QuizFilter(author_id=author.id, page_size=100))
+
+    assert len(statements) == 2
+    texts = {quiz.id: [q.text for q in quiz.questions] for quiz in quizzes}
+    assert {quiz.id: [q.text for q in quiz.questions] for quiz in loaded} == texts
+
+
+def test_quiz_list_keyset_pages_match_offset_pages(manager, author):
+    repository = SQLAQuizRepository(manager)
+    for i in range(7):
+        repository.save(make_quiz(author, f"Quiz {i}", 1))
+
+    offset_pages, keyset_pages = [], []
+    after = None
+    for page in range(1, 4):
+        offset_page = repository.list(QuizFilter(page=page, page_size=3))
+        keyset_page = repository.list(QuizFilter(page_size=3, after=after))
+        offset_pages.append([quiz.id for quiz in offset_page])
+        keyset_pages.append([quiz.id for quiz in keyset_page])
+        after = keyset_page[-1].id
+
+    assert [len(page) for page in keyset_pages] == [3, 3, 1]
+    assert keyset_pages == offset_pages
+
+
+def test_quiz_save_removes_dropped_questions(manager, author):
+    repository = SQLAQuizRepository(manager)
+    quiz = make_quiz(author, "Quiz", 5)
+    repository.save(quiz)
+
+    quiz.questions = quiz.questions[:2]
+    repository.save(quiz)
+
+    assert [q.text for q in repository.get(quiz.id).questions] == [
+        q.text for q in quiz.questions
+    ]
+
+
+def test_submission_answers_are_a_single_row(manager, author, statements):
+    quiz = make_quiz(author, "Quiz", 3)
+    SQLAQuizRepository(manager).save(quiz)
+    repository = SQLASubmissionRepository(manager)
+    submission = Submission(
+        SubmissionID("submission1"),
+        quiz.id,
+        author.id,
+        Submission.Status.IN_PROGRESS,
+        [Answer.empty() for _ in quiz.questions],
+        None,
+    )
+    repository.save(submission)
+    statements.clear()
+
+    submission.answers[1] = Answer(0b10)
+    repository.save(submission)
+    assert len(statements) == 1
+
+    submission.answers = [Answer(0b01, 1.0), Answer(0b10, -1.0), Answer(0, 0)]
+    submission.status = Submission.Status.COMPLETED
+    submission.score = 0.0
+    repository.save(submission)
+    statements.clear()
+
+    stored = repository.get(submission.id)
+    assert len(statements) == 1
+    assert [(a.mask, a.score) for a in stored.answers] == [
+        (0b01, 1.0),
+        (0b10, -1.0),
+        (0, 0.0),
+    ]
+
+
+def test_save_rejects_stale_versions(manager, author):
+    repository = SQLAQuizRepository(manager)
+    quiz = make_quiz(author, "Quiz", 1)
+    repository.save(quiz)
+    assert quiz.version == 1
+    stale = repository.get(quiz.id)
+
+    quiz.title = "Edited"
+    repository.save(quiz)
+    stale.title = "Overwritten"
+
+    assert quiz.version == 2
+    with pytest.raises(VersionConflict):
+        repository.save(stale)
+    with pytest.raises(VersionConflict):
+        repository.save(Quiz(quiz.id, "Duplicate", author.id, QuizStatus.DRAFT))
+    assert repository.get(quiz.id).title == "Edited"
+
+
+def test_get_for_update_locks_the_row(manager, author, engine):
+    quiz = make_quiz(author, "Quiz", 1)
+    repository = SQLAQuizRepository(manager)
+    repository.save(quiz)
+
+    with manager.transaction():
+        assert repository.get_for_update(quiz.id).title == "Quiz"
+        with engine.connect() as other:
+            with pytest.raises(OperationalError, match="could not obtain lock"):
+                other.execute(
+                    text("SELECT id FROM quiz WHERE id = :id FOR UPDATE NOWAIT"),
+                    {"id": quiz.id},
+                )
+    with engine.connect() as other:
+        other.execute(
+            text("SELECT id FROM quiz WHERE id = :id FOR UPDATE NOWAIT"),
+            {"id": quiz.id},
+        )
+
+
+def test_reads_within_a_transaction_share_one_instance(manager, author, statements):
+    repository = SQLAQuizRepository(manager)
+    quiz = make_quiz(author, "Quiz", 2)
+    repository.save(quiz)
+    statements.clear()
+
+    with manager.transaction():
+        loaded = repository.get(quiz.id)
+        assert repository.get(quiz.id) is loaded
+        assert repository.list(QuizFilter(author_id=author.id)) == [loaded]
+        assert len(statements) == 3
+        assert repository.get_for_update(quiz.id) is loaded
+        assert len(statements) == 4
+        assert repository.get_for_update(quiz.id) is loaded
+        assert len(statements) == 4
+    assert repository.get(quiz.id) is not loaded
+
+
+def test_saving_a_new_entity_skips_removing_child_rows(manager, author, statements):
+    repository = SQLAQuizRepository(manager)
+    quiz = make_quiz(author, "Quiz", 2)
+
+    with manager.transaction():
+        repository.save(quiz)
+        assert repository.get(quiz.id) is quiz
+
+    assert not any(s.startswith("DELETE") for s in statements)
+    assert len(statements) == 2
+
+
+def test_saves_are_flushed_in_batches_at_commit(manager, author, statements):
+    quizzes = SQLAQuizRepository(manager)
+    quiz = make_quiz(author, "Quiz", 3)
+    quizzes.save(quiz)
+    repository = SQLASubmissionRepository(manager)
+    submissions = []
+    for n in range(3):
+        other = Author(AuthorID(f"author{n}"), f"author{n}@example.com", "hashed")
+        SQLAAuthorRepository(manager).save(other)
+        submissions.append(
+            Submission(
+                SubmissionID(f"submission{n}"),
+                quiz.id,
+                other.id,
+                Submission.Status.IN_PROGRESS,
+                [Answer.empty() for _ in quiz.questions],
+                None,
+            )
+        )
+    statements.clear()
+
+    with manager.transaction():
+        for submission in submissions:
+            repository.save(submission)
+        assert statements == []
+
+    assert len(statements) == 1
+    assert [s.version for s in submissions] == [1, 1, 1]
+    assert [len(s.answers) for s in repository.by_quiz(quiz.id)] == [3, 3, 3]
+
+
+def test_queries_see_pending_saves(manager, author):
+    repository = SQLAQuizRepository(manager)
+    quiz = make_quiz(author, "Quiz", 1)
+
+    with manager.transaction():
+        repository.save(quiz)
+        assert repository.list(QuizFilter(author_id=author.id)) == [quiz]
+        assert quiz.version == 1
+
+
+def test_flush_conflicts_roll_back_the_transaction(manager, author):
+    repository = SQLAQuizRepository(manager)
+    quiz = make_quiz(author, "Quiz", 1)
+    repository.save(quiz)
+    stale = repository.get(quiz.id)
+    repository.save(quiz)
+
+    with pytest.raises(VersionConflict):
+        with manager.transaction():
+            repository.save(make_quiz(author, "Other", 1))
+            stale.title = "Overwritten"
+            repository.save(stale)
+    assert not manager.in_transaction()
+    assert [
+        (q.id, q.title) for q in repository.list(QuizFilter(author_id=author.id))
+    ] == [(quiz.id, "Quiz")]
+
+
+def test_saves_losing_a_race_are_retried(manager, author, engine):
+    concurrent = SQLAQuizRepository(SQLATransactionManager(engine))
+
+    class RacingQuizRepository(SQLAQuizRepository):
+        races = 0
+
+        def get(self, quiz_id: str) -> Quiz:
+            quiz = super().get(quiz_id)
+            if self.races > 0:
+                # Someone else saves the quiz between our read and our save.
+                self.races -= 1
+                concurrent.save(concurrent.get(quiz_id))
+            return quiz
+
+    repository = RacingQuizRepository(manager)
+    DomainRegistry.initialize(
+        repository, SQLASubmissionRepository(manager), SQLAAuthorRepository(manager)
+    )
+    service = QuizService(manager)
+    quiz = make_quiz(author, "Quiz", 1)
+    quiz.status = QuizStatus.DRAFT
+    repository.save(quiz)
+    before = QuizService.edit.stats.snapshot()
+
+    repository.races = 1
+    edited = service.edit(author, quiz.id, "Edited", quiz.questions)
+
+    assert QuizService.edit.stats.snapshot()["retries"] == before["retries"] + 1
+    assert (edited.title, edited.version) == ("Edited", 3)
+    # The retry reads the concurrent save, so a write of the version read before
+    # it is a plain conflict, not retried again.
+    repository.races = 1
+    with pytest.raises(VersionConflict) as conflict:
+        service.edit(author, quiz.id, "Stale", quiz.questions, edited.version)
+    assert not isinstance(conflict.value, ConcurrentSave)
+    assert QuizService.edit.stats.snapshot()["retries"] == before["retries"] + 2
+    assert repository.get(quiz.id).title == "Edited"
+
+
+def test_after_commit_callbacks_run_once_the_commit_is_visible(manager, author, engine):
+    repository = SQLAQuizRepository(manager)
+    committed_titles: list = []
+
+    def read_committed_titles():
+        with engine.connect() as connection:
+            committed_titles.append(
+                connection.execute(text("SELECT title FROM quiz")).scalars().all()
+            )
+
+    with manager.transaction():
+        repository.save(make_quiz(author, "Quiz", 1))
+        manager.after_commit(read_committed_titles)
+        assert committed_titles == []
+    assert committed_titles == [["Quiz"]]
+
+    with pytest.raises(RuntimeError):
+        with manager.transaction():
+            manager.after_commit(read_committed_titles)
+            raise RuntimeError()
+    with manager.transaction():
+        pass
+    assert committed_titles == [["Quiz"]]
+
+
+def test_repository_queries_use_indexes(manager, author, engine, queries):
+    quizzes = SQLAQuizRepository(manager)
+    submissions = SQLASubmissionRepository(manager)
+    authors = SQLAAuthorRepository(manager)
+    quiz = make_quiz(author, "Quiz", 3)
+    quizzes.save(quiz)
+    submission = Submission(
+        SubmissionID("submission1"),
+        quiz.id,
+        author.id,
+        Submission.Status.IN_PROGRESS,
+        [Answer.empty() for _ in quiz.questions],
+        None,
+    )
+    submissions.save(submission)
+
+    quizzes.get(quiz.id)
+    quizzes.get_for_update(quiz.id)
+    quizzes.list(QuizFilter(author_id=author.id))
+    quizzes.list(QuizFilter(status=QuizStatus.PUBLISHED))
+    quizzes.list(QuizFilter(status=QuizStatus.PUBLISHED, author_id=author.id))
+    quizzes.list(QuizFilter(status=QuizStatus.PUBLISHED, after=quiz.id))
+    quizzes.list(QuizFilter(author_id=author.id, page_size=10, after=quiz.id))
+    quizzes.list(
+        QuizFilter(
+            status=QuizStatus.PUBLISHED, author_id=author.id, page_size=10, after=""
+        )
+    )
+    submissions.get(submission.id)
+    submissions.get_for_update(submission.id)
+    submissions.by_quiz(quiz.id, 1, 10)
+    submissions.by_quiz(quiz.id, page_size=10, after=submission.id)
+    submissions.by_author(author.id)
+    submissions.save(submission)
+    authors.by_email(author.email)
+    authors.get(author.id)
+
+    connection = engine.raw_connection()
+    try:
+        cursor = connection.cursor()
+        # With sequential scans and sorts priced out, the planner only picks
+        # them when no index can serve the query, or return it in order.
+        cursor.execute("SET enable_seqscan = off")
+        cursor.execute("SET enable_sort = off")
+        for statement, parameters in queries:
+            if (
+                not statement.lstrip()
+                .upper()
+                .startswith(("SELECT", "UPDATE", "DELETE"))
+            ):
+                continue
+            cursor.execute(f"EXPLAIN (FORMAT JSON) {statement}", parameters)
+            plan = cursor.fetchone()[0][0]["Plan"]
+            assert unindexed_scans(plan) == [], f"{statement}\n{plan}"
+            if "LIMIT" in statement:
+                # Pages are read off an index already sorted by the page key.
+                assert sorts(plan) == [], f"{statement}\n{plan}"
+    finally:
+        connection.close()
+
+
+def unindexed_scans(plan: dict) -> list[str]:
+    """Returns the scans of `plan` that read a whole table or a whole index."""
+    scans = []
+    if plan["Node Type"] == "Seq Scan" or (
+        plan["Node Type"] in ("Index Scan", "Index Only Scan", "Bitmap Index Scan")
+        and "Index Cond" not in plan
+    ):
+        scans.append(f"{plan['Node Type']} on {plan.get('Relation Name')}")
+    for child in plan.get("Plans", []):
+        scans.extend(unindexed_scans(child))
+    return scans
+
+
+def sorts(plan: dict) -> list[str]:
+    """Returns the sorts `plan` runs, on which keys."""
+    found = []
+    if plan["Node Type"] in ("Sort", "Incremental Sort"):
+        found.append(f"{plan['Node Type']} on {plan.get('Sort Key')}")
+    for child in plan.get("Plans", []):
+        found.extend(sorts(child))
+    return found
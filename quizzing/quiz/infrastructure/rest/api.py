@@ -1,11 +1,53 @@
-from fastapi import APIRouter, FastAPI
+from contextlib import asynccontextmanager
 
+from anyio import to_thread
+from fastapi import APIRouter, FastAPI, Request, status
+from fastapi.responses import JSONResponse
+
+from quizzing.pkg.transactional import MaxRetryError
+from quizzing.quiz.domain.exceptions import VersionConflict
+
+from . import config, metrics
 from .auth import router as auth_router
+from .query_stats import QueryStatsMiddleware
 from .quiz import router as quiz_router
+from .registry import RestRegistry
 from .submission import router as submission_router
 
-app = FastAPI()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    to_thread.current_default_thread_limiter().total_tokens = config.THREADPOOL_SIZE
+    yield
+    RestRegistry.passwords.shutdown()
+    metrics.shutdown()
+
+
+app = FastAPI(lifespan=lifespan)
 api_router = APIRouter(prefix="/api")
 app.include_router(auth_router)
 app.include_router(quiz_router)
 app.include_router(submission_router)
+if config.QUERY_STATS:
+    app.add_middleware(QueryStatsMiddleware)
+if config.METRICS:
+    app.include_router(metrics.router)
+    app.add_middleware(metrics.MetricsMiddleware)
+
+
+@app.exception_handler(MaxRetryError)
+async def contention(request: Request, ex: MaxRetryError) -> JSONResponse:
+    if isinstance(ex.__cause__, VersionConflict):
+        # Every attempt lost the race to save the same entity, like a stale
+        # If-Match would have.
+        return JSONResponse(
+            status_code=status.HTTP_409_CONFLICT,
+            content={"detail": str(ex.__cause__)},
+        )
+    # The transaction kept conflicting with concurrent ones, the client can try
+    # again shortly.
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": "Too much contention, try again later"},
+        headers={"Retry-After": "1"},
+    )
@@ -1,12 +1,14 @@
 from datetime import datetime, timedelta, timezone
-from typing import Annotated
+from typing import Annotated, Callable, TypeVar
 
 from email_validator import EmailNotValidError, validate_email
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from jose import JWTError, jwt
 
-from quizzing.quiz.domain.entities.author import Author
+from quizzing.pkg.executor import ExecutorSaturated
+from quizzing.quiz.domain.entities.author import Author, check_password, hash_password
 from quizzing.quiz.domain.exceptions import AuthorExists, NotFound
 
 from . import config
@@ -17,9 +19,11 @@ router = APIRouter(prefix="/api")
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/login")
 RestRegistry.initialize()
 
+R = TypeVar("R")
+
 
 @router.post("/login", response_model=Token)
-def login(
+async def login(
     form_data: Annotated[OAuth2PasswordRequestForm, Depends()],
 ) -> Token:
     invalid_email_or_password = HTTPException(
@@ -28,8 +32,10 @@ def login(
         headers={"WWW-Authenticate": "Bearer"},
     )
     try:
-        validate_email(form_data.username)
-        author = RestRegistry.authors.by_email(form_data.username)
+        await run_in_threadpool(validate_email, form_data.username)
+        author = await RestRegistry.run(
+            RestRegistry.authors.by_email, form_data.username
+        )
     except EmailNotValidError:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -39,7 +45,9 @@ def login(
     except NotFound:
         raise invalid_email_or_password
 
-    if not author.verify_password(form_data.password):
+    if not await run_password_task(
+        check_password, form_data.password, author.hashed_password
+    ):
         raise invalid_email_or_password
 
     access_token_expires = timedelta(minutes=config.ACCESS_TOKEN_EXPIRE_MINUTES)
@@ -50,12 +58,15 @@ def login(
 
 
 @router.post("/signup", status_code=status.HTTP_201_CREATED)
-def signup(
+async def signup(
     form_data: Annotated[OAuth2PasswordRequestForm, Depends()],
 ):
     try:
-        validate_email(form_data.username)
-        RestRegistry.authors.create(form_data.username, form_data.password)
+        await run_in_threadpool(validate_email, form_data.username)
+        hashed_password = await run_password_task(hash_password, form_data.password)
+        await RestRegistry.run(
+            RestRegistry.authors.create, form_data.username, hashed_password
+        )
     except EmailNotValidError:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -70,7 +81,20 @@ def signup(
         )
 
 
-def authenticate(token: Annotated[str, Depends(oauth2_scheme)]) -> Author:
+async def run_password_task(fn: Callable[..., R], *args) -> R:
+    """Runs a bcrypt operation on the password process pool, answering with a
+    503 right away when the pool already has too much work queued."""
+    try:
+        return await RestRegistry.passwords.run(fn, *args)
+    except ExecutorSaturated:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many authentication requests, try again later",
+            headers={"Retry-After": "1"},
+        )
+
+
+async def authenticate(token: Annotated[str, Depends(oauth2_scheme)]) -> Author:
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -83,7 +107,7 @@ def authenticate(token: Annotated[str, Depends(oauth2_scheme)]) -> Author:
             raise credentials_exception
 
         try:
-            return RestRegistry.authors.by_email(email)
+            return await RestRegistry.run(RestRegistry.authors.authenticated, email)
         except NotFound:
             raise credentials_exception
     except JWTError:
@@ -4,3 +4,22 @@ ACCESS_TOKEN_EXPIRE_MINUTES = 14 * 24 * 60
 SECRET_KEY = os.environ["SECRET_KEY"]
 ALGORITHM = "HS256"
 DEBUG = bool(int(os.environ.get("DEBUG", 0)))
+AUTHOR_CACHE_SIZE = int(os.environ.get("AUTHOR_CACHE_SIZE", 10_000))
+AUTHOR_CACHE_TTL_SECONDS = float(os.environ.get("AUTHOR_CACHE_TTL_SECONDS", 60))
+PASSWORD_HASHING_WORKERS = int(os.environ.get("PASSWORD_HASHING_WORKERS", 2))
+PASSWORD_HASHING_MAX_PENDING = int(os.environ.get("PASSWORD_HASHING_MAX_PENDING", 32))
+QUIZ_CACHE_SIZE = int(os.environ.get("QUIZ_CACHE_SIZE", 1_000))
+ASYNC_DB = bool(int(os.environ.get("ASYNC_DB", 0)))
+WORKERS = int(os.environ.get("WORKERS", 4))
+# Size of the thread pool running sync endpoints and services, per worker.
+THREADPOOL_SIZE = int(os.environ.get("THREADPOOL_SIZE", 40))
+# Lock the rows being written instead of retrying SERIALIZABLE conflicts.
+PESSIMISTIC_LOCKING = bool(int(os.environ.get("PESSIMISTIC_LOCKING", 0)))
+# Keep everything in memory instead of PostgreSQL, for load tests of the API.
+IN_MEMORY_DB = bool(int(os.environ.get("IN_MEMORY_DB", 0)))
+# Report the statements of every request in a header and in the logs.
+QUERY_STATS = bool(int(os.environ.get("QUERY_STATS", int(DEBUG))))
+# Serve Prometheus metrics at /metrics and time services and repositories.
+METRICS = bool(int(os.environ.get("METRICS", 1)))
+# Where the workers write the metrics /metrics aggregates, emptied at startup.
+METRICS_DIR = os.environ.get("PROMETHEUS_MULTIPROC_DIR", "/tmp/quizzing-metrics")
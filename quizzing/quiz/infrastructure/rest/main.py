@@ -1,3 +1,6 @@
+import os
+import shutil
+
 import uvicorn
 
 from quizzing.pkg.logging import config as config_logging
@@ -6,12 +9,18 @@ from . import config
 
 if __name__ == "__main__":
     log_config = config_logging()
+    if config.METRICS:
+        # Set before the workers import prometheus_client, so that they share
+        # their metrics through this directory.
+        shutil.rmtree(config.METRICS_DIR, ignore_errors=True)
+        os.makedirs(config.METRICS_DIR)
+        os.environ["PROMETHEUS_MULTIPROC_DIR"] = config.METRICS_DIR
 
     uvicorn.run(
         "quizzing.quiz.infrastructure.rest.api:app",
         reload=config.DEBUG,
         host="0.0.0.0",
         port=80,
-        workers=4 if not config.DEBUG else 1,
+        workers=config.WORKERS if not config.DEBUG else 1,
         log_config=log_config,
     )
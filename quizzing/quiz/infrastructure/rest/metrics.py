@@ -0,0 +1,254 @@
+"""Prometheus metrics of the API, served at `/metrics`.
+
+Every uvicorn worker is a separate process with its own metrics. When
+`PROMETHEUS_MULTIPROC_DIR` is set, which `main` does before starting the
+workers, each worker writes its metrics to files in that directory and
+`/metrics` aggregates the files of all of them, whichever worker serves it.
+Cache hit ratios are computed when querying, e.g.
+`rate(quizzing_cache_lookups_total{result="hit"}[5m])
+/ ignoring(result) sum without(result) (rate(quizzing_cache_lookups_total[5m]))`.
+"""
+
+import inspect
+import os
+import time
+from functools import wraps
+from typing import Any, Awaitable, Callable
+from weakref import WeakSet
+
+from fastapi import APIRouter, Response
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from quizzing.pkg.cache import LRUCache
+from quizzing.pkg.db.pool import PoolCheckout, PoolMetrics
+from quizzing.pkg.transactional import RetryAttempt, TransactionalMethod, retry_stats
+
+MULTIPROC_DIR_ENV = "PROMETHEUS_MULTIPROC_DIR"
+
+REQUEST_SECONDS = Histogram(
+    "quizzing_http_request_duration_seconds",
+    "Latency of the HTTP requests, by route template.",
+    ["method", "route", "status"],
+)
+SERVICE_SECONDS = Histogram(
+    "quizzing_service_method_duration_seconds",
+    "Latency of the transactional service methods, retries included.",
+    ["method"],
+)
+REPOSITORY_SECONDS = Histogram(
+    "quizzing_repository_method_duration_seconds",
+    "Latency of the repository methods.",
+    ["repository", "method"],
+)
+RETRIES = Counter(
+    "quizzing_transaction_retries_total",
+    "Transactions retried after a conflict.",
+    ["method"],
+)
+RETRIES_EXHAUSTED = Counter(
+    "quizzing_transaction_retries_exhausted_total",
+    "Transactional calls that gave up after conflicting too many times.",
+    ["method"],
+)
+BACKOFF_SECONDS = Counter(
+    "quizzing_transaction_backoff_seconds_total",
+    "Time spent waiting before retrying conflicting transactions.",
+    ["method"],
+)
+CACHE_LOOKUPS = Counter(
+    "quizzing_cache_lookups_total",
+    "Cache lookups, by whether they hit.",
+    ["cache", "result"],
+)
+POOL_IN_USE = Gauge(
+    "quizzing_db_pool_connections_in_use",
+    "Connections checked out of the pools of the live workers.",
+    multiprocess_mode="livesum",
+)
+POOL_CAPACITY = Gauge(
+    "quizzing_db_pool_capacity",
+    "pool_size + max_overflow summed over the live workers.",
+    multiprocess_mode="livesum",
+)
+POOL_PEAK_IN_USE = Gauge(
+    "quizzing_db_pool_peak_connections_in_use",
+    "Most connections a worker's pool has had checked out at once.",
+    multiprocess_mode="livemax",
+)
+POOL_WAIT_SECONDS = Histogram(
+    "quizzing_db_pool_wait_seconds",
+    "Time waited for a pool connection, opening it included.",
+    buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5, 10, 30),
+)
+POOL_TIMEOUTS = Counter(
+    "quizzing_db_pool_timeouts_total",
+    "Connection requests that timed out waiting for the pool.",
+)
+
+router = APIRouter()
+
+# Objects already reporting, so initializing the registry again doesn't make
+# them report twice.
+_observed: WeakSet = WeakSet()
+_observed_retries: set[str] = set()
+_pools: WeakSet[PoolMetrics] = WeakSet()
+
+
+def shutdown() -> None:
+    """Drops the live gauges of this worker from the aggregated metrics."""
+    if os.environ.get(MULTIPROC_DIR_ENV):
+        multiprocess.mark_process_dead(os.getpid())
+
+
+@router.get("/metrics", include_in_schema=False)
+def metrics() -> Response:
+    if os.environ.get(MULTIPROC_DIR_ENV):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return Response(generate_latest(registry), media_type=CONTENT_TYPE_LATEST)
+
+
+def _update_pool_gauges() -> None:
+    # Refreshed after every request, when the connections it used are back.
+    in_use, capacity, peak = 0, 0, 0
+    for pool in _pools:
+        in_use += pool.in_use
+        capacity += pool.capacity or 0
+        peak = max(peak, pool.peak_in_use)
+    POOL_IN_USE.set(in_use)
+    POOL_CAPACITY.set(capacity)
+    POOL_PEAK_IN_USE.set(peak)
+
+
+class MetricsMiddleware:
+    """Times every HTTP request under the template of the route serving it,
+    so that `/quizzes/{quiz_id}` is a single series."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            route = scope.get("route")
+            REQUEST_SECONDS.labels(
+                scope["method"],
+                route.path if route is not None else "unmatched",
+                str(status_code),
+            ).observe(time.perf_counter() - start)
+            _update_pool_gauges()
+
+
+def _timed(fn: Callable[..., Any], histogram: Histogram) -> Callable[..., Any]:
+    # Async services wrap their methods in plain functions that return a
+    # coroutine, so whether a call is async is only known from its result.
+    async def timed_await(awaitable: Awaitable[Any], start: float) -> Any:
+        try:
+            return await awaitable
+        finally:
+            histogram.observe(time.perf_counter() - start)
+
+    @wraps(fn)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            result = fn(*args, **kwargs)
+        except BaseException:
+            histogram.observe(time.perf_counter() - start)
+            raise
+        if inspect.isawaitable(result):
+            return timed_await(result, start)
+        histogram.observe(time.perf_counter() - start)
+        return result
+
+    return wrapper
+
+
+def observe_service(service: Any) -> None:
+    """Times the `@transactional` methods of `service`."""
+    if service in _observed:
+        return
+    _observed.add(service)
+    cls = type(service)
+    for name, method in inspect.getmembers(cls):
+        if isinstance(method, TransactionalMethod):
+            histogram = SERVICE_SECONDS.labels(f"{cls.__name__}.{name}")
+            setattr(service, name, _timed(getattr(service, name), histogram))
+
+
+def observe_repository(repository: Any, port: type) -> None:
+    """Times the methods of `repository` that are part of its `port`."""
+    if repository in _observed:
+        return
+    _observed.add(repository)
+    cls = type(repository)
+    for name, _ in inspect.getmembers(port, inspect.isfunction):
+        if not name.startswith("_"):
+            histogram = REPOSITORY_SECONDS.labels(cls.__name__, name)
+            setattr(repository, name, _timed(getattr(repository, name), histogram))
+
+
+def observe_retries() -> None:
+    """Counts the retries of every transactional method."""
+    for name, stats in retry_stats().items():
+        if name in _observed_retries:
+            continue
+        _observed_retries.add(name)
+
+        def on_attempt(attempt: RetryAttempt, name: str = name) -> None:
+            if attempt.exhausted:
+                RETRIES_EXHAUSTED.labels(name).inc()
+            else:
+                RETRIES.labels(name).inc()
+                BACKOFF_SECONDS.labels(name).inc(attempt.delay_seconds)
+
+        stats.add_listener(on_attempt)
+
+
+def observe_cache(name: str, cache: LRUCache) -> None:
+    if cache in _observed:
+        return
+    _observed.add(cache)
+    hits = CACHE_LOOKUPS.labels(name, "hit")
+    misses = CACHE_LOOKUPS.labels(name, "miss")
+    cache.add_listener(lambda hit: (hits if hit else misses).inc())
+
+
+def observe_pool(pool: PoolMetrics) -> None:
+    if pool in _observed:
+        return
+    _observed.add(pool)
+    _pools.add(pool)
+
+    def on_checkout(checkout: PoolCheckout) -> None:
+        if checkout.timed_out:
+            POOL_TIMEOUTS.inc()
+        POOL_WAIT_SECONDS.observe(checkout.wait_seconds)
+
+    pool.add_listener(on_checkout)
@@ -13,6 +13,7 @@ class QuizRead(BaseModel):
     author_id: str
     status: str
     questions: list["QuestionRead"]
+    version: int
 
     @classmethod
     def from_entity(cls, quiz: Quiz) -> "QuizRead":
@@ -22,6 +23,7 @@ class QuizRead(BaseModel):
             author_id=quiz.author_id,
             status=quiz.status.value,
             questions=[QuestionRead.from_entity(q) for q in quiz.questions],
+            version=quiz.version,
         )
 
 
@@ -1,6 +1,7 @@
 from pydantic import BaseModel
 
-from quizzing.quiz.domain.entities.submission import Answer, Submission
+from quizzing.quiz.domain.entities.quiz import AnswerOption, Quiz
+from quizzing.quiz.domain.entities.submission import Submission
 
 
 class SubmissionCreate(BaseModel):
@@ -14,9 +15,12 @@ class SubmissionRead(BaseModel):
     status: str
     answers: list["AnswerRead"]
     score: float | None
+    version: int
 
     @classmethod
-    def from_entity(cls, submission: Submission) -> "SubmissionRead":
+    def from_entity(cls, submission: Submission, quiz: Quiz) -> "SubmissionRead":
+        """`quiz` is the quiz answered, whose questions turn the option masks
+        of the answers back into the options chosen."""
         return cls(
             id=submission.id,
             quiz_id=submission.quiz_id,
@@ -24,18 +28,26 @@ class SubmissionRead(BaseModel):
             status=submission.status.value,
             answers=[
                 AnswerRead(
-                    options=[str(o) for o in answer.options],
+                    options=[str(o) for o in question.decode(answer.mask)],
                     score=answer.score,
                 )
-                for answer in submission.answers
+                for question, answer in zip(
+                    quiz.questions, submission.answers, strict=True
+                )
             ],
             score=submission.score,
+            version=submission.version,
         )
 
 
 class SubmissionAnswer(BaseModel):
     answers: list[list[str]]
 
+    def to_options(self) -> list[set[AnswerOption]]:
+        """The options chosen, which the quiz encodes as masks when validating
+        them."""
+        return [{AnswerOption(o) for o in options} for options in self.answers]
+
 
 class AnswerRead(BaseModel):
     options: list[str]
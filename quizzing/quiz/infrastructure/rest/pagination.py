@@ -0,0 +1,35 @@
+import base64
+import binascii
+import json
+
+from fastapi import HTTPException, Response, status
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(last_id: str) -> str:
+    payload = json.dumps({"id": last_id}).encode("utf-8")
+    return base64.urlsafe_b64encode(payload).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str | None) -> str | None:
+    if cursor is None:
+        return None
+    try:
+        padding = "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(cursor + padding))
+        last_id = payload["id"]
+    except (binascii.Error, ValueError, TypeError, KeyError):
+        last_id = None
+    if not isinstance(last_id, str):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor",
+        )
+    return last_id
+
+
+def set_next_cursor(response: Response, ids: list[str], page_size: int) -> None:
+    """Hands out the cursor of the next page when the current one is full."""
+    if len(ids) > 0 and len(ids) == page_size:
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(ids[-1])
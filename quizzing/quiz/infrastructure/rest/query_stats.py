@@ -0,0 +1,54 @@
+import logging
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from quizzing.pkg.db.instrumentation import record_queries
+
+logger = logging.getLogger(__name__)
+
+HEADER = "X-Query-Stats"
+# Longest part of the slowest statement that gets logged.
+MAX_LOGGED_SQL = 200
+
+
+class QueryStatsMiddleware:
+    """Records the statements every request executes on the instrumented
+    engines, reports them in the `X-Query-Stats` response header and logs them
+    along with the slowest statement.
+
+    The header is written when the response starts, so statements executed by
+    background tasks after that are only logged.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+        with record_queries() as stats:
+
+            async def send_with_stats(message: Message) -> None:
+                nonlocal status_code
+                if message["type"] == "http.response.start":
+                    status_code = message["status"]
+                    MutableHeaders(scope=message)[HEADER] = stats.summary()
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_with_stats)
+            finally:
+                slowest = stats.slowest
+                sql = " ".join(slowest.sql.split()) if slowest else ""
+                logger.info(
+                    "%s %s %d: %s%s",
+                    scope["method"],
+                    scope["path"],
+                    status_code,
+                    stats.summary(),
+                    f", slowest: {sql[:MAX_LOGGED_SQL]}" if sql else "",
+                )
@@ -1,41 +1,60 @@
-from fastapi import APIRouter, Depends, FastAPI, status
+from fastapi import APIRouter, Depends, FastAPI, Header, Response, status
 from fastapi.exceptions import HTTPException
 
 from quizzing.quiz.domain.dto import QuizFilter
 from quizzing.quiz.domain.entities.author import Author
 from quizzing.quiz.domain.entities.quiz import QuizID, QuizStatus
-from quizzing.quiz.domain.exceptions import NotFound, QuizValidationError
+from quizzing.quiz.domain.exceptions import (
+    NotFound,
+    QuizValidationError,
+    VersionConflict,
+)
 
 from .auth import authenticate
 from .models.quiz import QuizCreate, QuizRead, QuizUpdate
 from .models.submission import SubmissionRead
+from .pagination import decode_cursor, set_next_cursor
 from .registry import RestRegistry
+from .versioning import parse_if_match, set_etag
 
 router = APIRouter(prefix="/quizzes")
 
 
 @router.post("", response_model=QuizRead, status_code=status.HTTP_201_CREATED)
-def start_quiz(quiz_create: QuizCreate, author: Author = Depends(authenticate)):
-    quiz = RestRegistry.quizzes.create(author, quiz_create.title)
+async def start_quiz(
+    quiz_create: QuizCreate, response: Response, author: Author = Depends(authenticate)
+):
+    quiz = await RestRegistry.run(
+        RestRegistry.quizzes.create, author, quiz_create.title
+    )
+    set_etag(response, quiz.version)
     return QuizRead.from_entity(quiz)
 
 
 @router.get("", response_model=list[QuizRead])
-def list_quizzes(
+async def list_quizzes(
+    response: Response,
     status: QuizStatus | None = None,
     page: int = 1,
     page_size: int = 10,
+    cursor: str | None = None,
     author: Author = Depends(authenticate),
 ):
-    filter_ = QuizFilter(status=status, page=page, page_size=page_size)
-    quizzes = RestRegistry.quizzes.list(author, filter_)
+    filter_ = QuizFilter(
+        status=status, page=page, page_size=page_size, after=decode_cursor(cursor)
+    )
+    quizzes = await RestRegistry.run(RestRegistry.quizzes.list, author, filter_)
+    set_next_cursor(response, [quiz.id for quiz in quizzes], page_size)
     return [QuizRead.from_entity(quiz) for quiz in quizzes]
 
 
 @router.get("/{quiz_id}", response_model=QuizRead)
-def get_quiz(quiz_id: str, author: Author = Depends(authenticate)):
+async def get_quiz(
+    quiz_id: str, response: Response, author: Author = Depends(authenticate)
+):
     try:
-        quiz = RestRegistry.quizzes.get(author, quiz_id)
+        quiz = await RestRegistry.run(RestRegistry.quizzes.get, author, quiz_id)
+        set_etag(response, quiz.version)
         return QuizRead.from_entity(quiz)
     except NotFound as e:
         raise HTTPException(
@@ -45,15 +64,21 @@ def get_quiz(quiz_id: str, author: Author = Depends(authenticate)):
 
 
 @router.put("/{quiz_id}", response_model=QuizRead)
-def edit_quiz(
-    quiz_id: str, quiz_update: QuizUpdate, author: Author = Depends(authenticate)
+async def edit_quiz(
+    quiz_id: str,
+    quiz_update: QuizUpdate,
+    response: Response,
+    if_match: str | None = Header(None),
+    author: Author = Depends(authenticate),
 ):
     try:
-        quiz = RestRegistry.quizzes.edit(
+        quiz = await RestRegistry.run(
+            RestRegistry.quizzes.edit,
             author,
             QuizID(quiz_id),
             quiz_update.title,
             [q.to_entity() for q in quiz_update.questions],
+            parse_if_match(if_match),
         )
     except QuizValidationError as e:
         raise HTTPException(
@@ -65,14 +90,31 @@ def edit_quiz(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=str(e),
         )
+    except VersionConflict as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=str(e),
+        )
 
+    set_etag(response, quiz.version)
     return QuizRead.from_entity(quiz)
 
 
 @router.post("/{quiz_id}/publish", response_model=QuizRead)
-def publish_quiz(quiz_id: str, author: Author = Depends(authenticate)):
+async def publish_quiz(
+    quiz_id: str,
+    response: Response,
+    if_match: str | None = Header(None),
+    author: Author = Depends(authenticate),
+):
     try:
-        quiz = RestRegistry.quizzes.publish(author, QuizID(quiz_id))
+        quiz = await RestRegistry.run(
+            RestRegistry.quizzes.publish,
+            author,
+            QuizID(quiz_id),
+            parse_if_match(if_match),
+        )
+        set_etag(response, quiz.version)
         return QuizRead.from_entity(quiz)
     except NotFound as e:
         raise HTTPException(
@@ -84,20 +126,36 @@ def publish_quiz(quiz_id: str, author: Author = Depends(authenticate)):
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=e.errors,
         )
+    except VersionConflict as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=str(e),
+        )
 
 
 @router.get("/{quiz_id}/submissions", response_model=list[SubmissionRead])
-def list_submissions(
+async def list_submissions(
     quiz_id: str,
+    response: Response,
     page: int = 1,
     page_size: int = 100,
+    cursor: str | None = None,
     author: Author = Depends(authenticate),
 ):
     try:
-        submissions = RestRegistry.quizzes.submissions(
-            author, QuizID(quiz_id), page, page_size
+        submissions = await RestRegistry.run(
+            RestRegistry.quizzes.submissions,
+            author,
+            QuizID(quiz_id),
+            page,
+            page_size,
+            decode_cursor(cursor),
         )
-        return [SubmissionRead.from_entity(submission) for submission in submissions]
+        set_next_cursor(response, [s.id for s in submissions], page_size)
+        quiz = await RestRegistry.run(RestRegistry.quizzes.get, author, QuizID(quiz_id))
+        return [
+            SubmissionRead.from_entity(submission, quiz) for submission in submissions
+        ]
     except NotFound as e:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
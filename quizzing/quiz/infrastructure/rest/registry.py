@@ -1,31 +1,156 @@
 from dataclasses import dataclass
+from typing import Any, Callable
 
-from quizzing.pkg.db.sqlalchemy import SQLATransactionManager
-from quizzing.quiz.application.auth import AuthorService
-from quizzing.quiz.application.quiz import QuizService
-from quizzing.quiz.application.submission import SubmissionService
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from quizzing.pkg.cache import LRUCache
+from quizzing.pkg.db.instrumentation import instrument
+from quizzing.pkg.db.pool import PoolMetrics, pool_metrics
+from quizzing.pkg.db.sqlalchemy import (
+    AsyncSQLATransactionManager,
+    SQLATransactionManager,
+)
+from quizzing.pkg.executor import BoundedProcessExecutor
+from quizzing.pkg.transactional import (
+    AsyncTransactionManager,
+    LockingMode,
+    TransactionManager,
+)
+from quizzing.quiz.application.auth import AsyncAuthorService, AuthorService
+from quizzing.quiz.application.quiz import AsyncQuizService, QuizService
+from quizzing.quiz.application.submission import (
+    AsyncSubmissionService,
+    SubmissionService,
+)
+from quizzing.quiz.domain.ports import (
+    AuthorRepository,
+    QuizRepository,
+    SubmissionRepository,
+)
 from quizzing.quiz.domain.registry import DomainRegistry
-from quizzing.quiz.infrastructure.repository.sqlalchemy import config
-from quizzing.quiz.infrastructure.repository.sqlalchemy.repository import (
-    SQLAAuthorRepository,
-    SQLAQuizRepository,
-    SQLASubmissionRepository,
+from quizzing.quiz.infrastructure.repository.cache.repository import (
+    CachedQuizRepository,
 )
+from quizzing.quiz.infrastructure.repository.inmemory.repository import (
+    InMemoryAuthorRepository,
+    InMemoryQuizRepository,
+    InMemorySubmissionRepository,
+)
+from quizzing.quiz.infrastructure.repository.inmemory.transaction import (
+    InMemoryTransactionManager,
+)
+
+from . import config, metrics
 
 
 class RestRegistry:
     authors: AuthorService
     quizzes: QuizService
     submissions: SubmissionService
+    passwords: BoundedProcessExecutor
+    is_async: bool = False
+    pool_metrics: PoolMetrics | None = None
 
     @classmethod
-    def initialize(cls) -> None:
-        transaction_manager = SQLATransactionManager(config.get_engine())
+    def initialize(cls, engine: Engine | AsyncEngine | None = None) -> None:
+        """Wires repositories and services to `engine`, which defaults to the
+        configured psycopg2 engine, or the asyncpg one when `ASYNC_DB` is set.
+        When `IN_MEMORY_DB` is set instead, they are wired to the in-memory
+        repositories and no database is used at all.
+
+        With an async engine the services become coroutine based and run their
+        transactions on the event loop instead of on the threadpool."""
+        if engine is None and config.IN_MEMORY_DB:
+            cls.is_async = False
+            cls.pool_metrics = None
+            DomainRegistry.initialize(
+                InMemoryQuizRepository(),
+                InMemorySubmissionRepository(),
+                InMemoryAuthorRepository(),
+            )
+            cls._initialize_services(InMemoryTransactionManager())
+            return
+        # Imported here since the database configuration requires the DB_*
+        # variables, which aren't set when running in memory.
+        from quizzing.quiz.infrastructure.repository.sqlalchemy import (
+            config as db_config,
+        )
+        from quizzing.quiz.infrastructure.repository.sqlalchemy.repository import (
+            SQLAAuthorRepository,
+            SQLAQuizRepository,
+            SQLASubmissionRepository,
+        )
+
+        if engine is None:
+            engine = (
+                db_config.get_async_engine()
+                if config.ASYNC_DB
+                else db_config.get_engine()
+            )
+        cls.is_async = isinstance(engine, AsyncEngine)
+        cls.pool_metrics = pool_metrics(engine)
+        if config.QUERY_STATS:
+            instrument(engine)
+        if isinstance(engine, AsyncEngine):
+            transaction_manager = SQLATransactionManager(engine.sync_engine)
+            service_transaction_manager = AsyncSQLATransactionManager(
+                engine, transaction_manager
+            )
+        else:
+            transaction_manager = SQLATransactionManager(engine)
+            service_transaction_manager = transaction_manager
+        quiz_cache: LRUCache = LRUCache(config.QUIZ_CACHE_SIZE)
+        if config.METRICS:
+            metrics.observe_cache("quiz", quiz_cache)
+            if cls.pool_metrics is not None:
+                metrics.observe_pool(cls.pool_metrics)
         DomainRegistry.initialize(
-            SQLAQuizRepository(transaction_manager),
+            CachedQuizRepository(
+                SQLAQuizRepository(transaction_manager), quiz_cache, transaction_manager
+            ),
             SQLASubmissionRepository(transaction_manager),
             SQLAAuthorRepository(transaction_manager),
         )
-        cls.authors = AuthorService(transaction_manager)
-        cls.quizzes = QuizService(transaction_manager)
-        cls.submissions = SubmissionService(transaction_manager)
+        cls._initialize_services(service_transaction_manager)
+
+    @classmethod
+    def _initialize_services(
+        cls, transaction_manager: TransactionManager | AsyncTransactionManager
+    ) -> None:
+        author_cache = LRUCache(
+            config.AUTHOR_CACHE_SIZE, config.AUTHOR_CACHE_TTL_SECONDS
+        )
+        locking_mode = (
+            LockingMode.PESSIMISTIC
+            if config.PESSIMISTIC_LOCKING
+            else LockingMode.OPTIMISTIC
+        )
+        if cls.is_async:
+            cls.authors = AsyncAuthorService(transaction_manager, author_cache)
+            cls.quizzes = AsyncQuizService(transaction_manager, locking_mode)
+            cls.submissions = AsyncSubmissionService(transaction_manager, locking_mode)
+        else:
+            cls.authors = AuthorService(transaction_manager, author_cache)
+            cls.quizzes = QuizService(transaction_manager, locking_mode)
+            cls.submissions = SubmissionService(transaction_manager, locking_mode)
+        cls.passwords = BoundedProcessExecutor(
+            config.PASSWORD_HASHING_WORKERS, config.PASSWORD_HASHING_MAX_PENDING
+        )
+        if config.METRICS:
+            metrics.observe_cache("author", author_cache)
+            metrics.observe_retries()
+            for service in (cls.authors, cls.quizzes, cls.submissions):
+                metrics.observe_service(service)
+            metrics.observe_repository(DomainRegistry.quizzes, QuizRepository)
+            metrics.observe_repository(DomainRegistry.submissions, SubmissionRepository)
+            metrics.observe_repository(DomainRegistry.authors, AuthorRepository)
+
+    @classmethod
+    async def run(cls, method: Callable[..., Any], *args, **kwargs) -> Any:
+        """Calls a service method from an endpoint without blocking the event
+        loop: awaited directly with async services, otherwise on the threadpool."""
+        if cls.is_async:
+            return await method(*args, **kwargs)
+        return await run_in_threadpool(method, *args, **kwargs)
@@ -1,28 +1,48 @@
-from fastapi import APIRouter, Depends, FastAPI, status
+from fastapi import APIRouter, Depends, FastAPI, Header, Response, status
 from fastapi.exceptions import HTTPException
 
 from quizzing.quiz.domain.dto import QuizFilter
 from quizzing.quiz.domain.entities.author import Author
-from quizzing.quiz.domain.entities.quiz import AnswerOption, QuizID, QuizStatus
-from quizzing.quiz.domain.entities.submission import SubmissionID
-from quizzing.quiz.domain.exceptions import NotFound, SubmissionValidationError
+from quizzing.quiz.domain.entities.quiz import QuizID, QuizStatus
+from quizzing.quiz.domain.entities.submission import Submission, SubmissionID
+from quizzing.quiz.domain.exceptions import (
+    NotFound,
+    SubmissionValidationError,
+    VersionConflict,
+)
 
 from .auth import authenticate
 from .models.submission import SubmissionAnswer, SubmissionCreate, SubmissionRead
 from .registry import RestRegistry
+from .versioning import parse_if_match, set_etag
 
 router = APIRouter(prefix="/submissions")
 
 
-@router.post("", response_model=SubmissionCreate, status_code=status.HTTP_201_CREATED)
-def start_submission(
-    submission_create: SubmissionCreate, author: Author = Depends(authenticate)
+async def _read_submissions(
+    author: Author, submissions: list[Submission]
+) -> list[SubmissionRead]:
+    quizzes = await RestRegistry.run(
+        RestRegistry.quizzes.get_many, author, {s.quiz_id for s in submissions}
+    )
+    return [SubmissionRead.from_entity(s, quizzes[s.quiz_id]) for s in submissions]
+
+
+@router.post("", response_model=SubmissionRead, status_code=status.HTTP_201_CREATED)
+async def start_submission(
+    submission_create: SubmissionCreate,
+    response: Response,
+    author: Author = Depends(authenticate),
 ):
     try:
-        submission = RestRegistry.submissions.start(
-            author, QuizID(submission_create.quiz_id)
+        submission, quiz = await RestRegistry.run(
+            RestRegistry.submissions.with_quiz,
+            RestRegistry.submissions.start,
+            author,
+            QuizID(submission_create.quiz_id),
         )
-        return SubmissionRead.from_entity(submission)
+        set_etag(response, submission.version)
+        return SubmissionRead.from_entity(submission, quiz)
     except NotFound as e:
         raise HTTPException(status.HTTP_404_NOT_FOUND, str(e))
     except SubmissionValidationError as e:
@@ -30,43 +50,58 @@ def start_submission(
 
 
 @router.get("", response_model=list[SubmissionRead])
-def submissions(author: Author = Depends(authenticate)):
-    return [
-        SubmissionRead.from_entity(submission)
-        for submission in RestRegistry.submissions.list(author)
-    ]
+async def submissions(author: Author = Depends(authenticate)):
+    submissions = await RestRegistry.run(RestRegistry.submissions.list, author)
+    return await _read_submissions(author, submissions)
 
 
 @router.put("/{submission_id}/answers", response_model=SubmissionRead)
-def answer_submission(
+async def answer_submission(
     submission_id: str,
     submission_answer: SubmissionAnswer,
+    response: Response,
+    if_match: str | None = Header(None),
     author: Author = Depends(authenticate),
 ):
     try:
-        submission = RestRegistry.submissions.answer(
+        submission, quiz = await RestRegistry.run(
+            RestRegistry.submissions.with_quiz,
+            RestRegistry.submissions.answer,
             author,
             SubmissionID(submission_id),
-            [
-                {AnswerOption(o) for o in options}
-                for options in submission_answer.answers
-            ],
+            submission_answer.to_options(),
+            parse_if_match(if_match),
         )
     except NotFound as e:
         raise HTTPException(status.HTTP_404_NOT_FOUND, str(e))
     except SubmissionValidationError as e:
         raise HTTPException(status.HTTP_400_BAD_REQUEST, e.errors)
-    return SubmissionRead.from_entity(submission)
+    except VersionConflict as e:
+        raise HTTPException(status.HTTP_409_CONFLICT, str(e))
+    set_etag(response, submission.version)
+    return SubmissionRead.from_entity(submission, quiz)
 
 
 @router.put("/{submission_id}/complete", response_model=SubmissionRead)
-def complete_submission(submission_id: str, author: Author = Depends(authenticate)):
+async def complete_submission(
+    submission_id: str,
+    response: Response,
+    if_match: str | None = Header(None),
+    author: Author = Depends(authenticate),
+):
     try:
-        submission = RestRegistry.submissions.complete(
-            author, SubmissionID(submission_id)
+        submission, quiz = await RestRegistry.run(
+            RestRegistry.submissions.with_quiz,
+            RestRegistry.submissions.complete,
+            author,
+            SubmissionID(submission_id),
+            parse_if_match(if_match),
         )
     except NotFound as e:
         raise HTTPException(status.HTTP_404_NOT_FOUND, str(e))
     except SubmissionValidationError as e:
         raise HTTPException(status.HTTP_400_BAD_REQUEST, e.errors)
-    return SubmissionRead.from_entity(submission)
+    except VersionConflict as e:
+        raise HTTPException(status.HTTP_409_CONFLICT, str(e))
+    set_etag(response, submission.version)
+    return SubmissionRead.from_entity(submission, quiz)
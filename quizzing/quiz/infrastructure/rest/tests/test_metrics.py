@@ -0,0 +1,133 @@
+import asyncio
+import time
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+
+from quizzing.pkg.transactional import (
+    AsyncTransaction,
+    AsyncTransactionalServiceMixin,
+    IsolationLevel,
+    transactional,
+)
+from quizzing.quiz.infrastructure.rest import metrics
+
+SLEEP_SECONDS = 0.05
+
+
+class FakeAsyncTransaction(AsyncTransaction):
+    def __init__(self, manager: "FakeAsyncTransactionManager") -> None:
+        self._manager = manager
+
+    async def begin(self):
+        self._manager.depth += 1
+
+    async def commit(self):
+        self._manager.depth -= 1
+
+    async def rollback(self):
+        self._manager.depth -= 1
+
+    async def run_sync(self, fn, *args, **kwargs):
+        return fn(*args, **kwargs)
+
+
+class FakeAsyncTransactionManager:
+    def __init__(self) -> None:
+        self.depth = 0
+
+    def transaction(self, isolation_level=IsolationLevel.READ_COMMITTED):
+        return FakeAsyncTransaction(self)
+
+    def is_retriable_exception(self, ex: Exception) -> bool:
+        return False
+
+    def in_transaction(self) -> bool:
+        return self.depth > 0
+
+    def after_commit(self, callback):
+        callback()
+
+
+class SlowService(AsyncTransactionalServiceMixin):
+    def __init__(self) -> None:
+        self._transaction_manager = FakeAsyncTransactionManager()
+
+    @transactional()
+    def slow(self) -> str:
+        time.sleep(SLEEP_SECONDS)
+        return "done"
+
+
+def service_seconds(method: str) -> tuple[float, float]:
+    labels = {"method": method}
+    return (
+        REGISTRY.get_sample_value(
+            "quizzing_service_method_duration_seconds_count", labels
+        )
+        or 0.0,
+        REGISTRY.get_sample_value(
+            "quizzing_service_method_duration_seconds_sum", labels
+        )
+        or 0.0,
+    )
+
+
+def test_async_service_calls_are_timed_until_awaited():
+    service = SlowService()
+    metrics.observe_service(service)
+    count, total = service_seconds("SlowService.slow")
+
+    assert asyncio.run(service.slow()) == "done"
+
+    new_count, new_total = service_seconds("SlowService.slow")
+    assert new_count == count + 1
+    assert new_total - total >= SLEEP_SECONDS
+
+
+def test_requests_are_timed_by_route_and_exported():
+    service = SlowService()
+    metrics.observe_service(service)
+    app = FastAPI()
+    app.include_router(metrics.router)
+    app.add_middleware(metrics.MetricsMiddleware)
+
+    @app.get("/slow/{item_id}")
+    async def slow(item_id: str) -> str:
+        return await service.slow()
+
+    labels = {"method": "GET", "route": "/slow/{item_id}", "status": "200"}
+    before = (
+        REGISTRY.get_sample_value("quizzing_http_request_duration_seconds_sum", labels)
+        or 0.0
+    )
+    count, total = service_seconds("SlowService.slow")
+    client = TestClient(app)
+
+    assert client.get("/slow/1").json() == "done"
+    assert client.get("/slow/2").json() == "done"
+
+    assert (
+        REGISTRY.get_sample_value(
+            "quizzing_http_request_duration_seconds_count", labels
+        )
+        == 2
+    )
+    elapsed = (
+        REGISTRY.get_sample_value("quizzing_http_request_duration_seconds_sum", labels)
+        - before
+    )
+    assert elapsed >= 2 * SLEEP_SECONDS
+    new_count, new_total = service_seconds("SlowService.slow")
+    assert new_count == count + 2
+    assert new_total - total >= 2 * SLEEP_SECONDS
+    exported = client.get("/metrics").text
+    assert (
+        'quizzing_http_request_duration_seconds_count{method="GET",'
+        'route="/slow/{item_id}",status="200"} 2.0'
+    ) in exported
+    assert (
+        'quizzing_service_method_duration_seconds_count{method="SlowService.slow"} '
+        f"{new_count}"
+    ) in exported
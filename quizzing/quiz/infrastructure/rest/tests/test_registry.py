@@ -0,0 +1,36 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).parents[5]
+
+INITIALIZE = """
+from quizzing.quiz.domain.registry import DomainRegistry
+from quizzing.quiz.infrastructure.repository.inmemory.repository import (
+    InMemoryQuizRepository,
+)
+from quizzing.quiz.infrastructure.rest.registry import RestRegistry
+
+RestRegistry.initialize()
+assert isinstance(DomainRegistry.quizzes, InMemoryQuizRepository)
+"""
+
+
+def test_in_memory_registry_needs_no_database_configuration():
+    # A fresh interpreter, as the database configuration is read on import.
+    env = {
+        name: value for name, value in os.environ.items() if not name.startswith("DB_")
+    }
+    env["IN_MEMORY_DB"] = "1"
+    env["METRICS"] = "0"
+
+    result = subprocess.run(
+        [sys.executable, "-c", INITIALIZE],
+        cwd=ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+
+    assert result.returncode == 0, result.stderr
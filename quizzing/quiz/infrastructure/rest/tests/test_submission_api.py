@@ -0,0 +1,42 @@
+from datetime import timedelta
+
+from fastapi.testclient import TestClient
+
+from quizzing.quiz.domain.entities.author import Author
+from quizzing.quiz.domain.entities.quiz import (
+    AnswerOption,
+    Question,
+    Quiz,
+    QuizID,
+    QuizStatus,
+)
+from quizzing.quiz.domain.registry import DomainRegistry
+from quizzing.quiz.infrastructure.rest import config
+from quizzing.quiz.infrastructure.rest.api import app
+from quizzing.quiz.infrastructure.rest.auth import create_access_token
+from quizzing.quiz.infrastructure.rest.registry import RestRegistry
+
+EMAIL = "author@example.com"
+OPTIONS = [AnswerOption(o) for o in "ABC"]
+
+
+def test_started_submissions_are_returned(monkeypatch):
+    monkeypatch.setattr(config, "IN_MEMORY_DB", True)
+    RestRegistry.initialize()
+    author = Author.with_hashed_password(EMAIL, "hash")
+    DomainRegistry.authors.save(author)
+    quiz = Quiz(QuizID("quiz"), "Quiz", author.id, QuizStatus.PUBLISHED)
+    quiz.questions = [Question("Question", OPTIONS, {OPTIONS[0]})] * 2
+    DomainRegistry.quizzes.save(quiz)
+    client = TestClient(app)
+    token = create_access_token({"sub": EMAIL}, timedelta(hours=1))
+    client.headers["Authorization"] = f"Bearer {token}"
+
+    response = client.post("/submissions", json={"quiz_id": quiz.id})
+
+    assert response.status_code == 201
+    submission = response.json()
+    assert submission["quiz_id"] == quiz.id
+    assert submission["author_id"] == author.id
+    assert submission["answers"] == [{"options": [], "score": None}] * 2
+    assert response.headers["ETag"] == f'"{submission["version"]}"'
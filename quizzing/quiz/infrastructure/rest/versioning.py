@@ -0,0 +1,23 @@
+from fastapi import HTTPException, Response, status
+
+
+def etag(version: int) -> str:
+    return f'"{version}"'
+
+
+def set_etag(response: Response, version: int) -> None:
+    response.headers["ETag"] = etag(version)
+
+
+def parse_if_match(if_match: str | None) -> int | None:
+    """Returns the version an `If-Match` header makes a write conditional on, or
+    None when the write may overwrite any version."""
+    if if_match is None or if_match.strip() == "*":
+        return None
+    try:
+        return int(if_match.strip().strip('"'))
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid If-Match header",
+        )